@@ -0,0 +1,313 @@
+import io
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+
+
+def pseudo_random_numbers(count: int, seed: int = 12345, limit: int = 10000) -> List[int]:
+    """Deterministic numbers from a linear congruential generator."""
+    numbers = []
+    state = seed
+    for _ in range(count):
+        state = (1103515245 * state + 12345) % 2**31
+        numbers.append(state % limit)
+    return numbers
+
+
+def array_literal(values: List[int]) -> str:
+    return "[" + ", ".join(str(value) for value in values) + "]"
+
+
+def bubble_sort_program(size: int = 1000) -> str:
+    return f"""
+array = {array_literal(pseudo_random_numbers(size))}
+array_len = {size}
+.. Bubble sort
+i = 0
+w i ls array_len
+{{
+    j = 0
+    w j ls array_len
+    {{
+        if array[i] ls array[j]
+        {{
+            temp = array[i]
+            array[i] = array[j]
+            array[j] = temp
+        }}
+        j += 1
+    }}
+    i += 1
+}}
+p array[0], array[array_len - 1]
+"""
+
+
+def fibonacci_program(n: int = 20) -> str:
+    return f"""
+fu fib(n)
+{{
+    if n ls 2
+    {{
+        ret n
+    }}
+    ret fib(n - 1) + fib(n - 2)
+}}
+p fib({n})
+"""
+
+
+def sum_of_evens_program(size: int = 100000) -> str:
+    return f"""
+a = {array_literal(pseudo_random_numbers(size))}
+sum = 0
+i = 0
+w i ls {size}
+{{
+    if a[i] % 2 eq 0
+    {{
+        sum = sum + a[i]
+    }}
+    i = i + 1
+}}
+p sum
+"""
+
+
+def counted_loop_program(size: int = 200000, use_for: bool = False) -> str:
+    """Sum of squares of 0..size-1, counted with a `w` loop or a native `f` loop."""
+    if use_for:
+        loop = f"""
+f i 0 {size}
+{{
+    total += i * i
+}}
+"""
+    else:
+        loop = f"""
+i = 0
+w i ls {size}
+{{
+    total += i * i
+    i += 1
+}}
+"""
+    return f"""
+total = 0
+{loop}
+p total
+"""
+
+
+def counted_while_program(size: int = 200000) -> str:
+    return counted_loop_program(size, use_for=False)
+
+
+def counted_for_program(size: int = 200000) -> str:
+    return counted_loop_program(size, use_for=True)
+
+
+def merge_sort_program(size: int = 5000, use_views: bool = True) -> str:
+    """Recursive merge sort whose halves are slice views or copies made with a loop."""
+    if use_views:
+        # The halves are views, so they are sorted in place. `scratch` starts as a
+        # copy of `a`; each level sorts the halves of one into the other and merges
+        # them back, so no level copies anything.
+        sort = """
+fu merge_sort(a, scratch) {
+    n = len(a)
+    if n ls 2 { ret 0 }
+    mid = int(n / 2)
+    merge_sort(scratch[:mid], a[:mid])
+    merge_sort(scratch[mid:], a[mid:])
+    merge(scratch[:mid], scratch[mid:], a)
+    ret 0
+}
+merge_sort(array, copy(array))
+"""
+    else:
+        # Without slices, each half is copied out element by element.
+        sort = """
+fu sub_array(a, low, high) {
+    result = [0] * (high - low)
+    f k low high { result[k - low] = a[k] }
+    ret result
+}
+fu merge_sort(a) {
+    n = len(a)
+    if n ls 2 { ret 0 }
+    mid = int(n / 2)
+    left = sub_array(a, 0, mid)
+    right = sub_array(a, mid, n)
+    merge_sort(left)
+    merge_sort(right)
+    merge(left, right, a)
+    ret 0
+}
+merge_sort(array)
+"""
+    return f"""
+fu merge(left, right, out) {{
+    i = 0
+    j = 0
+    left_len = len(left)
+    right_len = len(right)
+    f k 0 left_len + right_len {{
+        if j eq right_len {{
+            out[k] = left[i]
+            i += 1
+        }} eli i eq left_len {{
+            out[k] = right[j]
+            j += 1
+        }} eli left[i] lse right[j] {{
+            out[k] = left[i]
+            i += 1
+        }} el {{
+            out[k] = right[j]
+            j += 1
+        }}
+    }}
+    ret 0
+}}
+array = {array_literal(pseudo_random_numbers(size))}
+{sort}
+p array[0], array[{size - 1}]
+"""
+
+
+def merge_sort_views_program(size: int = 5000) -> str:
+    return merge_sort_program(size, use_views=True)
+
+
+def merge_sort_copies_program(size: int = 5000) -> str:
+    return merge_sort_program(size, use_views=False)
+
+
+def string_printing_program(lines: int = 20000) -> str:
+    return f"""
+names = ['alpha', 'beta', 'gamma', 'delta']
+i = 0
+w i ls {lines}
+{{
+    name = names[i % 4]
+    p 'Processing record', i, 'for', name + '-' + name, 'status:', 'ok'
+    i += 1
+}}
+"""
+
+
+def join_program(size: int, use_map: bool) -> str:
+    """Join `size` orders with a table of product ids, summing each product's row number."""
+    # Unique ids, so the first match of the linear search is the only one.
+    ids = list(dict.fromkeys(pseudo_random_numbers(size, seed=1)))
+    orders = [ids[number % len(ids)] for number in pseudo_random_numbers(size, seed=2)]
+    if use_map:
+        lookup = """
+rows = {}
+i = 0
+w i ls ids_len
+{
+    rows[ids[i]] = i
+    i += 1
+}
+i = 0
+w i ls orders_len
+{
+    total += rows[orders[i]]
+    i += 1
+}
+"""
+    else:
+        lookup = """
+i = 0
+w i ls orders_len
+{
+    j = 0
+    w ids[j] neq orders[i]
+    {
+        j += 1
+    }
+    total += j
+    i += 1
+}
+"""
+    return f"""
+ids = {array_literal(ids)}
+ids_len = {len(ids)}
+orders = {array_literal(orders)}
+orders_len = {len(orders)}
+total = 0
+{lookup}
+p total
+"""
+
+
+def linear_search_join_program(size: int = 1000) -> str:
+    return join_program(size, use_map=False)
+
+
+def map_join_program(size: int = 1000) -> str:
+    return join_program(size, use_map=True)
+
+
+PROGRAMS: Dict[str, Callable[[], str]] = {
+    "bubble_sort": bubble_sort_program,
+    "fibonacci": fibonacci_program,
+    "sum_of_evens": sum_of_evens_program,
+    "string_printing": string_printing_program,
+    "join_linear_search": linear_search_join_program,
+    "join_map": map_join_program,
+    "counted_while": counted_while_program,
+    "counted_for": counted_for_program,
+    "merge_sort_views": merge_sort_views_program,
+    "merge_sort_copies": merge_sort_copies_program,
+}
+
+
+@dataclass
+class BenchmarkCase:
+    """A named benchmark; `setup` prepares inputs and returns the timed callable."""
+    name: str
+    setup: Callable[[], Callable[[], object]]
+
+
+def lexer_case(source_code: str) -> Callable[[], object]:
+    return lambda: Lexer(source_code).tokenize()
+
+
+def parser_case(source_code: str) -> Callable[[], object]:
+    tokens = Lexer(source_code).tokenize()
+    return lambda: Parser(tokens).parse()
+
+
+def end_to_end_case(source_code: str) -> Callable[[], object]:
+    def run() -> None:
+        program = Parser(Lexer(source_code).tokenize()).parse()
+        with redirect_stdout(io.StringIO()):
+            Interpreter().interpret(program)
+
+    return run
+
+
+STAGES: Dict[str, Callable[[str], Callable[[], object]]] = {
+    "lexer": lexer_case,
+    "parser": parser_case,
+    "end_to_end": end_to_end_case,
+}
+
+
+def all_cases() -> List[BenchmarkCase]:
+    cases = []
+    for stage, make_case in STAGES.items():
+        for program_name, program in PROGRAMS.items():
+            cases.append(
+                BenchmarkCase(
+                    f"{stage}.{program_name}",
+                    lambda make_case=make_case, program=program: make_case(program()),
+                )
+            )
+    return cases
@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import io
+import json
+import random
+import time
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+from benchmarks.generator import ProgramShape, generate_program
+from flicklang.ast import Program
+from flicklang.async_interpreter import run_program
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+
+
+@dataclass
+class ConcurrencyResult:
+    mode: str
+    scripts: int
+    total_s: float
+    scripts_per_sec: float
+    # Completion time of each script measured from the start of the batch.
+    p50_s: float
+    p95_s: float
+    p99_s: float
+    max_s: float
+
+
+def build_programs(count: int, seed: int) -> List[Program]:
+    """Parse `count` generated scripts of varied size; a few are much heavier."""
+    rng = random.Random(seed)
+    programs = []
+    for index in range(count):
+        heavy = rng.random() < 0.02
+        shape = ProgramShape(
+            statements=rng.randrange(20, 120),
+            loop_iterations=rng.randrange(200, 400) if heavy else rng.randrange(1, 10),
+            seed=seed * count + index,
+        )
+        programs.append(Parser(Lexer(generate_program(shape)).tokenize()).parse())
+    return programs
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def summarize(mode: str, latencies: List[float], total: float) -> ConcurrencyResult:
+    latencies = sorted(latencies)
+    return ConcurrencyResult(
+        mode=mode,
+        scripts=len(latencies),
+        total_s=total,
+        scripts_per_sec=len(latencies) / total,
+        p50_s=percentile(latencies, 0.50),
+        p95_s=percentile(latencies, 0.95),
+        p99_s=percentile(latencies, 0.99),
+        max_s=latencies[-1],
+    )
+
+
+def run_sequential(programs: List[Program]) -> ConcurrencyResult:
+    """One script after another with the synchronous interpreter."""
+    latencies = []
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for program in programs:
+            Interpreter().interpret(program)
+            latencies.append(time.perf_counter() - start)
+    return summarize("sequential", latencies, time.perf_counter() - start)
+
+
+async def run_concurrent(programs: List[Program], yield_interval: int) -> ConcurrencyResult:
+    """All scripts as tasks on one event loop, started at the same time."""
+    lines = 0
+
+    async def sink(line: str) -> None:
+        nonlocal lines
+        lines += 1
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+
+    async def run_one(program: Program) -> None:
+        await run_program(program, sink, yield_interval)
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(run_one(program) for program in programs))
+    return summarize(
+        f"async yield={yield_interval}", latencies, time.perf_counter() - start
+    )
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(
+        description="Throughput and latency of many FlickLang scripts on one event loop."
+    )
+    arg_parser.add_argument("--scripts", type=int, default=1000, help="Concurrent scripts")
+    arg_parser.add_argument(
+        "-y", "--yield-interval", type=int, action="append",
+        help="Steps between yields to the event loop (repeatable, default: 10, 100, 1000)",
+    )
+    arg_parser.add_argument("--seed", type=int, default=0, help="Program generator seed")
+    arg_parser.add_argument("--json", metavar="OUTPUT", help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    programs = build_programs(args.scripts, args.seed)
+    results = [run_sequential(programs)]
+    for yield_interval in args.yield_interval or [10, 100, 1000]:
+        results.append(asyncio.run(run_concurrent(programs, yield_interval)))
+
+    print(
+        f"{'Mode':<20} {'total (s)':>10} {'scripts/s':>10} "
+        f"{'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10}"
+    )
+    for result in results:
+        print(
+            f"{result.mode:<20} {result.total_s:>10.3f} {result.scripts_per_sec:>10.1f} "
+            f"{result.p50_s * 1000:>10.1f} {result.p95_s * 1000:>10.1f} "
+            f"{result.p99_s * 1000:>10.1f} {result.max_s * 1000:>10.1f}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([asdict(result) for result in results], indent=2) + "\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
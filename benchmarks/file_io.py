@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.cases import pseudo_random_numbers
+
+ENTRY_POINT = [sys.executable, "-m", "flicklang.run_flicklang"]
+
+
+@dataclass
+class FileIOResult:
+    case: str
+    seconds: float
+    # Peak resident set size of the interpreter process.
+    peak_rss_mib: float
+
+
+def run_script(script: Path) -> FileIOResult:
+    """Run `script` in a fresh interpreter process and measure its time and peak memory."""
+    start = time.perf_counter()
+    process = subprocess.Popen(ENTRY_POINT + [str(script)], stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    seconds = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"{script.name} exited with status {process.returncode}")
+    # ru_maxrss is in KiB on Linux.
+    return FileIOResult(script.stem, seconds, usage.ru_maxrss / 1024)
+
+
+def write_cases(directory: Path, elements: int) -> Dict[str, Path]:
+    """Scripts that load the same `elements` numbers from source and from a file."""
+    numbers = pseudo_random_numbers(elements, limit=10**9)
+    data = directory / "numbers.txt"
+    data.write_text("\n".join(map(str, numbers)) + "\n")
+
+    scripts = {
+        "array_literal": f"a = [{', '.join(map(str, numbers))}]\np len(a)\n",
+        "read_numbers": f"a = read_numbers('{data}')\np len(a)\n",
+        "read_write_numbers": (
+            f"a = read_numbers('{data}')\n"
+            f"p write_numbers('{directory / 'copy.txt'}', a)\n"
+        ),
+    }
+    paths = {}
+    for case, source in scripts.items():
+        paths[case] = directory / f"{case}.fl"
+        paths[case].write_text(source)
+    return paths
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(
+        description="Loading numbers from an array literal versus read_numbers."
+    )
+    arg_parser.add_argument(
+        "--elements", type=int, default=10_000_000, help="Numbers to load per case"
+    )
+    arg_parser.add_argument(
+        "--skip-literal",
+        action="store_true",
+        help="Skip the array literal case, which needs several GiB for 10M elements",
+    )
+    arg_parser.add_argument("--json", metavar="OUTPUT", help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    results: List[FileIOResult] = []
+    with tempfile.TemporaryDirectory() as directory:
+        # Generate the inputs in another process: a child's peak RSS includes the
+        # memory of the process it was forked from, so this one has to stay small.
+        with ProcessPoolExecutor(1) as pool:
+            scripts = pool.submit(write_cases, Path(directory), args.elements).result()
+        for case, script in scripts.items():
+            if case == "array_literal" and args.skip_literal:
+                continue
+            results.append(run_script(script))
+
+    print(f"{args.elements} elements")
+    print(f"{'Case':<20} {'time (s)':>10} {'peak RSS (MiB)':>15}")
+    for result in results:
+        print(f"{result.case:<20} {result.seconds:>10.2f} {result.peak_rss_mib:>15.1f}")
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([asdict(result) for result in results], indent=2) + "\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
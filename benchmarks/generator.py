@@ -0,0 +1,155 @@
+import random
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class ProgramShape:
+    """Tunable parameters of a generated program."""
+    statements: int = 100
+    nesting_depth: int = 2
+    # Probability that a top-level statement is a nest of `nesting_depth` blocks.
+    nested_fraction: float = 0.2
+    expression_length: int = 5
+    parenthesis_depth: int = 0
+    array_size: int = 10
+    string_appends: int = 0
+    string_length: int = 8
+    functions: int = 2
+    loop_iterations: int = 2
+    # Spaces per nesting level; deep nests with indentation grow quadratically.
+    indent_width: int = 4
+    seed: int = 0
+
+
+class ProgramGenerator:
+    """
+    Generates valid, terminating FlickLang programs of a given shape.
+
+    Every generated program runs without errors: numeric variables are kept in
+    [0, 1000) by reducing each assignment modulo 1000, modulo divisors are
+    non-zero literals, array indices are reduced modulo the array size, and only
+    the outermost loop of a nest runs more than once, so runtime stays linear
+    in the program size.
+    """
+
+    VARIABLES = 8
+
+    def __init__(self, shape: ProgramShape) -> None:
+        self.shape = shape
+        self.random = random.Random(shape.seed)
+        self.lines: List[str] = []
+        self.loop_counter = 0
+
+    def generate(self) -> str:
+        shape = self.shape
+        for index in range(self.VARIABLES):
+            self.emit(f"v{index} = {self.random.randrange(1, 1000)}", 0)
+        self.emit(
+            "arr = ["
+            + ", ".join(str(self.random.randrange(1000)) for _ in range(shape.array_size))
+            + "]",
+            0,
+        )
+        self.emit("s = ''", 0)
+        for index in range(shape.functions):
+            self.emit(f"fu f{index}(a, b)", 0)
+            self.emit("{", 0)
+            self.emit(f"ret ({self.expression(['a', 'b'])}) % 1000", 1)
+            self.emit("}", 0)
+
+        emitted = 0
+        while emitted < shape.statements:
+            if shape.nesting_depth > 0 and self.random.random() < shape.nested_fraction:
+                emitted += self.nested_block(shape.nesting_depth, 0, outermost=True)
+            else:
+                self.simple_statement(0)
+                emitted += 1
+
+        for _ in range(shape.string_appends):
+            piece = self.random.choice("abcdefgh") * shape.string_length
+            self.emit(f"s = s + '{piece}'", 0)
+        self.emit("p v0, v1, arr[0], s", 0)
+        return "\n".join(self.lines) + "\n"
+
+    def emit(self, line: str, indent: int) -> None:
+        self.lines.append(" " * (self.shape.indent_width * indent) + line)
+
+    def variable(self) -> str:
+        return f"v{self.random.randrange(self.VARIABLES)}"
+
+    def operand(self, names: List[str]) -> str:
+        choice = self.random.random()
+        if choice < 0.4:
+            return self.random.choice(names)
+        if choice < 0.6 and names[0].startswith("v"):
+            return f"arr[{self.random.choice(names)} % {self.shape.array_size}]"
+        return str(self.random.randrange(1, 100))
+
+    def expression(self, names: List[str] | None = None) -> str:
+        names = names or [f"v{index}" for index in range(self.VARIABLES)]
+        parts = [self.operand(names)]
+        for _ in range(self.shape.expression_length - 1):
+            operator = self.random.choice("+-+-*%")
+            if operator == "%":
+                parts.append(f"{operator} {self.random.randrange(1, 100)}")
+            else:
+                parts.append(f"{operator} {self.operand(names)}")
+        expression = " ".join(parts)
+        depth = self.shape.parenthesis_depth
+        return "(" * depth + expression + ")" * depth
+
+    def simple_statement(self, indent: int) -> None:
+        choice = self.random.random()
+        if choice < 0.5:
+            self.emit(f"{self.variable()} = ({self.expression()}) % 1000", indent)
+        elif choice < 0.7:
+            self.emit(
+                f"arr[{self.variable()} % {self.shape.array_size}] = ({self.expression()}) % 1000",
+                indent,
+            )
+        elif choice < 0.85 and self.shape.functions:
+            function = self.random.randrange(self.shape.functions)
+            self.emit(
+                f"{self.variable()} = f{function}({self.variable()}, {self.variable()})",
+                indent,
+            )
+        else:
+            self.emit(f"{self.variable()} = {self.variable()} % 1000", indent)
+
+    def nested_block(self, depth: int, indent: int, outermost: bool = False) -> int:
+        """
+        Emit `depth` alternately nested if/while blocks around one statement and
+        return the number of statements emitted. Built iteratively so the
+        generator itself is not limited by the Python recursion limit.
+        """
+        closings: List[List[str]] = []
+        count = 1
+        for level in range(depth, 0, -1):
+            if level % 2:
+                self.emit(f"if {self.variable()} ls 1000", indent)
+                self.emit("{", indent)
+                closings.append(["}"])
+                count += 1
+            else:
+                counter = f"c{self.loop_counter}"
+                self.loop_counter += 1
+                iterations = self.shape.loop_iterations if outermost else 1
+                self.emit(f"{counter} = 0", indent)
+                self.emit(f"w {counter} ls {iterations}", indent)
+                self.emit("{", indent)
+                closings.append([" " * self.shape.indent_width + f"{counter} += 1", "}"])
+                count += 3
+            outermost = False
+            indent += 1
+
+        self.simple_statement(indent)
+        for closing in reversed(closings):
+            indent -= 1
+            for line in closing:
+                self.emit(line, indent)
+        return count
+
+
+def generate_program(shape: ProgramShape) -> str:
+    return ProgramGenerator(shape).generate()
@@ -0,0 +1,166 @@
+import argparse
+import gc
+import io
+import json
+import sys
+import time
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+from unittest import mock
+
+from benchmarks.cases import (
+    PROGRAMS,
+    bubble_sort_program,
+    counted_for_program,
+    fibonacci_program,
+)
+from flicklang.ast import Program
+from flicklang.hooks import Event
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+
+# Sizes that keep one run well under a second.
+PROGRAM_SOURCES: Dict[str, Callable[[], str]] = {
+    "bubble_sort": lambda: bubble_sort_program(200),
+    "fibonacci": fibonacci_program,
+    "counted_for": lambda: counted_for_program(50000),
+}
+
+
+@dataclass
+class HookOverheadResult:
+    program: str
+    # Fastest run of each variant, in seconds.
+    # An interpreter without the hook API.
+    baseline: float
+    # One that never had hooks.
+    disabled: float
+    # One that had a hook for every event, all removed again.
+    removed: float
+    enabled: float
+    disabled_overhead: float
+    removed_overhead: float
+    enabled_overhead: float
+
+
+def ignore(*arguments: object) -> None:
+    pass
+
+
+def plain() -> Interpreter:
+    """
+    An interpreter without the hook API: `instrument` is skipped, so no method
+    is bound on the instance and every visit goes to the class, as it did
+    before hooks existed.
+    """
+    with mock.patch("flicklang.interpreter.instrument", ignore):
+        return Interpreter()
+
+
+def removed() -> Interpreter:
+    """An interpreter that had a hook for every event, all removed again."""
+    interpreter = Interpreter()
+    for event in Event:
+        interpreter.add_hook(event, ignore)
+    for event in Event:
+        interpreter.remove_hook(event, ignore)
+    return interpreter
+
+
+def enabled() -> Interpreter:
+    interpreter = Interpreter()
+    for event in Event:
+        interpreter.add_hook(event, ignore)
+    return interpreter
+
+
+def fastest_runs(
+    program: Program, variants: Dict[str, Callable[[], Interpreter]], runs: int
+) -> Dict[str, float]:
+    """
+    The fastest of `runs` runs per variant, interleaved so drift affects all
+    alike, and in a rotating order so none always runs first.
+    """
+    best = {name: float("inf") for name in variants}
+    order = list(variants.items())
+    for run in range(runs):
+        for name, create in order[run % len(order) :] + order[: run % len(order)]:
+            interpreter = create()
+            # Start each run without the previous run's garbage.
+            gc.collect()
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                interpreter.interpret(program)
+                best[name] = min(best[name], time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(
+        description="Cost of the hook API when no hooks are installed and when they are."
+    )
+    arg_parser.add_argument(
+        "programs", nargs="*", default=list(PROGRAM_SOURCES), help="Benchmark programs to run"
+    )
+    arg_parser.add_argument("--runs", type=int, default=15, help="Runs per variant")
+    arg_parser.add_argument(
+        "--max-overhead",
+        type=float,
+        default=0.01,
+        help="Fail when an interpreter without hooks is slower than this",
+    )
+    arg_parser.add_argument("--json", metavar="OUTPUT", help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    variants = {"baseline": plain, "disabled": Interpreter, "removed": removed, "enabled": enabled}
+    results: List[HookOverheadResult] = []
+    for name in args.programs:
+        source = PROGRAM_SOURCES.get(name, PROGRAMS[name])()
+        program = Parser(Lexer(source).tokenize()).parse()
+        best = fastest_runs(program, variants, args.runs)
+        results.append(
+            HookOverheadResult(
+                name,
+                best["baseline"],
+                best["disabled"],
+                best["removed"],
+                best["enabled"],
+                best["disabled"] / best["baseline"] - 1,
+                best["removed"] / best["baseline"] - 1,
+                best["enabled"] / best["baseline"] - 1,
+            )
+        )
+
+    print(
+        f"{'Program':<14} {'baseline (s)':>13} {'disabled (s)':>13} {'overhead':>9} "
+        f"{'removed (s)':>12} {'overhead':>9} {'enabled (s)':>12} {'overhead':>9}"
+    )
+    for result in results:
+        print(
+            f"{result.program:<14} {result.baseline:>13.4f} {result.disabled:>13.4f} "
+            f"{result.disabled_overhead:>9.1%} {result.removed:>12.4f} "
+            f"{result.removed_overhead:>9.1%} {result.enabled:>12.4f} "
+            f"{result.enabled_overhead:>9.1%}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([asdict(result) for result in results], indent=2) + "\n"
+        )
+
+    over = [result for result in results if result.disabled_overhead > args.max_overhead]
+    for result in over:
+        print(
+            f"Over budget: disabled hooks cost {result.disabled_overhead:.1%} on "
+            f"{result.program} (allowed {args.max_overhead:.1%})",
+            file=sys.stderr,
+        )
+    if over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
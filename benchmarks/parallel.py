@@ -0,0 +1,98 @@
+import argparse
+import io
+import json
+import os
+import time
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+from flicklang.ast import FunctionDecleration
+from flicklang.parallel import parallel_map
+from flicklang.run_flicklang import run_flicklang_program
+
+# `work(x)` runs an inner loop of `iterations` steps, so the cost per element is tunable.
+SOURCE = """
+fu work(x) {
+    s = 0
+    i = 0
+    w i ls {iterations} {
+        s += (x * i) % 7
+        i += 1
+    }
+    ret s
+}
+"""
+
+
+@dataclass
+class ScalingResult:
+    workers: int
+    seconds: float
+    speedup: float
+    efficiency: float
+
+
+def worker_counts(maximum: int) -> List[int]:
+    """1, 2, 4, ... up to and including `maximum`."""
+    counts = []
+    count = 1
+    while count < maximum:
+        counts.append(count)
+        count *= 2
+    return counts + [maximum]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Scaling of pmap with worker processes.")
+    arg_parser.add_argument("--elements", type=int, default=20000, help="Array length")
+    arg_parser.add_argument(
+        "--iterations", type=int, default=50, help="Loop iterations per element"
+    )
+    arg_parser.add_argument(
+        "--max-workers", type=int, default=os.cpu_count() or 1, help="Most worker processes"
+    )
+    arg_parser.add_argument(
+        "--floats", action="store_true", help="Map an array of floats instead of ints"
+    )
+    arg_parser.add_argument("--json", metavar="OUTPUT", help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    with redirect_stdout(io.StringIO()):
+        interpreter = run_flicklang_program(
+            SOURCE.replace("{iterations}", str(args.iterations))
+        )
+    function = interpreter.environment["work"]
+    assert isinstance(function, FunctionDecleration)
+    values = [float(value) if args.floats else value for value in range(args.elements)]
+
+    results: List[ScalingResult] = []
+    expected = None
+    for workers in worker_counts(args.max_workers):
+        start = time.perf_counter()
+        mapped = parallel_map(interpreter, function, values, workers)
+        seconds = time.perf_counter() - start
+        if expected is None:
+            expected = mapped
+        elif mapped != expected:
+            raise SystemExit(f"Results with {workers} workers differ from one worker")
+        speedup = results[0].seconds / seconds if results else 1.0
+        results.append(ScalingResult(workers, seconds, speedup, speedup / workers))
+    interpreter.end_run()
+
+    print(f"{'Workers':>8} {'time (s)':>10} {'speedup':>8} {'efficiency':>11}")
+    for result in results:
+        print(
+            f"{result.workers:>8} {result.seconds:>10.3f} {result.speedup:>8.2f} "
+            f"{result.efficiency:>11.1%}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([asdict(result) for result in results], indent=2) + "\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+ENTRY_POINT = [sys.executable, "-m", "flicklang.run_flicklang"]
+
+# Counts the error lines and echoes every hundredth one.
+FILTER = """
+errors = 0
+f line in lines() {
+    if line eq 'ERROR request failed' {
+        errors += 1
+        if errors % 100 eq 0 {
+            p errors, line
+        }
+    }
+}
+p errors
+"""
+
+LOG_LINES = ["INFO request served", "DEBUG cache hit", "ERROR request failed", "INFO user login"]
+
+
+@dataclass
+class PipelineResult:
+    input_mib: float
+    seconds: float
+    mib_per_second: float
+    lines_per_second: float
+    # Peak resident set size of the interpreter process.
+    peak_rss_mib: float
+
+
+def write_log(path: Path, size: int) -> int:
+    """Write about `size` bytes of log lines to `path`; returns the number of lines."""
+    block = "\n".join(LOG_LINES * 256) + "\n"
+    repeats = max(1, size // len(block))
+    with open(path, "w") as file:
+        for _ in range(repeats):
+            file.write(block)
+    return repeats * len(LOG_LINES) * 256
+
+
+def run_filter(script: Path, log: Path, lines: int) -> PipelineResult:
+    """Pipe `log` through `script` in a fresh interpreter process."""
+    with open(log, "rb") as stdin:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            ENTRY_POINT + [str(script)],
+            stdin=stdin,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"The filter exited with status {process.returncode}")
+    input_mib = log.stat().st_size / 2**20
+    # ru_maxrss is in KiB on Linux.
+    return PipelineResult(
+        input_mib, seconds, input_mib / seconds, lines / seconds, usage.ru_maxrss / 1024
+    )
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(
+        description="Throughput and memory of a FlickLang filter reading stdin."
+    )
+    arg_parser.add_argument(
+        "--sizes-mib",
+        type=int,
+        nargs="+",
+        default=[16, 64, 256],
+        help="Input sizes to pipe through the filter",
+    )
+    arg_parser.add_argument("--json", metavar="OUTPUT", help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    results: List[PipelineResult] = []
+    with tempfile.TemporaryDirectory() as directory:
+        script = Path(directory) / "filter.fl"
+        script.write_text(FILTER)
+        log = Path(directory) / "input.log"
+        for size in args.sizes_mib:
+            lines = write_log(log, size * 2**20)
+            results.append(run_filter(script, log, lines))
+
+    print(f"{'input (MiB)':>12} {'time (s)':>10} {'MiB/s':>8} {'lines/s':>12} {'peak RSS (MiB)':>15}")
+    for result in results:
+        print(
+            f"{result.input_mib:>12.0f} {result.seconds:>10.2f} {result.mib_per_second:>8.1f} "
+            f"{result.lines_per_second:>12.0f} {result.peak_rss_mib:>15.1f}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([asdict(result) for result in results], indent=2) + "\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
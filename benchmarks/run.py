@@ -0,0 +1,147 @@
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.cases import BenchmarkCase, all_cases
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def measure_peak_memory(function: Callable[[], object]) -> int:
+    """Peak bytes allocated by Python while running `function` once."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(case: BenchmarkCase, min_time: float, max_runs: int, memory: bool) -> Dict[str, Any]:
+    function = case.setup()
+    result: Dict[str, Any] = {}
+    # The traced run doubles as warm-up for the timed runs.
+    if memory:
+        result["peak_memory_bytes"] = measure_peak_memory(function)
+
+    timings: List[float] = []
+    while not timings or (sum(timings) < min_time and len(timings) < max_runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    total = sum(timings)
+    result.update(
+        runs=len(timings),
+        ops_per_sec=len(timings) / total,
+        mean_s=total / len(timings),
+        min_s=min(timings),
+    )
+    return result
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float
+) -> List[str]:
+    """Describe every case that is slower or hungrier than the baseline allows."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result["ops_per_sec"] < reference["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:.2f} ops/s vs baseline "
+                f"{reference['ops_per_sec']:.2f} ops/s"
+            )
+        if (
+            "peak_memory_bytes" in result
+            and "peak_memory_bytes" in reference
+            and result["peak_memory_bytes"] > reference["peak_memory_bytes"] * (1 + threshold)
+        ):
+            regressions.append(
+                f"{name}: peak memory {result['peak_memory_bytes']} B vs baseline "
+                f"{reference['peak_memory_bytes']} B"
+            )
+    return regressions
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Run FlickLang benchmarks.")
+    arg_parser.add_argument(
+        "-k", "--filter", default="*", help="Glob selecting case names, e.g. 'lexer.*'"
+    )
+    arg_parser.add_argument(
+        "--min-time", type=float, default=1.0, help="Minimum timed seconds per case"
+    )
+    arg_parser.add_argument("--max-runs", type=int, default=100, help="Maximum timed runs per case")
+    arg_parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the traced peak memory run"
+    )
+    arg_parser.add_argument("--json", metavar="OUTPUT", help="Write results as JSON")
+    arg_parser.add_argument(
+        "--baseline",
+        default=str(DEFAULT_BASELINE),
+        help="Baseline JSON to compare against (default: benchmarks/baseline.json)",
+    )
+    arg_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative regression before failing (default: 0.25)",
+    )
+    arg_parser.add_argument(
+        "--save-baseline", action="store_true", help="Overwrite the baseline with these results"
+    )
+    args = arg_parser.parse_args()
+
+    cases = [case for case in all_cases() if fnmatch.fnmatch(case.name, args.filter)]
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'Case':<30} {'ops/sec':>12} {'mean (s)':>10} {'runs':>6} {'peak memory':>14}")
+    for case in cases:
+        result = run_case(case, args.min_time, args.max_runs, not args.no_memory)
+        results[case.name] = result
+        memory = (
+            f"{result['peak_memory_bytes'] / 1024:>11.1f} KiB"
+            if "peak_memory_bytes" in result
+            else f"{'-':>14}"
+        )
+        print(
+            f"{case.name:<30} {result['ops_per_sec']:>12.2f} {result['mean_s']:>10.4f} "
+            f"{result['runs']:>6} {memory}",
+            flush=True,
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {baseline_path}")
+        return
+
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
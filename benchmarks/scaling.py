@@ -0,0 +1,232 @@
+import argparse
+import io
+import json
+import math
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.generator import ProgramShape, generate_program
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+
+STAGES = ("lexer", "parser", "interpreter")
+
+# Dimension name -> (base shape, sizes). The dimension's shape field is set to
+# each size in turn while the rest of the base shape stays fixed.
+DIMENSIONS: Dict[str, Tuple[ProgramShape, List[int]]] = {
+    "statements": (ProgramShape(nesting_depth=2), [500, 1000, 2000, 4000, 8000]),
+    "nesting_depth": (
+        ProgramShape(statements=1, nested_fraction=1.0, functions=0, indent_width=0),
+        [50, 100, 200, 400, 800],
+    ),
+    "expression_length": (ProgramShape(statements=50), [100, 200, 400, 800, 1600]),
+    "parenthesis_depth": (
+        ProgramShape(statements=10, expression_length=3),
+        [50, 100, 200, 400, 800],
+    ),
+    "array_size": (ProgramShape(statements=50), [2000, 4000, 8000, 16000, 32000]),
+    "string_appends": (
+        ProgramShape(statements=10, string_length=256),
+        [1000, 2000, 4000, 8000, 16000],
+    ),
+}
+
+
+@dataclass
+class Measurement:
+    size: int
+    seconds: Dict[str, float] = field(default_factory=dict)
+    peak_memory_bytes: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass
+class DimensionResult:
+    dimension: str
+    measurements: List[Measurement]
+    exponents: Dict[str, float]
+    flagged: List[str]
+
+
+def timed(function: Callable[[], Any], repeats: int) -> Tuple[Any, float]:
+    best = math.inf
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def traced_peak(function: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def interpret(program: Any) -> None:
+    with redirect_stdout(io.StringIO()):
+        Interpreter().interpret(program)
+
+
+def measure(source_code: str, size: int, repeats: int, memory: bool) -> Measurement:
+    measurement = Measurement(size)
+    stage_functions: Dict[str, Callable[[Any], Any]] = {
+        "lexer": lambda _: Lexer(source_code).tokenize(),
+        "parser": lambda tokens: Parser(tokens).parse(),
+        "interpreter": interpret,
+    }
+    value: Any = None
+    for stage in STAGES:
+        function = stage_functions[stage]
+        try:
+            result, seconds = timed(lambda: function(value), repeats)
+            if memory:
+                measurement.peak_memory_bytes[stage] = traced_peak(lambda: function(value))
+        except RecursionError:
+            measurement.error = f"{stage}: RecursionError"
+            break
+        except Exception as e:
+            measurement.error = f"{stage}: {type(e).__name__}: {e}"
+            break
+        measurement.seconds[stage] = seconds
+        value = result
+    return measurement
+
+
+def growth_exponent(points: List[Tuple[int, float]]) -> float:
+    """Least-squares slope of log(time) over log(size); 1.0 means linear growth."""
+    points = [(size, seconds) for size, seconds in points if seconds > 0]
+    if len(points) < 2:
+        return math.nan
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(seconds) for _, seconds in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator
+
+
+def run_dimension(
+    dimension: str, repeats: int, memory: bool, threshold: float, seed: int
+) -> DimensionResult:
+    base_shape, sizes = DIMENSIONS[dimension]
+    measurements = []
+    for size in sizes:
+        shape = replace(base_shape, seed=seed, **{dimension: size})
+        measurement = measure(generate_program(shape), size, repeats, memory)
+        measurements.append(measurement)
+        if measurement.error:
+            break
+
+    exponents = {}
+    flagged = []
+    for stage in STAGES:
+        points = [(m.size, m.seconds[stage]) for m in measurements if stage in m.seconds]
+        exponents[stage] = growth_exponent(points)
+        if exponents[stage] > threshold:
+            flagged.append(f"{stage} grows as size^{exponents[stage]:.2f}")
+    failures = [m for m in measurements if m.error]
+    if failures:
+        flagged.append(f"failed at size {failures[0].size} ({failures[0].error})")
+    return DimensionResult(dimension, measurements, exponents, flagged)
+
+
+def print_result(result: DimensionResult) -> None:
+    print(f"\n== {result.dimension} ==")
+    print(
+        f"{'size':>8} " + " ".join(f"{stage + ' ms':>15}" for stage in STAGES)
+        + " " + " ".join(f"{stage + ' KiB':>16}" for stage in STAGES)
+    )
+    for m in result.measurements:
+        times = " ".join(
+            f"{m.seconds[stage] * 1000:>15.2f}" if stage in m.seconds else f"{'-':>15}"
+            for stage in STAGES
+        )
+        memory = " ".join(
+            f"{m.peak_memory_bytes[stage] / 1024:>16.1f}"
+            if stage in m.peak_memory_bytes
+            else f"{'-':>16}"
+            for stage in STAGES
+        )
+        print(f"{m.size:>8} {times} {memory}" + (f"  {m.error}" if m.error else ""))
+    print(
+        f"{'exponent':>8} "
+        + " ".join(f"{result.exponents[stage]:>15.2f}" for stage in STAGES)
+    )
+    for flag in result.flagged:
+        print(f"  SUPER-LINEAR/FAILED: {flag}")
+
+
+def plot_results(results: List[DimensionResult], directory: Path) -> None:
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed; skipping plots.")
+        return
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for result in results:
+        figure, axis = plt.subplots()
+        for stage in STAGES:
+            points = [(m.size, m.seconds[stage]) for m in result.measurements if stage in m.seconds]
+            if points:
+                axis.loglog(*zip(*points), marker="o", label=stage)
+        axis.set_xlabel(result.dimension)
+        axis.set_ylabel("seconds")
+        axis.legend()
+        figure.savefig(directory / f"{result.dimension}.png")
+        plt.close(figure)
+    print(f"Plots written to {directory}")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(
+        description="Measure how the FlickLang pipeline scales with program shape."
+    )
+    arg_parser.add_argument(
+        "-d", "--dimension", action="append", choices=sorted(DIMENSIONS),
+        help="Dimension to scale (repeatable, default: all)",
+    )
+    arg_parser.add_argument("--repeats", type=int, default=3, help="Timed runs per point")
+    arg_parser.add_argument("--seed", type=int, default=0, help="Program generator seed")
+    arg_parser.add_argument(
+        "--threshold", type=float, default=1.3,
+        help="Growth exponent above which a stage is flagged (default: 1.3)",
+    )
+    arg_parser.add_argument("--no-memory", action="store_true", help="Skip peak memory runs")
+    arg_parser.add_argument("--json", metavar="OUTPUT", help="Write results as JSON")
+    arg_parser.add_argument("--plot", metavar="DIRECTORY", help="Write log-log plots (needs matplotlib)")
+    args = arg_parser.parse_args()
+
+    results = [
+        run_dimension(dimension, args.repeats, not args.no_memory, args.threshold, args.seed)
+        for dimension in (args.dimension or list(DIMENSIONS))
+    ]
+    for result in results:
+        print_result(result)
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([asdict(result) for result in results], indent=2) + "\n"
+        )
+    if args.plot:
+        plot_results(results, Path(args.plot))
+
+    flagged = [result.dimension for result in results if result.flagged]
+    if flagged:
+        print(f"\nFlagged dimensions: {', '.join(flagged)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+DEFAULT_BASELINE = Path(__file__).with_name("startup_baseline.json")
+ENTRY_POINT = [sys.executable, "-u", "-m", "flicklang.run_flicklang"]
+PROGRAM = "p 'ready'"
+
+
+@dataclass
+class StartupResult:
+    case: str
+    # Medians over all runs, in milliseconds.
+    first_output_ms: float
+    exit_ms: float
+    # `first_output_ms` minus the start-up of a bare Python interpreter.
+    overhead_ms: float
+
+
+def time_to_first_output(command: List[str], expected: str) -> Tuple[float, float]:
+    """Seconds until `command` prints `expected`, and until it exits."""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    assert process.stdout is not None
+    first_output = None
+    for line in process.stdout:
+        if first_output is None and line.strip() == expected:
+            first_output = time.perf_counter() - start
+    process.wait()
+    exited = time.perf_counter() - start
+    if first_output is None:
+        raise RuntimeError(f"{' '.join(command)} did not print {expected!r}")
+    return first_output, exited
+
+
+def measure(command: List[str], expected: str, runs: int) -> Tuple[float, float]:
+    timings = [time_to_first_output(command, expected) for _ in range(runs)]
+    return (
+        statistics.median(first for first, _ in timings) * 1000,
+        statistics.median(exited for _, exited in timings) * 1000,
+    )
+
+
+def import_breakdown(limit: int) -> List[Tuple[str, int, int]]:
+    """The `limit` slowest imports of a `-c` run as (module, self us, cumulative us)."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "flicklang.run_flicklang", "-c", PROGRAM],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        imports.append((module.rstrip(), int(self_us), int(cumulative_us)))
+    imports.sort(key=lambda entry: entry[1], reverse=True)
+    return imports[:limit]
+
+
+def compare(
+    results: List[StartupResult], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    """Describe every case whose overhead grew beyond the baseline allows."""
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.case)
+        if reference is None:
+            continue
+        if result.overhead_ms > reference["overhead_ms"] * (1 + threshold):
+            regressions.append(
+                f"{result.case}: {result.overhead_ms:.1f} ms beyond Python start-up vs "
+                f"baseline {reference['overhead_ms']:.1f} ms"
+            )
+    return regressions
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(
+        description="Time from launching the flicklang entry point to its first output."
+    )
+    arg_parser.add_argument("--runs", type=int, default=20, help="Launches per case")
+    arg_parser.add_argument(
+        "--budget-ms",
+        type=float,
+        help="Also fail when a case takes longer than this beyond bare Python start-up",
+    )
+    arg_parser.add_argument(
+        "--baseline",
+        default=str(DEFAULT_BASELINE),
+        help="Baseline JSON to compare against (default: benchmarks/startup_baseline.json)",
+    )
+    arg_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative growth of the overhead before failing (default: 0.25)",
+    )
+    arg_parser.add_argument(
+        "--save-baseline", action="store_true", help="Overwrite the baseline with these results"
+    )
+    arg_parser.add_argument(
+        "--imports", type=int, default=15, metavar="N", help="Slowest imports to list"
+    )
+    arg_parser.add_argument("--json", metavar="OUTPUT", help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    bare_ms, _ = measure([sys.executable, "-u", "-c", "print('ready')"], "ready", args.runs)
+    with tempfile.TemporaryDirectory() as directory:
+        script = Path(directory) / "startup.fl"
+        script.write_text(PROGRAM + "\n")
+        cases = {
+            "command": ENTRY_POINT + ["-c", PROGRAM],
+            "script": ENTRY_POINT + [str(script)],
+        }
+        results = []
+        for case, command in cases.items():
+            first_output_ms, exit_ms = measure(command, "ready", args.runs)
+            results.append(
+                StartupResult(case, first_output_ms, exit_ms, first_output_ms - bare_ms)
+            )
+
+    print(f"Bare Python start-up: {bare_ms:.1f} ms")
+    print(f"{'Case':<10} {'first output (ms)':>18} {'exit (ms)':>10} {'overhead (ms)':>14}")
+    for result in results:
+        print(
+            f"{result.case:<10} {result.first_output_ms:>18.1f} "
+            f"{result.exit_ms:>10.1f} {result.overhead_ms:>14.1f}"
+        )
+
+    print("\nSlowest imports of the command case:")
+    print(f"{'self (ms)':>10} {'cumulative (ms)':>16}  module")
+    for module, self_us, cumulative_us in import_breakdown(args.imports):
+        print(f"{self_us / 1000:>10.2f} {cumulative_us / 1000:>16.2f}  {module}")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "bare_ms": bare_ms,
+        "results": {result.case: asdict(result) for result in results},
+    }
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {baseline_path}")
+        return
+
+    failures = []
+    if args.budget_ms is not None:
+        failures = [
+            f"{result.case}: {result.overhead_ms:.1f} ms beyond Python start-up "
+            f"(budget {args.budget_ms:.1f} ms)"
+            for result in results
+            if result.overhead_ms > args.budget_ms
+        ]
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())["results"]
+        failures += compare(results, baseline, args.threshold)
+        if not failures:
+            print(f"\nNo start-up regressions beyond {args.threshold:.0%} against {baseline_path}")
+    if failures:
+        print("\nStart-up regressions:", file=sys.stderr)
+        for failure in failures:
+            print(f"  {failure}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
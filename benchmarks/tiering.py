@@ -0,0 +1,101 @@
+import argparse
+import io
+import json
+import time
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.cases import (
+    PROGRAMS,
+    bubble_sort_program,
+    fibonacci_program,
+    merge_sort_copies_program,
+    merge_sort_views_program,
+)
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+from flicklang.tiering import DEFAULT_THRESHOLD, TieringInterpreter
+
+# Function-heavy programs, and bubble sort, which runs at the top level and so
+# shows what counting costs code that never tiers up.
+PROGRAM_SOURCES: Dict[str, Callable[[], str]] = {
+    "fibonacci": lambda: fibonacci_program(22),
+    "merge_sort_views": lambda: merge_sort_views_program(2000),
+    "merge_sort_copies": lambda: merge_sort_copies_program(2000),
+    "bubble_sort": lambda: bubble_sort_program(200),
+}
+
+
+@dataclass
+class TieringResult:
+    program: str
+    # Fastest run of each, in seconds.
+    interpreted: float
+    tiered: float
+    speedup: float
+    tier_ups: int
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(
+        description="Run time of programs interpreted and with hot functions compiled."
+    )
+    arg_parser.add_argument(
+        "programs", nargs="*", default=list(PROGRAM_SOURCES), help="Benchmark programs to run"
+    )
+    arg_parser.add_argument("--runs", type=int, default=5, help="Runs per variant")
+    arg_parser.add_argument(
+        "--threshold", type=int, default=DEFAULT_THRESHOLD, help="Tier-up threshold"
+    )
+    arg_parser.add_argument("--json", metavar="OUTPUT", help="Write results as JSON")
+    args = arg_parser.parse_args()
+
+    results: List[TieringResult] = []
+    for name in args.programs:
+        source = PROGRAM_SOURCES.get(name, PROGRAMS[name])()
+        program = Parser(Lexer(source).tokenize()).parse()
+        best = {"interpreted": float("inf"), "tiered": float("inf")}
+        tier_ups = 0
+        # Interleaved, so drift in machine speed affects both alike.
+        for _ in range(args.runs):
+            for variant in best:
+                if variant == "tiered":
+                    interpreter: Interpreter = TieringInterpreter(threshold=args.threshold)
+                else:
+                    interpreter = Interpreter()
+                with redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    interpreter.interpret(program)
+                    best[variant] = min(best[variant], time.perf_counter() - start)
+                if isinstance(interpreter, TieringInterpreter):
+                    tier_ups = len(interpreter.stats.tier_ups)
+        results.append(
+            TieringResult(
+                name,
+                best["interpreted"],
+                best["tiered"],
+                best["interpreted"] / best["tiered"],
+                tier_ups,
+            )
+        )
+
+    print(
+        f"{'Program':<18} {'interpreted (s)':>16} {'tiered (s)':>11} {'speedup':>8} {'tier-ups':>9}"
+    )
+    for result in results:
+        print(
+            f"{result.program:<18} {result.interpreted:>16.4f} {result.tiered:>11.4f} "
+            f"{result.speedup:>7.2f}x {result.tier_ups:>9}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([asdict(result) for result in results], indent=2) + "\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
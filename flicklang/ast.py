@@ -1,12 +1,14 @@
-from dataclasses import dataclass
-from typing import List, Optional, Union
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from flicklang.models import Token
 
 
 @dataclass
 class Node:
-    pass
+    # Source position (1-based) of the token the node starts at, 0 if unknown.
+    line: int = field(default=0, compare=False, repr=False, kw_only=True)
+    column: int = field(default=0, compare=False, repr=False, kw_only=True)
 
 
 @dataclass
@@ -84,12 +86,26 @@ class ArrayLiteral(Node):
     elements: List[Node]
 
 
+@dataclass
+class MapLiteral(Node):
+    keys: List[Node]
+    values: List[Node]
+
+
 @dataclass
 class ArrayIndex(Node):
     array: Node
     index: Node
 
 
+@dataclass
+class ArraySlice(Node):
+    """`array[start:end]`; a missing bound means the start or end of the array."""
+    array: Node
+    start: Optional[Node]
+    end: Optional[Node]
+
+
 @dataclass
 class ArrayIndexAssignment(Node):
     array: Variable
@@ -103,6 +119,24 @@ class WhileLoop(Node):
     body: Block
 
 
+@dataclass
+class ForRange(Node):
+    """`f variable start end [step] { body }`, counting from start up to, not including, end."""
+    variable: Variable
+    start: Node
+    end: Node
+    step: Optional[Node]
+    body: Block
+
+
+@dataclass
+class ForEach(Node):
+    """`f variable in iterable { body }`, over array elements, map keys or characters."""
+    variable: Variable
+    iterable: Node
+    body: Block
+
+
 @dataclass
 class FunctionDecleration(Node):
     name: Token
@@ -119,3 +153,106 @@ class FunctionCall(Node):
 @dataclass
 class Return(Node):
     expression: Node
+
+
+def _compare_as_generic(cls: type) -> type:
+    """
+    Make a specialized node compare equal to the generic node it specializes.
+
+    Specialization switches the class of a node in place, and a dataclass only
+    compares equal to instances of its exact class, so without this a tree
+    would stop comparing equal to a fresh parse of the same source.
+    """
+    generic = cls.__base__
+    names = tuple(node_field.name for node_field in fields(generic) if node_field.compare)
+
+    def __eq__(self: Node, other: object) -> bool:
+        if not isinstance(other, generic):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in names)
+
+    setattr(cls, "__eq__", __eq__)
+    return cls
+
+
+# Specialized variants of the generic operation nodes. An optimization pass
+# switches a node's class to one of these once its operand types are known, so
+# the interpreter can apply `operation` without the generic runtime checks.
+
+
+@_compare_as_generic
+@dataclass
+class TypedBinaryOp(BinaryOp):
+    operation: Callable[[Any, Any], Any] = field(init=False, compare=False, repr=False)
+
+
+@_compare_as_generic
+@dataclass
+class TypedComparisonOp(ComparisonOp):
+    operation: Callable[[Any, Any], bool] = field(init=False, compare=False, repr=False)
+
+
+@_compare_as_generic
+@dataclass
+class TypedArrayIndex(ArrayIndex):
+    """`ArrayIndex` on a value known to be an array with an integer index."""
+
+
+@_compare_as_generic
+@dataclass
+class TypedArrayIndexAssignment(ArrayIndexAssignment):
+    """`ArrayIndexAssignment` on a value known to be an array with an integer index."""
+
+
+# Variants installed at runtime by `QuickeningInterpreter` from the operand
+# types a node has seen. They guard on those types and revert to the generic
+# class when a later value does not match.
+
+
+@_compare_as_generic
+@dataclass
+class QuickenedBinaryOp(BinaryOp):
+    operation: Callable[[Any, Any], Any] = field(init=False, compare=False, repr=False)
+    left_type: type = field(init=False, compare=False, repr=False)
+    right_type: type = field(init=False, compare=False, repr=False)
+
+
+@_compare_as_generic
+@dataclass
+class QuickenedComparisonOp(ComparisonOp):
+    operation: Callable[[Any, Any], bool] = field(init=False, compare=False, repr=False)
+    left_type: type = field(init=False, compare=False, repr=False)
+    right_type: type = field(init=False, compare=False, repr=False)
+
+
+@_compare_as_generic
+@dataclass
+class QuickenedArrayIndex(ArrayIndex):
+    """`ArrayIndex` that has so far only seen a list indexed by an int."""
+
+
+@_compare_as_generic
+@dataclass
+class QuickenedVariable(Variable):
+    """`Variable` that has so far always been bound when read."""
+
+
+# Node class -> names of its dataclass fields, since `fields()` is slow.
+_field_names: Dict[type, Tuple[str, ...]] = {}
+
+
+def iter_child_nodes(node: Node) -> Iterator[Node]:
+    """Yield the direct child nodes of `node` in field order."""
+    names = _field_names.get(type(node))
+    if names is None:
+        names = _field_names[type(node)] = tuple(
+            node_field.name for node_field in fields(node)
+        )
+    for name in names:
+        value = getattr(node, name)
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, Node):
+                    yield item
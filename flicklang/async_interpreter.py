@@ -0,0 +1,250 @@
+import asyncio
+import sys
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, cast
+
+from flicklang.ast import (
+    ArrayIndex,
+    ArrayIndexAssignment,
+    ArraySlice,
+    ArrayLiteral,
+    Assignment,
+    BinaryOp,
+    Block,
+    ComparisonOp,
+    CompoundAssignment,
+    ForEach,
+    ForRange,
+    FunctionCall,
+    FunctionDecleration,
+    If,
+    MapLiteral,
+    Node,
+    Print,
+    Program,
+    Return,
+    UnaryOp,
+    Variable,
+    WhileLoop,
+    iter_child_nodes,
+)
+from flicklang.builtins import BuiltinFunction
+from flicklang.exceptions import ExecutionError, ReturnSignal
+from flicklang.interpreter import Interpreter, loop_elements, loop_range, slice_array
+from flicklang.limits import ExecutionLimits
+from flicklang.values import map_key
+
+OutputSink = Callable[[str], Awaitable[None]]
+
+# Loop iterations and calls between two yields to the event loop.
+DEFAULT_YIELD_INTERVAL = 100
+
+
+async def stdout_sink(line: str) -> None:
+    sys.stdout.write(line + "\n")
+
+
+def contains_async_work(node: Node) -> bool:
+    """Whether `node` or a node below it loops, calls a function or prints."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, (WhileLoop, ForRange, ForEach, FunctionCall, Print)):
+            return True
+        # Declaring a function does not run its body.
+        if not isinstance(current, FunctionDecleration):
+            stack.extend(iter_child_nodes(current))
+    return False
+
+
+class AsyncInterpreter(Interpreter):
+    """
+    Interpreter that runs a program as an asyncio coroutine.
+
+    Loop back-edges and function calls count down a step counter, and every
+    `yield_interval` steps the interpreter yields to the event loop, so many
+    programs can share one loop fairly and each task can be cancelled between
+    steps. Printed lines are awaited on an async `output` sink.
+
+    Only nodes that can loop, call or print are executed asynchronously; every
+    other subtree is evaluated with the synchronous visitor, which keeps the
+    overhead of the coroutine machinery off plain arithmetic.
+    """
+
+    def __init__(
+        self,
+        output: OutputSink = stdout_sink,
+        yield_interval: int = DEFAULT_YIELD_INTERVAL,
+        limits: Optional[ExecutionLimits] = None,
+    ) -> None:
+        super().__init__(limits)
+        self.output = output
+        self.yield_interval = yield_interval
+        self.countdown = yield_interval
+        # Node id -> `contains_async_work`, filled in as nodes are reached.
+        self.async_nodes: Dict[int, bool] = {}
+
+    async def interpret_async(self, node: Node) -> Any:
+        if isinstance(node, Program):
+            self.start_budget()
+            try:
+                await self.execute_statements(node.statements)
+            except ReturnSignal:
+                raise ExecutionError("Return statement outside of a function.")
+            finally:
+                self.end_run()
+        else:
+            return await self.execute(node)
+
+    def needs_async(self, node: Node) -> bool:
+        """Whether running `node` can loop, call a function or print."""
+        cached = self.async_nodes.get(id(node))
+        if cached is None:
+            cached = self.async_nodes[id(node)] = contains_async_work(node)
+        return cached
+
+    def step(self) -> bool:
+        """Count one step; True when it is time to yield to the event loop."""
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.countdown = self.yield_interval
+            return True
+        return False
+
+    async def execute_statements(self, statements: List[Node]) -> None:
+        for statement in statements:
+            if self.needs_async(statement):
+                await self.execute(statement)
+            else:
+                self.visit(statement)
+
+    async def execute(self, node: Node) -> Any:
+        if not self.needs_async(node):
+            return self.visit(node)
+
+        if isinstance(node, Block):
+            await self.execute_statements(node.statements)
+        elif isinstance(node, WhileLoop):
+            while (condition := await self.evaluate(node.condition)) is True:
+                await self.execute(node.body)
+                if self.budget is not None:
+                    self.budget.tick()
+                if self.step():
+                    await asyncio.sleep(0)
+            if condition is not False:
+                raise ExecutionError("Condition expression must evaluate to a boolean.")
+        elif isinstance(node, (ForRange, ForEach)):
+            if isinstance(node, ForRange):
+                start = await self.evaluate(node.start)
+                end = await self.evaluate(node.end)
+                step = await self.evaluate(node.step) if node.step is not None else 1
+                values: Iterable[Any] = loop_range(start, end, step)
+            else:
+                values = loop_elements(await self.evaluate(node.iterable))
+            for value in values:
+                self.environment[node.variable.name] = value
+                await self.execute(node.body)
+                if self.budget is not None:
+                    self.budget.tick()
+                if self.step():
+                    await asyncio.sleep(0)
+        elif isinstance(node, If):
+            branch: If | Block | None = node
+            while isinstance(branch, If):
+                condition_result = await self.evaluate(branch.condition)
+                if not isinstance(condition_result, bool):
+                    raise ExecutionError("Condition expression must evaluate to a boolean.")
+                if condition_result:
+                    await self.execute(branch.true_branch)
+                    return None
+                branch = branch.false_branch
+            if branch is not None:
+                await self.execute(branch)
+        elif isinstance(node, Print):
+            values = [str(await self.evaluate(expr)) for expr in node.expressions]
+            await self.output(" ".join(values))
+        elif isinstance(node, Assignment):
+            variable = cast(Variable, node.variable_name)
+            self.environment[variable.name] = await self.evaluate(node.variable_value)
+        elif isinstance(node, CompoundAssignment):
+            variable = cast(Variable, node.variable_name)
+            if variable.name not in self.environment:
+                raise ExecutionError(f"Undefined variable: '{variable}'")
+            current_value = self.environment[variable.name]
+            new_value = await self.evaluate(node.variable_value)
+            self.environment[variable.name] = self.compound_operation(
+                node, current_value, new_value
+            )
+        elif isinstance(node, ArrayIndexAssignment):
+            array_val = self.visit(node.array)
+            index_val = await self.evaluate(node.index)
+            self.assign_index(array_val, index_val, await self.evaluate(node.value))
+        elif isinstance(node, Return):
+            raise ReturnSignal(await self.evaluate(node.expression))
+        else:
+            return await self.evaluate(node)
+        return None
+
+    async def evaluate(self, node: Node) -> Any:
+        """Evaluate an expression, awaiting the function calls inside it."""
+        if not self.needs_async(node):
+            return self.visit(node)
+
+        if isinstance(node, FunctionCall):
+            function = self.resolve_call(node)
+            arguments = [await self.evaluate(arg) for arg in node.parameters]
+            if isinstance(function, BuiltinFunction):
+                return function(self, arguments)
+            return await self.call_function_async(function, arguments)
+        if isinstance(node, BinaryOp):
+            left = await self.evaluate(node.left)
+            return self.binary_operation(node, left, await self.evaluate(node.right))
+        if isinstance(node, ComparisonOp):
+            left = await self.evaluate(node.left)
+            return self.comparison(node, left, await self.evaluate(node.right))
+        if isinstance(node, UnaryOp):
+            return self.unary_operation(node, await self.evaluate(node.operand))
+        if isinstance(node, ArrayLiteral):
+            if self.budget is not None:
+                self.budget.allocate(len(node.elements))
+            return [await self.evaluate(element) for element in node.elements]
+        if isinstance(node, MapLiteral):
+            if self.budget is not None:
+                self.budget.allocate(len(node.keys))
+            return {
+                map_key(await self.evaluate(key)): await self.evaluate(value)
+                for key, value in zip(node.keys, node.values)
+            }
+        if isinstance(node, ArrayIndex):
+            array = await self.evaluate(node.array)
+            return self.index_array(array, await self.evaluate(node.index))
+        if isinstance(node, ArraySlice):
+            array = await self.evaluate(node.array)
+            start = await self.evaluate(node.start) if node.start is not None else None
+            end = await self.evaluate(node.end) if node.end is not None else None
+            return slice_array(array, start, end)
+        return self.no_visit_method(node)
+
+    async def call_function_async(
+        self, function: FunctionDecleration, arguments: List[Any]
+    ) -> Any:
+        old_env = self.enter_function(function, arguments)
+        try:
+            if self.step():
+                await asyncio.sleep(0)
+            return await self.execute(function.body)
+        except ReturnSignal as return_signal:
+            return return_signal.value
+        finally:
+            self.leave_function(old_env)
+
+
+async def run_program(
+    program: Program,
+    output: OutputSink = stdout_sink,
+    yield_interval: int = DEFAULT_YIELD_INTERVAL,
+    limits: Optional[ExecutionLimits] = None,
+) -> AsyncInterpreter:
+    """Run `program` on the current event loop in a fresh interpreter."""
+    interpreter = AsyncInterpreter(output, yield_interval, limits)
+    await interpreter.interpret_async(program)
+    return interpreter
@@ -0,0 +1,163 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+
+from flicklang import fileio
+from flicklang.ast import FunctionDecleration
+from flicklang.exceptions import ExecutionError
+from flicklang.streams import LineReader, stdin_lines
+from flicklang.values import ArrayView, Rope, map_key
+
+if TYPE_CHECKING:
+    from flicklang.interpreter import Interpreter
+
+Implementation = Callable[["Interpreter", List[Any]], Any]
+
+
+@dataclass(frozen=True)
+class BuiltinFunction:
+    """A function implemented in Python that every program can call without declaring it."""
+    name: str
+    arity: int
+    implementation: Implementation
+
+    def __call__(self, interpreter: "Interpreter", arguments: List[Any]) -> Any:
+        return self.implementation(interpreter, arguments)
+
+
+# Name -> builtin. A function declared with the same name shadows the builtin.
+BUILTINS: Dict[str, BuiltinFunction] = {}
+
+
+def builtin(name: str, arity: int) -> Callable[[Implementation], Implementation]:
+    """Register the decorated implementation as the builtin `name`."""
+    def register(implementation: Implementation) -> Implementation:
+        BUILTINS[name] = BuiltinFunction(name, arity, implementation)
+        return implementation
+
+    return register
+
+
+def expect_map(name: str, value: Any) -> Dict[Any, Any]:
+    if not isinstance(value, dict):
+        raise ExecutionError(f"{name} expects a map, got {type(value).__name__}.")
+    return value
+
+
+@builtin("len", 1)
+def length(interpreter: "Interpreter", arguments: List[Any]) -> int:
+    """`len(x)`: the length of an array, map or string."""
+    (value,) = arguments
+    if not isinstance(value, (list, ArrayView, dict, str, Rope)):
+        raise ExecutionError(
+            f"len expects an array, map or string, got {type(value).__name__}."
+        )
+    return len(value)
+
+
+@builtin("copy", 1)
+def copy(interpreter: "Interpreter", arguments: List[Any]) -> List[Any]:
+    """`copy(a)`: a new array with the elements of the array or slice `a`."""
+    (array,) = arguments
+    if not isinstance(array, (list, ArrayView)):
+        raise ExecutionError(f"copy expects an array, got {type(array).__name__}.")
+    if interpreter.budget is not None:
+        interpreter.budget.allocate(len(array))
+    return array.materialize() if isinstance(array, ArrayView) else list(array)
+
+
+@builtin("int", 1)
+def integer(interpreter: "Interpreter", arguments: List[Any]) -> int:
+    """`int(x)`: the number `x` rounded toward zero, e.g. to index with `n / 2`."""
+    (value,) = arguments
+    if type(value) not in (int, float):
+        raise ExecutionError(f"int expects a number, got {type(value).__name__}.")
+    try:
+        return int(value)
+    except (OverflowError, ValueError):
+        raise ExecutionError(f"int cannot convert {value}.")
+
+
+@builtin("has", 2)
+def has(interpreter: "Interpreter", arguments: List[Any]) -> bool:
+    """`has(m, key)`: whether the map `m` contains `key`."""
+    mapping, key = arguments
+    return map_key(key) in expect_map("has", mapping)
+
+
+@builtin("keys", 1)
+def keys(interpreter: "Interpreter", arguments: List[Any]) -> List[Any]:
+    """`keys(m)`: the keys of the map `m` as an array, in insertion order."""
+    mapping = expect_map("keys", arguments[0])
+    if interpreter.budget is not None:
+        interpreter.budget.allocate(len(mapping))
+    return list(mapping)
+
+
+@builtin("values", 1)
+def values(interpreter: "Interpreter", arguments: List[Any]) -> List[Any]:
+    """`values(m)`: the values of the map `m` as an array, in insertion order."""
+    mapping = expect_map("values", arguments[0])
+    if interpreter.budget is not None:
+        interpreter.budget.allocate(len(mapping))
+    return list(mapping.values())
+
+
+@builtin("read_numbers", 1)
+def read_numbers(interpreter: "Interpreter", arguments: List[Any]) -> List[Any]:
+    """`read_numbers(path)`: the whitespace-separated numbers in a file, as an array."""
+    numbers = fileio.read_numbers(arguments[0])
+    if interpreter.budget is not None:
+        interpreter.budget.allocate(len(numbers))
+    return numbers
+
+
+@builtin("read_lines", 1)
+def read_lines(interpreter: "Interpreter", arguments: List[Any]) -> List[str]:
+    """`read_lines(path)`: the lines of a file, without line endings, as an array."""
+    lines = fileio.read_lines(arguments[0])
+    if interpreter.budget is not None:
+        interpreter.budget.allocate(len(lines))
+    return lines
+
+
+@builtin("write_numbers", 2)
+def write_numbers(interpreter: "Interpreter", arguments: List[Any]) -> int:
+    """`write_numbers(path, array)`: write the numbers one per line; returns how many."""
+    path, array = arguments
+    return fileio.write_numbers(path, array)
+
+
+@builtin("write_lines", 2)
+def write_lines(interpreter: "Interpreter", arguments: List[Any]) -> int:
+    """`write_lines(path, array)`: write the elements one per line; returns how many."""
+    path, array = arguments
+    return fileio.write_lines(path, array)
+
+
+@builtin("lines", 0)
+def lines(interpreter: "Interpreter", arguments: List[Any]) -> LineReader:
+    """`lines()`: the lines of standard input, read as a loop asks for them."""
+    return stdin_lines()
+
+
+@builtin("pmap", 2)
+def pmap(interpreter: "Interpreter", arguments: List[Any]) -> List[Any]:
+    """`pmap(fn, array)`: `[fn(array[0]), fn(array[1]), ...]` computed by worker processes."""
+    # Imported on first use; multiprocessing is slow to import.
+    from flicklang.parallel import parallel_map
+
+    function, array = arguments
+    if not isinstance(function, FunctionDecleration):
+        raise ExecutionError("pmap expects a function as its first argument.")
+    if len(function.parameters) != 1:
+        raise ExecutionError(
+            f"pmap expects a function of one argument, {function.name.value} "
+            f"takes {len(function.parameters)}."
+        )
+    if isinstance(array, ArrayView):
+        array = array.materialize()
+    if not isinstance(array, list):
+        raise ExecutionError("pmap expects an array as its second argument.")
+    if interpreter.budget is not None:
+        interpreter.budget.allocate(len(array))
+    return parallel_map(interpreter, function, array)
@@ -0,0 +1,123 @@
+"""
+Thin client for `flicklang serve`.
+
+The client only needs the standard library, so a run costs the Python start-up
+and a round trip to an already warm worker instead of importing the lexer,
+parser and interpreter for every script.
+
+Requests and responses are JSON objects, one per line. A request carries either
+`path` or `source`, plus `optimize`. The worker answers with any number of
+`{"stdout": ...}` and `{"stderr": ...}` chunks while the script runs and ends with
+`{"status": "ok"}` or `{"status": "error", "error": ...}`.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, TextIO
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"flicklang-{os.getuid()}.sock")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def describe_latencies(latencies: List[float]) -> str:
+    """One-line summary of request latencies in milliseconds."""
+    if not latencies:
+        return "0 requests"
+    ordered = sorted(latencies)
+    return (
+        f"{len(ordered)} requests: p50 {percentile(ordered, 0.50) * 1000:.2f} ms, "
+        f"p95 {percentile(ordered, 0.95) * 1000:.2f} ms, "
+        f"p99 {percentile(ordered, 0.99) * 1000:.2f} ms, "
+        f"max {ordered[-1] * 1000:.2f} ms"
+    )
+
+
+def read_messages(connection: socket.socket) -> Iterator[Dict[str, Any]]:
+    """Yield the JSON messages received on `connection` until it is closed."""
+    with connection.makefile("r", encoding="utf-8") as stream:
+        for line in stream:
+            yield json.loads(line)
+
+
+def send_message(connection: socket.socket, message: Dict[str, Any]) -> None:
+    connection.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def submit(
+    request: Dict[str, Any], socket_path: str = DEFAULT_SOCKET, output: TextIO | None = None
+) -> Dict[str, Any]:
+    """
+    Send one request to the server, stream its stdout to `output` and return the
+    final status message.
+    """
+    output = output if output is not None else sys.stdout
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        send_message(connection, request)
+        for message in read_messages(connection):
+            if "stdout" in message:
+                output.write(message["stdout"])
+                output.flush()
+            elif "stderr" in message:
+                sys.stderr.write(message["stderr"])
+            else:
+                return message
+    return {"status": "error", "error": "The server closed the connection."}
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Run a FlickLang program on a warm server.")
+    arg_parser.add_argument("file_path", nargs="?", help="The FlickLang file to run")
+    arg_parser.add_argument("-c", dest="source", help="Program passed in as a string")
+    arg_parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Server socket path")
+    arg_parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Specialize operations from inferred and observed operand types",
+    )
+    arg_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Submit the program N times and report latency percentiles to stderr",
+    )
+    args = arg_parser.parse_args()
+
+    if (args.file_path is None) == (args.source is None):
+        arg_parser.error("pass either a file path or -c SOURCE")
+    request: Dict[str, Any] = {"optimize": args.optimize}
+    if args.source is not None:
+        request["source"] = args.source
+    else:
+        # The worker may run in another directory.
+        request["path"] = os.path.abspath(args.file_path)
+
+    latencies = []
+    status: Dict[str, Any] = {}
+    try:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            status = submit(request, args.socket)
+            latencies.append(time.perf_counter() - start)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"Error: no FlickLang server is listening on '{args.socket}'.", file=sys.stderr)
+        sys.exit(2)
+
+    if args.repeat > 1:
+        print(describe_latencies(latencies), file=sys.stderr)
+    if status.get("status") != "ok":
+        print(status.get("error"))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+"""
+Compiles FlickLang functions to Python functions.
+
+A `FunctionDecleration` is translated to Python source that does what the
+interpreter does for each node, then built with `exec`. Local variables
+become Python locals, loops become Python loops and number operators become
+Python operators, so a compiled function runs without the visitor dispatch
+and environment lookups of the tree walker. Anything that needs the
+interpreter's generic behaviour (calls, map keys, slices, views, concatenation
+that may build a rope, every error case) goes through the same helpers the
+interpreter uses, so a compiled function behaves like the interpreted one.
+
+Compiled code does not charge execution limits or produce hook events, so it
+must only run when there are none to enforce or report.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, cast
+
+from flicklang.ast import (
+    ArrayIndex,
+    ArrayIndexAssignment,
+    ArrayLiteral,
+    ArraySlice,
+    Assignment,
+    BinaryOp,
+    Block,
+    ComparisonOp,
+    CompoundAssignment,
+    ForEach,
+    ForRange,
+    FunctionCall,
+    FunctionDecleration,
+    If,
+    MapLiteral,
+    Node,
+    Number,
+    Print,
+    Return,
+    String,
+    UnaryOp,
+    Variable,
+    WhileLoop,
+    iter_child_nodes,
+)
+from flicklang.builtins import BuiltinFunction
+from flicklang.exceptions import ExecutionError
+from flicklang.interpreter import Interpreter, loop_elements, loop_range, slice_array
+from flicklang.models import Comparison, CompoundOperator, Operator
+from flicklang.values import Rope, concatenate, map_key
+
+COMPARISON_OPERATORS = {
+    Comparison.EQ: "==",
+    Comparison.NEQ: "!=",
+    Comparison.GR: ">",
+    Comparison.GRE: ">=",
+    Comparison.LS: "<",
+    Comparison.LSE: "<=",
+}
+
+NOT_BOOLEAN = "Condition expression must evaluate to a boolean."
+
+
+class Unsupported(Exception):
+    """The function uses something the compiler does not translate; it stays interpreted."""
+
+
+class Unbound:
+    """Value of a compiled local that has not been assigned yet."""
+
+    def __repr__(self) -> str:
+        return "<unbound>"
+
+
+UNBOUND = Unbound()
+
+
+def undefined(name: str) -> Any:
+    raise ExecutionError(f"Undefined variable: {name}")
+
+
+def add(left: Any, right: Any) -> Any:
+    if isinstance(left, (str, Rope)):
+        return concatenate(left, right)
+    return left + right
+
+
+def checked_divide(left: Any, right: Any) -> Any:
+    if right == 0:
+        raise ExecutionError("Division by zero.")
+    return left / right
+
+
+def checked_modulo(left: Any, right: Any) -> Any:
+    if right == 0:
+        raise ExecutionError("Modulo by zero.")
+    return left % right
+
+
+def compound_divide(left: Any, right: Any) -> Any:
+    if right == 0:
+        raise ExecutionError("Division by zero in compound assignment.")
+    return left / right
+
+
+def compound_modulo(left: Any, right: Any) -> Any:
+    if right == 0:
+        raise ExecutionError("Modulo by zero in compound assignment.")
+    return left % right
+
+
+def call(interpreter: Interpreter, function: Any, arguments: List[Any]) -> Any:
+    """The end of `visit_FunctionCall`, for a function resolved before its arguments."""
+    if isinstance(function, BuiltinFunction):
+        return function(interpreter, arguments)
+    return interpreter.call_function(function, arguments)
+
+
+# Names the generated code uses besides its constants.
+RUNTIME: Dict[str, Any] = {
+    "UNBOUND": UNBOUND,
+    "ExecutionError": ExecutionError,
+    "undefined": undefined,
+    "add": add,
+    "checked_divide": checked_divide,
+    "checked_modulo": checked_modulo,
+    "compound_divide": compound_divide,
+    "compound_modulo": compound_modulo,
+    "concatenate": concatenate,
+    "map_key": map_key,
+    "loop_range": loop_range,
+    "loop_elements": loop_elements,
+    "slice_array": slice_array,
+    "call": call,
+}
+
+
+def local_name(name: str) -> str:
+    python_name = "v_" + name
+    if not python_name.isidentifier():
+        raise Unsupported(f"variable name {name!r} is not a Python identifier")
+    return python_name
+
+
+def function_nodes(function: FunctionDecleration) -> Iterator[Node]:
+    """Nodes of the function's body, without the bodies of functions declared in it."""
+    stack: List[Node] = [function.body]
+    while stack:
+        node = stack.pop()
+        yield node
+        if not isinstance(node, FunctionDecleration):
+            stack.extend(iter_child_nodes(node))
+
+
+@dataclass
+class CompiledFunction:
+    function: FunctionDecleration
+    # Takes the interpreter and the arguments, after the call entered its scope.
+    code: Callable[..., Any]
+    source: str
+
+
+@dataclass
+class FunctionCompiler:
+    function: FunctionDecleration
+    lines: List[str] = field(default_factory=list)
+    # Objects the generated code refers to by name, such as call nodes.
+    constants: Dict[str, Any] = field(default_factory=dict)
+    # Names assigned somewhere in the function, parameters excluded.
+    assigned_names: Set[str] = field(default_factory=set)
+    temporaries: int = 0
+
+    def compile(self) -> CompiledFunction:
+        function = self.function
+        parameters = [parameter.name for parameter in function.parameters]
+        if len(set(parameters)) != len(parameters):
+            raise Unsupported("a parameter name is repeated")
+        for node in function_nodes(function):
+            if isinstance(node, (Assignment, CompoundAssignment)):
+                self.assigned_names.add(cast(Variable, node.variable_name).name)
+            elif isinstance(node, (ForRange, ForEach)):
+                self.assigned_names.add(node.variable.name)
+            elif isinstance(node, FunctionDecleration):
+                self.assigned_names.add(node.name.value)
+        local_names = self.assigned_names.union(parameters)
+        for node in function_nodes(function):
+            if isinstance(node, FunctionCall) and node.function_name in local_names:
+                raise Unsupported(f"calls {node.function_name!r}, which is a local variable")
+
+        name = f"flick_{function.name.value}"
+        if not name.isidentifier():
+            name = "flick_function"
+        arguments = "".join(f", {local_name(parameter)}" for parameter in parameters)
+        self.lines.append(f"def {name}(interpreter{arguments}):")
+        for variable in sorted(self.assigned_names.difference(parameters)):
+            self.emit(1, f"{local_name(variable)} = UNBOUND")
+        self.block(function.body, set(parameters), 1)
+
+        source = "\n".join(self.lines) + "\n"
+        namespace = dict(RUNTIME, **self.constants)
+        filename = f"<flicklang {function.name.value}:{function.line}>"
+        try:
+            code = compile(source, filename, "exec")
+        except (SyntaxError, RecursionError, MemoryError) as error:
+            # Python limits, such as on how deeply blocks may nest.
+            raise Unsupported(f"Python cannot compile it: {error}")
+        exec(code, namespace)
+        return CompiledFunction(function, namespace[name], source)
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def constant(self, value: Any) -> str:
+        name = f"c{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def temporary(self) -> str:
+        self.temporaries += 1
+        return f"t{self.temporaries}"
+
+    def block(self, block: Block, assigned: Set[str], indent: int) -> Set[str]:
+        """Emit the statements of `block`; returns the names assigned on every path through it."""
+        if not block.statements:
+            self.emit(indent, "pass")
+        for statement in block.statements:
+            self.statement(statement, assigned, indent)
+        return assigned
+
+    def statement(self, node: Node, assigned: Set[str], indent: int) -> None:
+        if isinstance(node, Assignment):
+            name = cast(Variable, node.variable_name).name
+            value = self.expression(node.variable_value, assigned)
+            self.emit(indent, f"{local_name(name)} = {value}")
+            assigned.add(name)
+        elif isinstance(node, CompoundAssignment):
+            self.compound_assignment(node, assigned, indent)
+        elif isinstance(node, ArrayIndexAssignment):
+            array, index, value = self.temporary(), self.temporary(), self.temporary()
+            self.emit(indent, f"{array} = {self.expression(node.array, assigned)}")
+            self.emit(indent, f"{index} = {self.expression(node.index, assigned)}")
+            self.emit(indent, f"{value} = {self.expression(node.value, assigned)}")
+            self.emit(
+                indent,
+                f"if type({array}) is list and type({index}) is int "
+                f"and -len({array}) <= {index} < len({array}):",
+            )
+            self.emit(indent + 1, f"{array}[{index}] = {value}")
+            self.emit(indent, "else:")
+            self.emit(indent + 1, f"interpreter.assign_index({array}, {index}, {value})")
+        elif isinstance(node, Print):
+            parts = "".join(
+                f"str({self.expression(expression, assigned)}), " for expression in node.expressions
+            )
+            self.emit(indent, f"interpreter.output_buffer.write(' '.join(({parts})))")
+        elif isinstance(node, If):
+            self.if_statement(node, assigned, indent)
+        elif isinstance(node, WhileLoop):
+            condition = self.temporary()
+            value = self.expression(node.condition, assigned)
+            self.emit(indent, f"while ({condition} := {value}) is True:")
+            self.block(node.body, set(assigned), indent + 1)
+            self.emit(indent, f"if {condition} is not False:")
+            self.emit(indent + 1, f"raise ExecutionError({NOT_BOOLEAN!r})")
+        elif isinstance(node, ForRange):
+            step = self.expression(node.step, assigned) if node.step is not None else "1"
+            self.emit(
+                indent,
+                f"for {local_name(node.variable.name)} in loop_range("
+                f"{self.expression(node.start, assigned)}, "
+                f"{self.expression(node.end, assigned)}, {step}):",
+            )
+            self.block(node.body, assigned | {node.variable.name}, indent + 1)
+        elif isinstance(node, ForEach):
+            self.emit(
+                indent,
+                f"for {local_name(node.variable.name)} in loop_elements("
+                f"{self.expression(node.iterable, assigned)}):",
+            )
+            self.block(node.body, assigned | {node.variable.name}, indent + 1)
+        elif isinstance(node, FunctionDecleration):
+            self.emit(indent, f"{local_name(node.name.value)} = {self.constant(node)}")
+            assigned.add(node.name.value)
+        elif isinstance(node, Return):
+            self.emit(indent, f"return {self.expression(node.expression, assigned)}")
+        else:
+            self.emit(indent, self.expression(node, assigned))
+
+    def compound_assignment(self, node: CompoundAssignment, assigned: Set[str], indent: int) -> None:
+        name = cast(Variable, node.variable_name).name
+        target = local_name(name)
+        if name not in assigned:
+            # The interpreter's message, which shows the variable node.
+            message = f"Undefined variable: '{node.variable_name}'"
+            self.emit(indent, f"if {target} is UNBOUND:")
+            self.emit(indent + 1, f"raise ExecutionError({message!r})")
+        value = self.expression(node.variable_value, assigned)
+        op = node.op_token.type
+        if op == CompoundOperator.PLUS_ASSIGN:
+            operand = self.temporary()
+            self.emit(indent, f"{operand} = {value}")
+            update = (
+                f"{target} + {operand} if type({target}) is int or type({target}) is float "
+                f"else concatenate({target}, {operand})"
+            )
+        elif op == CompoundOperator.MINUS_ASSIGN:
+            update = f"{target} - {value}"
+        elif op == CompoundOperator.MULTIPLY_ASSIGN:
+            update = f"{target} * {value}"
+        elif op == CompoundOperator.DIVIDE_ASSIGN:
+            update = f"compound_divide({target}, {value})"
+        elif op == CompoundOperator.MODULO_ASSIGN:
+            update = f"compound_modulo({target}, {value})"
+        else:
+            raise Unsupported(f"compound operator {op}")
+        self.emit(indent, f"{target} = {update}")
+        assigned.add(name)
+
+    def if_statement(self, node: If, assigned: Set[str], indent: int) -> None:
+        condition = self.temporary()
+        keyword = "if"
+        branch: Optional[Node] = node
+        # Names each branch assigns on every path through it.
+        branch_names: List[Set[str]] = []
+        while isinstance(branch, If):
+            value = self.expression(branch.condition, assigned)
+            self.emit(indent, f"{keyword} ({condition} := {value}) is True:")
+            branch_names.append(self.block(branch.true_branch, set(assigned), indent + 1))
+            self.emit(indent, f"elif {condition} is not False:")
+            self.emit(indent + 1, f"raise ExecutionError({NOT_BOOLEAN!r})")
+            keyword = "elif"
+            branch = branch.false_branch
+        if isinstance(branch, Block):
+            self.emit(indent, "else:")
+            branch_names.append(self.block(branch, set(assigned), indent + 1))
+            # With an `el` branch one of the branches always runs.
+            assigned |= set.intersection(*branch_names)
+
+    def expression(self, node: Node, assigned: Set[str]) -> str:
+        if isinstance(node, Number):
+            value = float(node.value) if "." in node.value else int(node.value)
+            # `repr` of an overflowing float is `inf`, which is not a literal.
+            return repr(value) if math.isfinite(value) else self.constant(value)
+        if isinstance(node, String):
+            return repr(node.value)
+        if isinstance(node, Variable):
+            return self.variable(node.name, assigned)
+        if isinstance(node, BinaryOp):
+            return self.binary(node, assigned)
+        if isinstance(node, UnaryOp):
+            if node.op_token.type != Operator.MINUS:
+                raise Unsupported(f"unary operator {node.op_token.type}")
+            return f"(-{self.expression(node.operand, assigned)})"
+        if isinstance(node, ComparisonOp):
+            operator = COMPARISON_OPERATORS.get(node.operator.type)  # type: ignore[call-overload]
+            if operator is None:
+                raise Unsupported(f"comparison {node.operator.type}")
+            left = self.expression(node.left, assigned)
+            return f"({left} {operator} {self.expression(node.right, assigned)})"
+        if isinstance(node, ArrayLiteral):
+            elements = "".join(f"{self.expression(element, assigned)}, " for element in node.elements)
+            return f"[{elements}]"
+        if isinstance(node, MapLiteral):
+            entries = "".join(
+                f"{self.map_key(key, assigned)}: {self.expression(value, assigned)}, "
+                for key, value in zip(node.keys, node.values)
+            )
+            return f"{{{entries}}}"
+        if isinstance(node, ArrayIndex):
+            array, index = self.temporary(), self.temporary()
+            # `&` evaluates both sides, so both temporaries are set for the fallback.
+            return (
+                f"({array}[{index}] if (type({array} := {self.expression(node.array, assigned)}) is list) "
+                f"& (type({index} := {self.expression(node.index, assigned)}) is int) "
+                f"and -len({array}) <= {index} < len({array}) "
+                f"else interpreter.index_array({array}, {index}))"
+            )
+        if isinstance(node, ArraySlice):
+            array = self.expression(node.array, assigned)
+            start = self.expression(node.start, assigned) if node.start is not None else "None"
+            end = self.expression(node.end, assigned) if node.end is not None else "None"
+            return f"slice_array({array}, {start}, {end})"
+        if isinstance(node, FunctionCall):
+            arguments = "".join(f"{self.expression(argument, assigned)}, " for argument in node.parameters)
+            return f"call(interpreter, interpreter.resolve_call({self.constant(node)}), [{arguments}])"
+        raise Unsupported(f"{type(node).__name__} nodes")
+
+    def map_key(self, key: Node, assigned: Set[str]) -> str:
+        if isinstance(key, (Number, String)):
+            # Number and string literals are valid keys as they are.
+            return self.expression(key, assigned)
+        return f"map_key({self.expression(key, assigned)})"
+
+    def variable(self, name: str, assigned: Set[str]) -> str:
+        if name in assigned:
+            return local_name(name)
+        if name in self.assigned_names:
+            target = local_name(name)
+            return f"({target} if {target} is not UNBOUND else undefined({name!r}))"
+        # Never assigned in this function, so reading it always fails.
+        return f"undefined({name!r})"
+
+    def binary(self, node: BinaryOp, assigned: Set[str]) -> str:
+        left = self.expression(node.left, assigned)
+        right = self.expression(node.right, assigned)
+        op = node.op_token.type
+        if op == Operator.PLUS:
+            if not isinstance(node.right, (Number, String, Variable)):
+                return f"add({left}, {right})"
+            # Numbers add inline; strings go through `concatenate` to build ropes.
+            # The right operand appears in both branches, so only when it is short.
+            value = self.temporary()
+            return (
+                f"({value} + {right} if type({value} := {left}) is int or type({value}) is float "
+                f"else concatenate({value}, {right}))"
+            )
+        if op == Operator.MINUS:
+            return f"({left} - {right})"
+        if op == Operator.MULTIPLY:
+            return f"({left} * {right})"
+        # A divisor that is a literal other than zero cannot fail the check.
+        literal_divisor = isinstance(node.right, Number) and float(node.right.value) != 0
+        if op == Operator.DIVIDE:
+            return f"({left} / {right})" if literal_divisor else f"checked_divide({left}, {right})"
+        if op == Operator.MODULO:
+            return f"({left} % {right})" if literal_divisor else f"checked_modulo({left}, {right})"
+        raise Unsupported(f"operator {op}")
+
+
+def compile_function(function: FunctionDecleration) -> CompiledFunction:
+    """Compile `function`, raising `Unsupported` when it has to stay interpreted."""
+    return FunctionCompiler(function).compile()
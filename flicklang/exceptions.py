@@ -48,5 +48,23 @@ class ExecutionError(FlickLangError):
 class ReturnSignal(FlickLangError):
     """Exception used to signal a return from a function with a value."""
     def __init__(self, value: Any) -> None:
-        super().__init__(str(value))
-        self.value = value
\ No newline at end of file
+        # A constant message: formatting the value would materialize ropes and
+        # stringify whole arrays on every return.
+        super().__init__("return")
+        self.value = value
+
+class ResourceLimitExceeded(ExecutionError):
+    """Raised when a run exceeds one of its `ExecutionLimits`."""
+    def __init__(self, message: str, limit: str) -> None:
+        super().__init__(message)
+        self.limit = limit
+
+    def __reduce__(self) -> Any:
+        # Rebuilt with both arguments when raised in a worker process.
+        return (type(self), (self.message, self.limit))
+
+
+class SnapshotError(FlickLangError):
+    """Raised when an interpreter snapshot cannot be read or restored."""
+    def __str__(self) -> str:
+        return f"SnapshotError: {self.message}"
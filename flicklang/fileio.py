@@ -0,0 +1,134 @@
+"""
+Bulk file I/O for the `read_numbers`, `read_lines`, `write_numbers` and
+`write_lines` builtins.
+
+Files of at least `MMAP_THRESHOLD` bytes are memory-mapped and decoded one
+chunk of about `CHUNK_SIZE` bytes at a time, cut after a newline so no number or
+line straddles two chunks. Chunks are copied out of the mapping and decoded only
+as the values before them have been added to the array, so reading a large file
+needs the result array plus one chunk instead of the whole file as bytes plus a
+token for every element. Smaller files are read in one call. Lines are split
+only at newlines, the way iterating over a file splits them. Writes format the
+array in batches into one large file buffer, so the text of the whole array
+never has to exist at once.
+"""
+import mmap
+import os
+from itertools import islice
+from typing import Any, Iterable, Iterator, List
+
+from flicklang.exceptions import ExecutionError
+from flicklang.streams import split_lines
+from flicklang.values import ArrayView, Rope
+
+MMAP_THRESHOLD = 1 << 20
+CHUNK_SIZE = 1 << 20
+# Elements formatted per write, and the size of the file buffer the writes go through.
+WRITE_BATCH = 1 << 16
+WRITE_BUFFER = 1 << 20
+
+
+def chunks(data: Any) -> Iterator[bytes]:
+    """Consecutive pieces of `data` of about `CHUNK_SIZE` bytes, each ending after a newline."""
+    start = 0
+    length = len(data)
+    while start < length:
+        end = data.find(b"\n", min(start + CHUNK_SIZE, length) - 1)
+        end = length if end == -1 else end + 1
+        yield data[start:end]
+        start = end
+
+
+def read_chunks(name: str, path: Any) -> Iterator[bytes]:
+    """The file at `path` in one piece if it is small, else in mapped chunks."""
+    if not isinstance(path, (str, Rope)):
+        raise ExecutionError(f"{name} expects a file path, got {type(path).__name__}.")
+    path = str(path)
+    try:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < MMAP_THRESHOLD:
+                yield file.read()
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield from chunks(data)
+    except OSError as e:
+        raise ExecutionError(f"{name}: cannot read '{path}': {e.strerror}")
+
+
+def decode_numbers(chunk: bytes) -> List[Any]:
+    tokens = chunk.split()
+    try:
+        return list(map(int, tokens))
+    except ValueError:
+        pass
+    numbers: List[Any] = []
+    for token in tokens:
+        try:
+            numbers.append(int(token))
+        except ValueError:
+            try:
+                numbers.append(float(token))
+            except ValueError:
+                raise ExecutionError(
+                    f"read_numbers: {token.decode(errors='replace')!r} is not a number."
+                )
+    return numbers
+
+
+def decode_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    # Decoding a whole chunk and splitting the text is much faster than
+    # decoding line by line, and a newline byte is never part of another
+    # UTF-8 character.
+    for chunk in chunks:
+        yield from split_lines(chunk.decode("utf-8", errors="replace"))
+
+
+def read_numbers(path: Any) -> List[Any]:
+    """The whitespace-separated numbers in the file at `path`: ints, or floats where needed."""
+    numbers: List[Any] = []
+    for chunk in read_chunks("read_numbers", path):
+        numbers.extend(decode_numbers(chunk))
+    return numbers
+
+
+def read_lines(path: Any) -> List[str]:
+    """The lines of the file at `path`, without their line endings."""
+    return list(decode_lines(read_chunks("read_lines", path)))
+
+
+def write_all(name: str, path: Any, values: Iterable[Any]) -> None:
+    """Write `values` to `path` one per line, formatted `WRITE_BATCH` elements at a time."""
+    if not isinstance(path, (str, Rope)):
+        raise ExecutionError(f"{name} expects a file path, got {type(path).__name__}.")
+    iterator = iter(values)
+    try:
+        with open(str(path), "w", encoding="utf-8", buffering=WRITE_BUFFER) as file:
+            while batch := list(islice(iterator, WRITE_BATCH)):
+                file.write("\n".join(map(str, batch)) + "\n")
+    except OSError as e:
+        raise ExecutionError(f"{name}: cannot write '{path}': {e.strerror}")
+
+
+def expect_array(name: str, array: Any) -> Any:
+    if not isinstance(array, (list, ArrayView)):
+        raise ExecutionError(f"{name} expects an array, got {type(array).__name__}.")
+    return array
+
+
+def write_numbers(path: Any, array: Any) -> int:
+    """Write the numbers in `array` to `path`, one per line; returns how many."""
+    numbers = expect_array("write_numbers", array)
+    for value in numbers:
+        if type(value) not in (int, float):
+            raise ExecutionError(
+                f"write_numbers expects an array of numbers, found {type(value).__name__}."
+            )
+    write_all("write_numbers", path, numbers)
+    return len(numbers)
+
+
+def write_lines(path: Any, array: Any) -> int:
+    """Write the elements of `array` to `path`, one per line as `p` prints them."""
+    lines = expect_array("write_lines", array)
+    write_all("write_lines", path, lines)
+    return len(lines)
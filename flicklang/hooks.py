@@ -0,0 +1,177 @@
+"""
+Execution events for tracers, coverage tools and debuggers.
+
+Callbacks are registered per `Event` with `Interpreter.add_hook`. The
+interpreter's own methods carry no instrumentation. Nothing is bound until the
+first hook is added, so an interpreter that never had hooks runs exactly the
+untraced code. From then on each method that produces events is bound on the
+interpreter instance, as the traced version below while its events have
+callbacks and as the plain class method otherwise.
+
+Once bound, the names stay and only their values change when hooks come and
+go. Deleting instance attributes would turn the interpreter's compact
+attribute storage into a plain dictionary, which makes every attribute lookup
+in the hot loops measurably slower. Looking methods up on the instance costs a
+few percent too, so an interpreter whose hooks were all removed stays slightly
+slower than one that never had any.
+
+Statement events come from statements in blocks and at the top level of a
+program, so a subclass that overrides `visit_Block` or `interpret` is bypassed
+while statement or error hooks are installed.
+"""
+from enum import Enum
+from types import MethodType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
+
+from flicklang.ast import Block, ForEach, ForRange, FunctionDecleration, Node, Program, WhileLoop
+from flicklang.exceptions import ExecutionError, FlickLangError, ReturnSignal
+
+if TYPE_CHECKING:
+    from flicklang.interpreter import Interpreter
+
+
+class Event(Enum):
+    """What a hook is called for, and with which arguments."""
+    # (statement) before a statement runs.
+    STATEMENT = "statement"
+    # (function, arguments) before a declared function runs.
+    CALL = "call"
+    # (function, value) after a declared function returns.
+    RETURN = "return"
+    # (loop) after each iteration of a `w` or `f` loop.
+    LOOP_ITERATION = "loop_iteration"
+    # (statement, error) once, for the innermost statement an error escapes.
+    ERROR = "error"
+
+
+Hook = Callable[..., None]
+
+
+class HookRegistry:
+    """The callbacks installed on one interpreter, per event."""
+
+    def __init__(self) -> None:
+        self.callbacks: Dict[Event, List[Hook]] = {event: [] for event in Event}
+        # The error the ERROR hooks last saw, so enclosing statements skip it.
+        self.reported_error: Optional[BaseException] = None
+        # Whether `instrument` has bound the traced method names on the interpreter.
+        self.instrumented = False
+
+    def __bool__(self) -> bool:
+        return any(self.callbacks.values())
+
+
+def traced_interpret(self: "Interpreter", node: Node) -> Any:
+    if isinstance(node, Program):
+        # The class method runs the program, calling back here per statement.
+        return type(self).interpret(self, node)
+    return run_statement(self, node)
+
+
+def traced_visit_Block(self: "Interpreter", node: Block) -> None:
+    # The statement loop of `run_statement`, inlined since it runs per statement.
+    hooks = self.hooks
+    callbacks = hooks.callbacks[Event.STATEMENT]
+    visit = self.visit
+    statement = None
+    try:
+        for statement in node.statements:
+            for callback in callbacks:
+                callback(statement)
+            visit(statement)
+    except ReturnSignal:
+        raise
+    except FlickLangError as error:
+        report_error(hooks, statement, error)
+        raise
+
+
+def run_statement(interpreter: "Interpreter", statement: Node) -> Any:
+    hooks = interpreter.hooks
+    for callback in hooks.callbacks[Event.STATEMENT]:
+        callback(statement)
+    try:
+        return interpreter.visit(statement)
+    except ReturnSignal:
+        raise
+    except FlickLangError as error:
+        report_error(hooks, statement, error)
+        raise
+
+
+def report_error(hooks: HookRegistry, statement: Any, error: FlickLangError) -> None:
+    """Call the ERROR hooks, unless an inner statement already reported `error`."""
+    if error is not hooks.reported_error:
+        hooks.reported_error = error
+        for callback in hooks.callbacks[Event.ERROR]:
+            callback(statement, error)
+
+
+def traced_call_function(
+    self: "Interpreter", function: FunctionDecleration, arguments: List[Any]
+) -> Any:
+    callbacks = self.hooks.callbacks
+    for callback in callbacks[Event.CALL]:
+        callback(function, arguments)
+    value = type(self).call_function(self, function, arguments)
+    for callback in callbacks[Event.RETURN]:
+        callback(function, value)
+    return value
+
+
+def traced_visit_WhileLoop(self: "Interpreter", node: WhileLoop) -> None:
+    callbacks = self.hooks.callbacks[Event.LOOP_ITERATION]
+    budget = self.budget
+    while (condition := self.visit(node.condition)) is True:
+        self.visit(node.body)
+        if budget is not None:
+            budget.tick()
+        for callback in callbacks:
+            callback(node)
+    if condition is not False:
+        raise ExecutionError("Condition expression must evaluate to a boolean.")
+
+
+def traced_run_loop(self: "Interpreter", node: ForRange | ForEach, values: Iterable[Any]) -> None:
+    callbacks = self.hooks.callbacks[Event.LOOP_ITERATION]
+    environment = self.environment
+    name = node.variable.name
+    budget = self.budget
+    for value in values:
+        environment[name] = value
+        self.visit(node.body)
+        if budget is not None:
+            budget.tick()
+        for callback in callbacks:
+            callback(node)
+
+
+# Event -> the methods that produce it, with their traced versions.
+TRACED_METHODS: Dict[Event, Dict[str, Callable[..., Any]]] = {
+    Event.STATEMENT: {"interpret": traced_interpret, "visit_Block": traced_visit_Block},
+    Event.ERROR: {"interpret": traced_interpret, "visit_Block": traced_visit_Block},
+    Event.CALL: {"call_function": traced_call_function},
+    Event.RETURN: {"call_function": traced_call_function},
+    Event.LOOP_ITERATION: {
+        "visit_WhileLoop": traced_visit_WhileLoop,
+        "run_loop": traced_run_loop,
+    },
+}
+
+
+def instrument(interpreter: "Interpreter") -> None:
+    """Bind the traced methods that installed hooks need and the class methods otherwise."""
+    hooks = interpreter.hooks
+    if not hooks and not hooks.instrumented:
+        return
+    hooks.instrumented = True
+    callbacks = hooks.callbacks
+    bound: Dict[str, Callable[..., Any]] = {}
+    for methods in TRACED_METHODS.values():
+        for name in methods:
+            bound[name] = getattr(type(interpreter), name)
+    for event, methods in TRACED_METHODS.items():
+        if callbacks[event]:
+            bound.update(methods)
+    for name, function in bound.items():
+        setattr(interpreter, name, MethodType(function, interpreter))
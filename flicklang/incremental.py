@@ -0,0 +1,403 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from flicklang.ast import (
+    Block,
+    ForEach,
+    ForRange,
+    FunctionDecleration,
+    Node,
+    Program,
+    Return,
+    WhileLoop,
+    iter_child_nodes,
+)
+from flicklang.exceptions import ParsingError
+from flicklang.lexer import Lexer
+from flicklang.models import EOFToken, Keyword, Symbol, Token
+from flicklang.parser import Parser
+
+
+@dataclass
+class TextEdit:
+    """Replace `deleted` characters at `offset` with `inserted`."""
+    offset: int
+    deleted: int
+    inserted: str
+
+    def apply(self, source: str) -> str:
+        if self.offset < 0 or self.deleted < 0 or self.offset + self.deleted > len(source):
+            raise ValueError(f"Edit {self} is out of range for a text of length {len(source)}.")
+        return source[: self.offset] + self.inserted + source[self.offset + self.deleted :]
+
+
+@dataclass
+class StatementSpan:
+    """Token range [start, end) of a statement, with the spans of its blocks."""
+    node: Node
+    start: int
+    end: int
+    blocks: List["BlockSpan"] = field(default_factory=list)
+
+
+@dataclass
+class BlockSpan:
+    """
+    Token range of a block from its `{` up to past its `}`, with the spans of
+    its statements. `statements` is the statement list of the `Block` (or the
+    `Program` for the root, whose range runs from -1 up to past the EOF token).
+    """
+    statements: List[Node]
+    start: int
+    end: int
+    spans: List[StatementSpan] = field(default_factory=list)
+
+
+@dataclass
+class RelexResult:
+    tokens: List[Token]
+    # Tokens [start, old_end) of the old list were replaced by [start, new_end).
+    start: int
+    old_end: int
+    new_end: int
+    # Old position of the first reused token and how far it moved.
+    sync_line: int
+    sync_column: int
+    line_delta: int
+    column_delta: int
+
+
+def relex(tokens: List[Token], source: str, edit: TextEdit) -> RelexResult:
+    """
+    Re-lex the part of `tokens` affected by `edit`, `source` being the edited text.
+
+    Lexing restarts at the last token that ends before the edit and stops as soon
+    as a new token past the edit lines up with an old one. The lexer keeps no
+    state between tokens, so from there on the old tokens are still valid; they
+    are reused with their positions shifted in place.
+    """
+    eof_index = len(tokens) - 1
+    delta = len(edit.inserted) - edit.deleted
+    edit_end = edit.offset + len(edit.inserted)
+
+    first_touched = bisect_left(tokens, edit.offset, hi=eof_index, key=lambda token: token.end)
+    start = max(first_touched - 1, 0)
+    lexer = Lexer(source)
+    if first_touched > 0:
+        restart = tokens[start]
+        lexer.pos, lexer.line = restart.offset, restart.line
+        lexer.line_start = restart.offset - restart.column + 1
+
+    relexed: List[Token] = []
+    old_end = start
+    while True:
+        token = lexer.scan_token()
+        if token is None:
+            old_end = eof_index
+            new_line, new_column = lexer.line, lexer.pos - lexer.line_start + 1
+            break
+        if token.offset >= edit_end:
+            target = token.offset - delta
+            while old_end < eof_index and tokens[old_end].offset < target:
+                old_end += 1
+            old = tokens[old_end]
+            if (
+                old_end < eof_index
+                and old.offset == target
+                and old.end == token.end - delta
+                and old.type == token.type
+                and old.value == token.value
+            ):
+                new_line, new_column = token.line, token.column
+                break
+        relexed.append(token)
+
+    # The restart token usually comes out unchanged; keep the old one.
+    while (
+        relexed
+        and start < old_end
+        and relexed[0].offset == tokens[start].offset
+        and relexed[0].end == tokens[start].end
+        and relexed[0].type == tokens[start].type
+        and relexed[0].value == tokens[start].value
+    ):
+        relexed.pop(0)
+        start += 1
+
+    sync = tokens[old_end]
+    sync_line, sync_column = sync.line, sync.column
+    line_delta, column_delta = new_line - sync_line, new_column - sync_column
+    for reused in tokens[old_end:]:
+        if reused.line == sync_line:
+            reused.column += column_delta
+        reused.line += line_delta
+        reused.offset += delta
+        reused.end += delta
+
+    return RelexResult(
+        tokens=tokens[:start] + relexed + tokens[old_end:],
+        start=start,
+        old_end=old_end,
+        new_end=start + len(relexed),
+        sync_line=sync_line,
+        sync_column=sync_column,
+        line_delta=line_delta,
+        column_delta=column_delta,
+    )
+
+
+class SpanRecordingParser(Parser):
+    """Parser that records the token span of every statement and block it parses."""
+
+    def __init__(self, tokens: List[Token], start: int = 0) -> None:
+        super().__init__(tokens)
+        if start:
+            self.pos = start - 1
+            self.advance()
+        # Spans of the statements in the innermost block being parsed, and of the
+        # blocks of the innermost statement being parsed.
+        self.statement_spans: List[List[StatementSpan]] = [[]]
+        self.block_spans: List[List[BlockSpan]] = [[]]
+
+    def parse_block_statement(self, in_block: bool) -> Node:
+        """Parse one statement the way `parse` (top level) or `parse_block` would."""
+        if in_block and self.current_token.type == Keyword.RET:
+            return self.parse_return_statement()
+        return self.parse_statement()
+
+    def parse_statement(self) -> Node:
+        start = self.pos
+        self.block_spans.append([])
+        try:
+            node = super().parse_statement()
+        finally:
+            blocks = self.block_spans.pop()
+        self.statement_spans[-1].append(StatementSpan(node, start, self.pos, blocks))
+        return node
+
+    def parse_return_statement(self) -> Return:
+        start = self.pos
+        node = super().parse_return_statement()
+        self.statement_spans[-1].append(StatementSpan(node, start, self.pos))
+        return node
+
+    def parse_block(self) -> Block:
+        start = self.pos
+        self.statement_spans.append([])
+        try:
+            block = super().parse_block()
+        finally:
+            spans = self.statement_spans.pop()
+        self.block_spans[-1].append(BlockSpan(block.statements, start, self.pos, spans))
+        return block
+
+
+def shift_node_positions(node: Node, relexed: RelexResult, everything: bool) -> None:
+    """
+    Move the positions of nodes in `node`'s subtree that lie past the edit. With
+    `everything` the whole subtree is known to lie past it.
+    """
+    sync = (relexed.sync_line, relexed.sync_column)
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if everything or (current.line, current.column) >= sync:
+            if current.line == relexed.sync_line:
+                current.column += relexed.column_delta
+            current.line += relexed.line_delta
+        stack.extend(iter_child_nodes(current))
+
+
+class IncrementalParser:
+    """
+    Keeps the tokens and AST of a source text up to date across text edits.
+
+    An edit re-lexes only the affected tokens (see `relex`) and then re-parses
+    only the statements around the change in the innermost enclosing block,
+    stopping as soon as the parse lines up with an old statement boundary again.
+    If the change breaks the structure of that block the enclosing block is
+    re-parsed instead, up to the whole program. Untouched statements, including
+    whole `FunctionDecleration` subtrees, keep their node objects; the parser
+    owns its tokens and nodes and updates their positions in place.
+
+    Usage:
+        document = IncrementalParser(source)
+        program = document.edit(offset=10, deleted=1, inserted="2")
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.tokens: List[Token] = []
+        self.program = Program([])
+        self.root = BlockSpan(self.program.statements, -1, 0)
+        self.valid = False
+        # Work done by the last edit.
+        self.relexed_tokens = 0
+        self.reparsed_statements = 0
+        self.reused_statements = 0
+        self.full_parse()
+
+    def full_parse(self) -> Program:
+        self.valid = False
+        self.tokens = Lexer(self.source).tokenize()
+        parser = SpanRecordingParser(self.tokens)
+        self.program = parser.parse()
+        self.root = BlockSpan(
+            self.program.statements, -1, len(self.tokens), parser.statement_spans[0]
+        )
+        self.valid = True
+        self.relexed_tokens = len(self.tokens)
+        self.reparsed_statements = len(self.program.statements)
+        self.reused_statements = 0
+        return self.program
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> Program:
+        """
+        Apply an edit and return the updated program. If the edited text does not
+        tokenize or parse, the error is raised and the next edit parses in full.
+        """
+        text_edit = TextEdit(offset, deleted, inserted)
+        self.source = text_edit.apply(self.source)
+        if not self.valid:
+            return self.full_parse()
+
+        self.valid = False
+        relexed = relex(self.tokens, self.source, text_edit)
+        self.tokens = relexed.tokens
+        self.relexed_tokens = relexed.new_end - relexed.start
+
+        error: ParsingError | None = None
+        for block in reversed(self.damaged_blocks(relexed)):
+            try:
+                first, reuse_from, spans = self.reparse_block(block, relexed)
+            except ParsingError as e:
+                error = e
+                continue
+            self.commit(block, first, reuse_from, spans, relexed)
+            self.valid = True
+            return self.program
+        assert error is not None
+        raise error
+
+    def damaged_blocks(self, relexed: RelexResult) -> List[BlockSpan]:
+        """Blocks enclosing the damaged tokens, from the root to the innermost."""
+        path = [self.root]
+        block = self.root
+        while True:
+            index = bisect_right(block.spans, relexed.start, key=lambda span: span.start) - 1
+            if index < 0 or block.spans[index].end < relexed.old_end:
+                return path
+            inner = [
+                candidate
+                for candidate in block.spans[index].blocks
+                if candidate.start < relexed.start and relexed.old_end <= candidate.end - 1
+            ]
+            if not inner:
+                return path
+            block = inner[0]
+            path.append(block)
+
+    def reparse_block(
+        self, block: BlockSpan, relexed: RelexResult
+    ) -> Tuple[int, int, List[StatementSpan]]:
+        """
+        Re-parse the damaged statements of `block`. Returns the index of the first
+        replaced statement, the index of the first old statement reused after
+        them, and the spans of the new statements.
+        """
+        spans = block.spans
+        delta = relexed.new_end - relexed.old_end
+        # A statement ending right where the damage starts may absorb new tokens,
+        # unless it is closed by its own block.
+        first = bisect_left(spans, relexed.start, key=lambda span: span.end)
+        if (
+            first < len(spans)
+            and spans[first].end == relexed.start
+            and isinstance(spans[first].node, (FunctionDecleration, WhileLoop, ForRange, ForEach))
+        ):
+            first += 1
+        if first < len(spans):
+            parse_from = spans[first].start
+        else:
+            parse_from = spans[-1].end if spans else block.start + 1
+        boundaries = {
+            span.start: index
+            for index, span in enumerate(spans[first:], first)
+            if span.start >= relexed.old_end
+        }
+        close = block.end - 1
+
+        parser = SpanRecordingParser(relexed.tokens, parse_from)
+        while True:
+            if parser.pos >= relexed.new_end:
+                old_position = parser.pos - delta
+                if old_position in boundaries:
+                    reuse_from = boundaries[old_position]
+                    break
+                if old_position == close:
+                    reuse_from = len(spans)
+                    break
+            token = parser.current_token
+            if isinstance(token, EOFToken) or token.type == Symbol.BLOCK_END:
+                raise ParsingError("Edit changes the structure of the enclosing block.", token)
+            parser.parse_block_statement(in_block=block is not self.root)
+        return first, reuse_from, parser.statement_spans[0]
+
+    def commit(
+        self,
+        block: BlockSpan,
+        first: int,
+        reuse_from: int,
+        spans: List[StatementSpan],
+        relexed: RelexResult,
+    ) -> None:
+        self.shift_positions(relexed)
+        self.shift_spans(self.root.spans, relexed)
+        self.root.end += relexed.new_end - relexed.old_end
+        block.statements[first:reuse_from] = [span.node for span in spans]
+        block.spans[first:reuse_from] = spans
+        self.reparsed_statements = len(spans)
+        self.reused_statements = len(block.spans) - len(spans)
+
+    def affected_spans(self, spans: List[StatementSpan], relexed: RelexResult) -> List[StatementSpan]:
+        """Spans that end past the start of the damage, i.e. that contain or follow it."""
+        return spans[bisect_left(spans, relexed.start + 1, key=lambda span: span.end) :]
+
+    def shift_positions(self, relexed: RelexResult) -> None:
+        """Move the node positions of top-level statements that contain or follow the damage."""
+        for span in self.affected_spans(self.root.spans, relexed):
+            if span.start < relexed.old_end:
+                shift_node_positions(span.node, relexed, everything=False)
+            elif relexed.line_delta == 0 and span.node.line > relexed.sync_line:
+                # Statements starting on later lines only moved if lines did.
+                break
+            else:
+                shift_node_positions(span.node, relexed, everything=True)
+
+    def shift_spans(self, spans: List[StatementSpan], relexed: RelexResult) -> None:
+        """Update the token indices of spans that contain or follow the damage."""
+        delta = relexed.new_end - relexed.old_end
+        for span in self.affected_spans(spans, relexed):
+            if span.start >= relexed.old_end:
+                self.shift_span_indices(span, delta)
+                continue
+            span.end += delta
+            for inner in span.blocks:
+                if inner.start >= relexed.old_end:
+                    self.shift_block_indices(inner, delta)
+                elif inner.end > relexed.start:
+                    inner.end += delta
+                    self.shift_spans(inner.spans, relexed)
+
+    def shift_span_indices(self, span: StatementSpan, delta: int) -> None:
+        span.start += delta
+        span.end += delta
+        for block in span.blocks:
+            self.shift_block_indices(block, delta)
+
+    def shift_block_indices(self, block: BlockSpan, delta: int) -> None:
+        block.start += delta
+        block.end += delta
+        for span in block.spans:
+            self.shift_span_indices(span, delta)
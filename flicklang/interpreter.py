@@ -1,13 +1,19 @@
+import operator
+
 from flicklang.ast import (
     ArrayIndex,
     ArrayIndexAssignment,
+    ArraySlice,
     ArrayLiteral,
     Block,
     FunctionCall,
     ComparisonOp,
     CompoundAssignment,
+    ForEach,
+    ForRange,
     FunctionDecleration,
     If,
+    MapLiteral,
     Node,
     Number,
     BinaryOp,
@@ -19,23 +25,148 @@ from flicklang.ast import (
     Print,
     WhileLoop,
     Return,
+    TypedArrayIndex,
+    TypedArrayIndexAssignment,
+    TypedBinaryOp,
+    TypedComparisonOp,
 )
+from flicklang.builtins import BUILTINS, BuiltinFunction
 from flicklang.exceptions import ExecutionError, ReturnSignal
+from flicklang.hooks import Event, Hook, HookRegistry, instrument
+from flicklang.limits import ExecutionBudget, ExecutionLimits, array_result_length
 from flicklang.models import CompoundOperator, Operator, Comparison
-from typing import Dict, Any, cast
+from flicklang.streams import LineReader, OutputBuffer
+from flicklang.values import ArrayView, Rope, concatenate, map_key
+from typing import TYPE_CHECKING, Callable, Dict, Any, Iterable, List, Optional, cast
+
+if TYPE_CHECKING:
+    from flicklang.parallel import WorkerPool
+
+
+def divide(left: Any, right: Any) -> Any:
+    try:
+        return left / right
+    except ZeroDivisionError:
+        raise ExecutionError("Division by zero.")
+
+
+def modulo(left: Any, right: Any) -> Any:
+    try:
+        return left % right
+    except ZeroDivisionError:
+        raise ExecutionError("Modulo by zero.")
+
+
+# Operations applied by the specialized nodes, which skip the generic checks.
+BINARY_OPERATIONS: Dict[Operator, Callable[[Any, Any], Any]] = {
+    Operator.PLUS: operator.add,
+    Operator.MINUS: operator.sub,
+    Operator.MULTIPLY: operator.mul,
+    Operator.DIVIDE: divide,
+    Operator.MODULO: modulo,
+}
+COMPARISON_OPERATIONS: Dict[Comparison, Callable[[Any, Any], bool]] = {
+    Comparison.EQ: operator.eq,
+    Comparison.NEQ: operator.ne,
+    Comparison.GR: operator.gt,
+    Comparison.GRE: operator.ge,
+    Comparison.LS: operator.lt,
+    Comparison.LSE: operator.le,
+}
+
+
+def loop_range(start: Any, end: Any, step: Any) -> range:
+    """The values of a counted for loop."""
+    if not (isinstance(start, int) and isinstance(end, int) and isinstance(step, int)):
+        raise ExecutionError("For loop bounds and step must be integers.")
+    if step == 0:
+        raise ExecutionError("For loop step must not be zero.")
+    return range(start, end, step)
+
+
+def slice_array(array: Any, start: Optional[int], end: Optional[int]) -> ArrayView:
+    """A view of `array[start:end]`; no elements are copied."""
+    if not isinstance(array, (list, ArrayView)):
+        raise ExecutionError(f"Only arrays can be sliced, got {type(array).__name__}.")
+    length = len(array)
+    start = 0 if start is None else start
+    end = length if end is None else end
+    if not (isinstance(start, int) and isinstance(end, int)):
+        raise ExecutionError("Slice bounds must be integers.")
+    if not 0 <= start <= end <= length:
+        raise ExecutionError(
+            f"Slice bounds out of range: {start}:{end} of an array of length {length}."
+        )
+    if isinstance(array, ArrayView):
+        return array.slice(start, end)
+    return ArrayView(array, start, end - start)
+
+
+def loop_elements(iterable: Any) -> Iterable[Any]:
+    """What a for loop over `iterable` visits: array elements, map keys or characters."""
+    if isinstance(iterable, (list, str, ArrayView, LineReader)):
+        return iterable
+    if isinstance(iterable, dict):
+        # A copy of the keys, so the body can add entries.
+        return list(iterable)
+    if isinstance(iterable, Rope):
+        return iterable.materialize()
+    raise ExecutionError(f"Cannot iterate over {type(iterable).__name__}.")
 
 
 class Interpreter:
-    def __init__(self) -> None:
+    def __init__(self, limits: Optional[ExecutionLimits] = None) -> None:
         self.environment: Dict[str, Any] = {}
+        # Top-level scope, where functions called from other functions are looked up.
+        self.global_environment = self.environment
+        self.call_depth = 0
+        self.limits = limits
+        # Usage of the current run, None when there are no limits to enforce.
+        self.budget: Optional[ExecutionBudget] = None
+        # Lines printed by `p`, written out when it fills up and when a run ends.
+        self.output_buffer = OutputBuffer()
+        # Worker processes of `pmap`, started by the first call of a run.
+        self.worker_pool: Optional["WorkerPool"] = None
+        self.hooks = HookRegistry()
+        instrument(self)
+
+    def add_hook(self, event: Event, callback: Hook) -> None:
+        """Call `callback` on every `event`; see `flicklang.hooks` for the arguments."""
+        self.hooks.callbacks[event].append(callback)
+        instrument(self)
+
+    def remove_hook(self, event: Event, callback: Hook) -> None:
+        self.hooks.callbacks[event].remove(callback)
+        instrument(self)
 
     def interpret(self, node: Node) -> Any:
         if isinstance(node, Program):
-            for statement in node.statements:
-                self.interpret(statement)
+            self.start_budget()
+            try:
+                for statement in node.statements:
+                    self.interpret(statement)
+            except ReturnSignal:
+                raise ExecutionError("Return statement outside of a function.")
+            finally:
+                self.end_run()
         else:
             self.visit(node)
 
+    def start_budget(self) -> None:
+        """Begin charging a new run against the limits."""
+        if self.limits is not None:
+            self.budget = ExecutionBudget(self.limits)
+
+    def end_run(self) -> None:
+        """
+        Finish a run of a program: write out the lines it printed that are still
+        buffered and stop its `pmap` workers.
+        """
+        self.output_buffer.flush()
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+            self.worker_pool = None
+
     def visit_Number(self, node: Number) -> int | float:
         try:
             return float(node.value) if "." in node.value else int(node.value)
@@ -53,10 +184,17 @@ class Interpreter:
             raise ExecutionError(f"Undefined variable: {var_name}")
 
     def visit_BinaryOp(self, node: BinaryOp) -> float:
-        left = self.visit(node.left)
-        right = self.visit(node.right)
+        return self.binary_operation(node, self.visit(node.left), self.visit(node.right))
 
+    def binary_operation(self, node: BinaryOp, left: Any, right: Any) -> Any:
+        """Apply the operator of `node` to evaluated operands, with runtime checks."""
+        if self.budget is not None:
+            self.budget.allocate(
+                array_result_length(cast(Operator, node.op_token.type), left, right)
+            )
         if node.op_token.type == Operator.PLUS:
+            if isinstance(left, (str, Rope)):
+                return concatenate(left, right)
             return left + right
         elif node.op_token.type == Operator.MINUS:
             return left - right
@@ -73,17 +211,23 @@ class Interpreter:
         else:
             raise ExecutionError(f"Unsupported operator: {node.op_token.type}")
 
+    def visit_TypedBinaryOp(self, node: TypedBinaryOp) -> Any:
+        return node.operation(self.visit(node.left), self.visit(node.right))
+
     def visit_UnaryOp(self, node: UnaryOp) -> float:
+        return self.unary_operation(node, self.visit(node.operand))
+
+    def unary_operation(self, node: UnaryOp, operand: Any) -> Any:
         op_type = node.op_token.type
         if op_type == Operator.MINUS:
-            return -self.visit(node.operand)
+            return -operand
         else:
             raise ExecutionError(f"Unsupported unary operator: {op_type}")
 
     def visit_ComparisonOp(self, node: ComparisonOp) -> bool:
-        left_value = self.visit(node.left)
-        right_value = self.visit(node.right)
+        return self.comparison(node, self.visit(node.left), self.visit(node.right))
 
+    def comparison(self, node: ComparisonOp, left_value: Any, right_value: Any) -> bool:
         if node.operator.type == Comparison.EQ:
             return left_value == right_value
         elif node.operator.type == Comparison.NEQ:
@@ -101,14 +245,35 @@ class Interpreter:
                 f"Unsupported comparison operator: {node.operator.type}"
             )
 
+    def visit_TypedComparisonOp(self, node: TypedComparisonOp) -> bool:
+        return node.operation(self.visit(node.left), self.visit(node.right))
+
     def visit_ArrayLiteral(self, node: ArrayLiteral) -> list:
+        if self.budget is not None:
+            self.budget.allocate(len(node.elements))
         return [self.visit(element) for element in node.elements]
 
     def visit_ArrayIndex(self, node: ArrayIndex) -> Any:
-        array = self.visit(node.array)
-        index = self.visit(node.index)
+        return self.index_array(self.visit(node.array), self.visit(node.index))
+
+    def visit_MapLiteral(self, node: MapLiteral) -> dict:
+        if self.budget is not None:
+            self.budget.allocate(len(node.keys))
+        return {
+            map_key(self.visit(key)): self.visit(value)
+            for key, value in zip(node.keys, node.values)
+        }
 
-        if not isinstance(array, list):
+    def index_array(self, array: Any, index: Any) -> Any:
+        if type(array) is ArrayView and type(index) is int and 0 <= index < array.length:
+            # Inlined `ArrayView.__getitem__` for the common case; views are hot.
+            return array.backing[array.start + index]
+        if isinstance(array, dict):
+            try:
+                return array[map_key(index)]
+            except KeyError:
+                raise ExecutionError(f"Key not found: {index!r}")
+        if not isinstance(array, (list, ArrayView)):
             raise ExecutionError("Attempting to index a non-list type.")
 
         try:
@@ -118,15 +283,50 @@ class Interpreter:
         except IndexError:
             raise ExecutionError(f"Array index out of bounds: {index}")
 
+    def visit_ArraySlice(self, node: ArraySlice) -> ArrayView:
+        array = self.visit(node.array)
+        start = self.visit(node.start) if node.start is not None else None
+        end = self.visit(node.end) if node.end is not None else None
+        return slice_array(array, start, end)
+
+    def visit_TypedArrayIndex(self, node: TypedArrayIndex) -> Any:
+        array = self.visit(node.array)
+        index = self.visit(node.index)
+        try:
+            return array[index]
+        except IndexError:
+            raise ExecutionError(f"Array index out of bounds: {index}")
+
     def visit_ArrayIndexAssignment(self, node: ArrayIndexAssignment) -> None:
         array_val = self.visit(node.array)
         index_val = self.visit(node.index)
+        self.assign_index(array_val, index_val, self.visit(node.value))
+
+    def assign_index(self, array: Any, index: Any, value: Any) -> None:
+        if type(array) is ArrayView and type(index) is int and 0 <= index < array.length:
+            array.backing[array.start + index] = value
+            return
+        if isinstance(array, dict):
+            key = map_key(index)
+            if self.budget is not None and key not in array:
+                self.budget.allocate(1)
+            array[key] = value
+            return
+        if not isinstance(index, int):
+            raise TypeError(f"Index has to be int. Index type was {type(index)}.")
+        try:
+            array[index] = value
+        except IndexError:
+            raise ExecutionError(f"Array index out of bounds: {index}")
 
-        if not isinstance(index_val, int):
-            raise TypeError(f"Index has to be int. Index type was {type(index_val)}.")
-
+    def visit_TypedArrayIndexAssignment(self, node: TypedArrayIndexAssignment) -> None:
+        array_val = self.visit(node.array)
+        index_val = self.visit(node.index)
         value_val = self.visit(node.value)
-        array_val[index_val] = value_val
+        try:
+            array_val[index_val] = value_val
+        except IndexError:
+            raise ExecutionError(f"Array index out of bounds: {index_val}")
 
     def visit_Assignment(self, node: Assignment) -> None:
         variable = cast(Variable, node.variable_name)
@@ -140,9 +340,23 @@ class Interpreter:
 
         current_value = self.environment[variable_name.name]
         new_value = self.visit(node.variable_value)
+        self.environment[variable_name.name] = self.compound_operation(
+            node, current_value, new_value
+        )
+
+    def compound_operation(
+        self, node: CompoundAssignment, current_value: Any, new_value: Any
+    ) -> Any:
+        """The value a compound assignment stores, given the evaluated operands."""
+        if self.budget is not None:
+            self.budget.allocate(
+                array_result_length(
+                    cast(CompoundOperator, node.op_token.type), current_value, new_value
+                )
+            )
 
         if node.op_token.type == CompoundOperator.PLUS_ASSIGN:
-            updated_value = current_value + new_value
+            updated_value = concatenate(current_value, new_value)
         elif node.op_token.type == CompoundOperator.MINUS_ASSIGN:
             updated_value = current_value - new_value
         elif node.op_token.type == CompoundOperator.MULTIPLY_ASSIGN:
@@ -158,37 +372,66 @@ class Interpreter:
         else:
             raise ExecutionError(f"Unsupported compound operator: {node.op_token.type}")
 
-        self.environment[variable_name.name] = updated_value
+        return updated_value
 
     def visit_Print(self, node: Print) -> None:
         output = " ".join(str(self.visit(expr)) for expr in node.expressions)
-        print(output)
+        self.output_buffer.write(output)
 
     def visit_If(self, node: If) -> Any:
-        condition_result = self.visit(node.condition)
-        if not isinstance(condition_result, bool):
-            raise ExecutionError("Condition expression must evaluate to a boolean.")
+        # Walk `eli` chains in a loop so long chains do not nest Python frames.
+        branch: If | Block | None = node
+        while isinstance(branch, If):
+            condition_result = self.visit(branch.condition)
+            if not isinstance(condition_result, bool):
+                raise ExecutionError("Condition expression must evaluate to a boolean.")
 
-        if condition_result:
-            self.visit(node.true_branch)
-        elif node.false_branch is not None:
-            if isinstance(node.false_branch, If):
-                self.visit(node.false_branch)
-            else:
-                self.visit(node.false_branch)
+            if condition_result:
+                self.visit(branch.true_branch)
+                return
+            branch = branch.false_branch
 
-    def visit_WhileLoop(self, node: WhileLoop) -> None:
-        while True:
-            condition_result = self.visit(node.condition)
-            if isinstance(node.condition, ComparisonOp):
-                condition_eval = self.visit_ComparisonOp(node.condition)
-            else:
-                condition_eval = condition_result
+        if branch is not None:
+            self.visit(branch)
 
-            if not condition_eval:
-                break
+    def visit_WhileLoop(self, node: WhileLoop) -> None:
+        budget = self.budget
+        if budget is None:
+            while (condition := self.visit(node.condition)) is True:
+                self.visit(node.body)
+        else:
+            # Charge every iteration at the back-edge.
+            while (condition := self.visit(node.condition)) is True:
+                self.visit(node.body)
+                budget.tick()
+        if condition is not False:
+            raise ExecutionError("Condition expression must evaluate to a boolean.")
 
-            self.visit(node.body)
+    def visit_ForRange(self, node: ForRange) -> None:
+        start = self.visit(node.start)
+        end = self.visit(node.end)
+        step = self.visit(node.step) if node.step is not None else 1
+        self.run_loop(node, loop_range(start, end, step))
+
+    def visit_ForEach(self, node: ForEach) -> None:
+        self.run_loop(node, loop_elements(self.visit(node.iterable)))
+
+    def run_loop(self, node: ForRange | ForEach, values: Iterable[Any]) -> None:
+        """Run the loop body once per value, bound to the loop variable, as a native loop."""
+        environment = self.environment
+        name = node.variable.name
+        body = node.body
+        budget = self.budget
+        if budget is None:
+            for value in values:
+                environment[name] = value
+                self.visit(body)
+            return
+
+        for value in values:
+            environment[name] = value
+            self.visit(body)
+            budget.tick()
 
     def visit_FunctionDecleration(self, node: FunctionDecleration) -> None:
         self.environment[node.name.value] = node
@@ -204,38 +447,79 @@ class Interpreter:
         5. Restore the previous environment once function execution is complete.
         6. Return the result.
         """
-        if node.function_name not in self.environment:
-            raise ExecutionError(f"Function {node.function_name} is not defined.")
-
-        function: FunctionDecleration = self.environment[node.function_name]
-
-        if len(node.parameters) != len(function.parameters):
+        function = self.resolve_call(node)
+        arguments = [self.visit(arg) for arg in node.parameters]
+        if isinstance(function, BuiltinFunction):
+            return function(self, arguments)
+        return self.call_function(function, arguments)
+
+    def resolve_call(self, node: FunctionCall) -> FunctionDecleration | BuiltinFunction:
+        """The function `node` calls, checked against the number of arguments."""
+        function = self.lookup_function(node.function_name)
+
+        if isinstance(function, BuiltinFunction):
+            expected = function.arity
+        else:
+            expected = len(function.parameters)
+        if len(node.parameters) != expected:
             raise ExecutionError(
-                f"Expected {len(function.parameters)} arguments, got {len(node.parameters)}."
+                f"Expected {expected} arguments, got {len(node.parameters)}."
             )
+        return function
 
+    def lookup_function(self, name: str) -> FunctionDecleration | BuiltinFunction:
+        """
+        Resolve a function in the current scope, falling back to the global one
+        and then to the builtins.
+        """
+        function = self.environment.get(name)
+        if function is None and self.call_depth:
+            function = self.global_environment.get(name)
+        if function is None:
+            function = BUILTINS.get(name)
+        if function is None:
+            raise ExecutionError(f"Function {name} is not defined.")
+        if not isinstance(function, (FunctionDecleration, BuiltinFunction)):
+            raise ExecutionError(f"{name} is not a function.")
+        return function
+
+    def call_function(self, function: FunctionDecleration, arguments: List[Any]) -> Any:
+        """Run `function` with already evaluated `arguments` in a fresh local scope."""
+        old_env = self.enter_function(function, arguments)
+        try:
+            return self.visit(function.body)
+        except ReturnSignal as return_signal:
+            return return_signal.value
+        finally:
+            self.leave_function(old_env)
+
+    def enter_function(
+        self, function: FunctionDecleration, arguments: List[Any]
+    ) -> Dict[str, Any]:
+        """Switch to a new local scope for `function`, returning the caller's scope."""
         new_env = {
-            param.name: self.visit(arg)
-            for param, arg in zip(function.parameters, node.parameters)
+            param.name: argument
+            for param, argument in zip(function.parameters, arguments)
         }
+        if not self.call_depth:
+            self.global_environment = self.environment
+        if self.budget is not None:
+            self.budget.enter_call(self.call_depth)
         old_env, self.environment = self.environment, new_env
+        self.call_depth += 1
+        return old_env
 
-        try:
-            result = self.visit(function.body)
-            return result
-        finally:
-            self.environment = old_env
+    def leave_function(self, old_env: Dict[str, Any]) -> None:
+        self.call_depth -= 1
+        self.environment = old_env
 
     def visit_Return(self, node: Return) -> Any:
         return_value = self.visit(node.expression)
         raise ReturnSignal(return_value)
 
-    def visit_Block(self, node: Block) -> Any:
-        try:
-            for statement in node.statements:
-                self.visit(statement)
-        except ReturnSignal as return_signal:
-            return return_signal.value
+    def visit_Block(self, node: Block) -> None:
+        for statement in node.statements:
+            self.visit(statement)
 
     def visit(self, node: Node) -> Any:
         method_name = "visit_" + type(node).__name__
@@ -2,20 +2,15 @@ from typing import List
 
 from flicklang.exceptions import TokenizationError
 from flicklang.models import (
-    CompoundOperator,
     SyntaxTokenType,
-    Comparison,
-    Keyword,
     Token,
     EOFToken,
-    Operator,
-    Symbol,
     Fundamental,
-    operators,
-    symbols,
-    comparisons,
-    keywords,
-    compound_operators
+    operator_types,
+    symbol_types,
+    comparison_types,
+    keyword_types,
+    compound_operator_types,
 )
 
 
@@ -23,11 +18,25 @@ class Lexer:
     def __init__(self, text: str) -> None:
         self.text = text
         self.pos = 0
+        self.line = 1
+        self.line_start = 0
 
     def tokenize(self) -> List[Token]:
         tokens = []
+        while (token := self.scan_token()) is not None:
+            tokens.append(token)
+
+        eof = EOFToken(Fundamental.EOF, self.line, self.pos - self.line_start + 1)
+        eof.offset = eof.end = self.pos
+        tokens.append(eof)
+        return tokens
+
+    def scan_token(self) -> Token | None:
+        """Skip whitespace and comments and return the next token, or None at the end."""
         while self.pos < len(self.text):
             if self.text[self.pos].isspace():
+                if self.text[self.pos] == "\n":
+                    self.new_line(self.pos + 1)
                 self.pos += 1
                 continue
 
@@ -38,30 +47,31 @@ class Lexer:
                 self.skip_comment()
                 continue
 
-            if self.pos >= len(self.text):
-                break
-            
+            start_pos, line, column = self.pos, self.line, self.pos - self.line_start + 1
             token = self.get_next_token()
-            tokens.append(token)
-            
-        tokens.append(EOFToken(Fundamental.EOF))
-        return tokens
+            token.line, token.column = line, column
+            token.offset, token.end = start_pos, self.pos
+            return token
+        return None
+
+    def new_line(self, line_start: int) -> None:
+        """Record that a new source line begins at offset `line_start`."""
+        self.line += 1
+        self.line_start = line_start
         
     def get_next_token(self) -> Token | EOFToken:
         current_char = self.text[self.pos]
-        
-        if (
-            self.pos + 1 < len(self.text)
-            and (current_chars := self.text[self.pos : self.pos + 2]) in compound_operators.values()
-        ):
+        current_chars = self.text[self.pos : self.pos + 2]
+
+        if (compound_operator := compound_operator_types.get(current_chars)) is not None:
             self.pos += 2
-            return Token(CompoundOperator(current_chars), current_chars)
-        elif current_char in operators.values():
+            return Token(compound_operator, current_chars)
+        elif (operator := operator_types.get(current_char)) is not None:
             self.pos += 1
-            return Token(Operator(current_char), current_char)
-        elif current_char in symbols.values():
+            return Token(operator, current_char)
+        elif (symbol := symbol_types.get(current_char)) is not None:
             self.pos += 1
-            return Token(Symbol(current_char), current_char)
+            return Token(symbol, current_char)
         elif current_char == "'":
             return self.tokenize_string()
         elif current_char.isdigit():
@@ -75,9 +85,9 @@ class Lexer:
         while self.pos < len(self.text) and self.text[self.pos] != "\n":
             self.pos += 1
         # Move past the newline character as well
-        self.pos += (
-            1 if self.pos < len(self.text) and self.text[self.pos] == "\n" else 0
-        )
+        if self.pos < len(self.text) and self.text[self.pos] == "\n":
+            self.pos += 1
+            self.new_line(self.pos)
 
     def tokenize_number(self) -> Token:
         """Tokenize a sequence of digits (an integer number)."""
@@ -104,6 +114,9 @@ class Lexer:
             raise TokenizationError("Unterminated string literal", start_pos)
 
         string_value = self.text[start_pos : self.pos]
+        if "\n" in string_value:
+            self.line += string_value.count("\n")
+            self.line_start = start_pos + string_value.rindex("\n") + 1
         self.pos += 1  # Skip the closing quote
         return Token(Fundamental.STRING, string_value)
     
@@ -119,10 +132,10 @@ class Lexer:
         return Token(token_type, ident_str)
     
     def determine_token_type(self, ident_str: str) -> SyntaxTokenType:
-        if ident_str in keywords.values():
-            return Keyword[ident_str.upper()]
-        
-        if ident_str in comparisons.values():
-            return Comparison[ident_str.upper()]
+        if (keyword := keyword_types.get(ident_str)) is not None:
+            return keyword
+
+        if (comparison := comparison_types.get(ident_str)) is not None:
+            return comparison
 
         return Fundamental.IDENTIFIER
@@ -0,0 +1,148 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from flicklang.exceptions import ResourceLimitExceeded
+from flicklang.models import CompoundOperator, Operator
+from flicklang.values import ArrayView
+
+# Values that arrays are created from by + and *.
+ARRAY_TYPES = (list, ArrayView)
+
+# Steps between wall-clock checks; reading the clock on every step is too slow.
+CHECK_INTERVAL = 1024
+
+
+@dataclass
+class ExecutionLimits:
+    """Per-run quotas; None disables a limit."""
+    # Loop iterations plus function calls.
+    max_steps: Optional[int] = None
+    max_time: Optional[float] = None
+    max_array_length: Optional[int] = None
+    # Elements of all arrays created by array literals and array + or *.
+    max_allocated_elements: Optional[int] = None
+    max_call_depth: Optional[int] = None
+
+
+@dataclass
+class BudgetShare:
+    """What a run has used of its limits, for continuing it in another process."""
+    limits: ExecutionLimits
+    steps: int
+    allocated_elements: int
+    # Seconds left until the deadline, None without a time limit.
+    time_left: Optional[float]
+
+
+def array_result_length(op: Operator | CompoundOperator, left: Any, right: Any) -> int:
+    """Length of the array `left op right` creates, 0 if it creates none."""
+    if op in (Operator.PLUS, CompoundOperator.PLUS_ASSIGN):
+        if type(left) in ARRAY_TYPES and type(right) in ARRAY_TYPES:
+            return len(left) + len(right)
+    elif op in (Operator.MULTIPLY, CompoundOperator.MULTIPLY_ASSIGN):
+        if type(left) in ARRAY_TYPES and type(right) is int:
+            return len(left) * max(right, 0)
+        if type(right) in ARRAY_TYPES and type(left) is int:
+            return len(right) * max(left, 0)
+    return 0
+
+
+class ExecutionBudget:
+    """
+    Resource use of one run checked against its `ExecutionLimits`.
+
+    Steps are charged with a countdown: `tick` only decrements a counter, and
+    the step quota and the deadline are checked when it reaches zero, at most
+    every `CHECK_INTERVAL` steps.
+    """
+
+    def __init__(
+        self, limits: ExecutionLimits, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.limits = limits
+        self.clock = clock
+        self.deadline = clock() + limits.max_time if limits.max_time is not None else None
+        self.allocated_elements = 0
+        # Steps charged so far, including the whole current countdown.
+        self.charged_steps = 0
+        self.countdown = 0
+        self.refill()
+
+    @property
+    def steps(self) -> int:
+        return self.charged_steps - self.countdown
+
+    def tick(self) -> None:
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.refill()
+
+    def refill(self) -> None:
+        limits = self.limits
+        if limits.max_steps is not None and self.charged_steps > limits.max_steps:
+            raise ResourceLimitExceeded(
+                f"Step limit of {limits.max_steps} exceeded.", "max_steps"
+            )
+        if self.deadline is not None and self.clock() > self.deadline:
+            raise ResourceLimitExceeded(
+                f"Time limit of {limits.max_time} seconds exceeded.", "max_time"
+            )
+
+        chunk = CHECK_INTERVAL
+        if limits.max_steps is not None:
+            # End the countdown on the first step past the quota.
+            chunk = min(chunk, limits.max_steps - self.charged_steps + 1)
+        self.countdown = chunk
+        self.charged_steps += chunk
+
+    def share(self) -> BudgetShare:
+        """The state another process needs to charge work against this run's limits."""
+        time_left = self.deadline - self.clock() if self.deadline is not None else None
+        return BudgetShare(self.limits, self.steps, self.allocated_elements, time_left)
+
+    @classmethod
+    def resume(cls, share: BudgetShare) -> "ExecutionBudget":
+        """A budget that continues the run `share` was taken from."""
+        budget = cls(share.limits)
+        if share.time_left is not None:
+            budget.deadline = budget.clock() + share.time_left
+        budget.allocated_elements = share.allocated_elements
+        budget.charged_steps, budget.countdown = share.steps, 0
+        budget.refill()
+        return budget
+
+    def charge(self, steps: int, allocated_elements: int) -> None:
+        """Add the steps and allocations of work done elsewhere, e.g. by `pmap` workers."""
+        self.allocated_elements += allocated_elements
+        # Checks the allocation total without allocating anything more.
+        self.allocate(0)
+        self.charged_steps, self.countdown = self.steps + steps, 0
+        self.refill()
+
+    def enter_call(self, depth: int) -> None:
+        """Charge a call made at call depth `depth`."""
+        max_call_depth = self.limits.max_call_depth
+        if max_call_depth is not None and depth >= max_call_depth:
+            raise ResourceLimitExceeded(
+                f"Call depth limit of {max_call_depth} exceeded.", "max_call_depth"
+            )
+        self.tick()
+
+    def allocate(self, elements: int) -> None:
+        """Charge an array of `elements` elements before it is created."""
+        limits = self.limits
+        if limits.max_array_length is not None and elements > limits.max_array_length:
+            raise ResourceLimitExceeded(
+                f"Array length {elements} exceeds the limit of {limits.max_array_length}.",
+                "max_array_length",
+            )
+        self.allocated_elements += elements
+        if (
+            limits.max_allocated_elements is not None
+            and self.allocated_elements > limits.max_allocated_elements
+        ):
+            raise ResourceLimitExceeded(
+                f"Allocation limit of {limits.max_allocated_elements} elements exceeded.",
+                "max_allocated_elements",
+            )
@@ -0,0 +1,252 @@
+import sys
+import threading
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from flicklang.ast import (
+    ArrayLiteral,
+    BinaryOp,
+    CompoundAssignment,
+    FunctionCall,
+    FunctionDecleration,
+    MapLiteral,
+    Node,
+    Program,
+)
+from flicklang.builtins import BuiltinFunction
+from flicklang.interpreter import Interpreter
+from flicklang.limits import ExecutionLimits
+from flicklang.values import Rope
+
+# Python type of a new value -> the kind of allocation it is reported as.
+ALLOCATION_KINDS = {list: "array", dict: "map", str: "string", Rope: "string"}
+
+MAIN = "<main>"
+
+
+def kib(size: int) -> str:
+    return f"{size / 1024:.1f}"
+
+
+@dataclass
+class AllocationSite:
+    line: int
+    column: int
+    kind: str
+    count: int = 0
+    # Shallow sizes in bytes: an array counts its slots, not the elements they hold.
+    total: int = 0
+    largest: int = 0
+
+
+@dataclass
+class FunctionMemory:
+    name: str
+    allocations: int = 0
+    total: int = 0
+    # Most memory traced while the function, including its callees, was running.
+    peak: int = 0
+
+
+@dataclass
+class MemoryProfile:
+    """Allocations recorded by a `MemoryProfilingInterpreter`, sizes in bytes."""
+    sites: Dict[Tuple[int, int, str], AllocationSite] = field(default_factory=dict)
+    functions: Dict[str, FunctionMemory] = field(default_factory=dict)
+    peak: int = 0
+    # Memory still traced when the run ended.
+    final: int = 0
+
+    def record(self, node: Node, function: str, value: Any) -> None:
+        kind = ALLOCATION_KINDS.get(type(value))
+        if kind is None:
+            return
+        # Ropes share their parts with the rope they extend, so only the rope
+        # object itself is new.
+        size = sys.getsizeof(value)
+        key = (node.line, node.column, kind)
+        site = self.sites.get(key)
+        if site is None:
+            site = self.sites[key] = AllocationSite(node.line, node.column, kind)
+        site.count += 1
+        site.total += size
+        site.largest = max(site.largest, size)
+
+        stats = self.function(function)
+        stats.allocations += 1
+        stats.total += size
+
+    def function(self, name: str) -> FunctionMemory:
+        stats = self.functions.get(name)
+        if stats is None:
+            stats = self.functions[name] = FunctionMemory(name)
+        return stats
+
+    def top_sites(self, top: int) -> List[AllocationSite]:
+        # Copied first: the summary thread sorts while the interpreter adds sites.
+        sites = list(self.sites.values())
+        return sorted(sites, key=lambda site: site.total, reverse=True)[:top]
+
+    def summary(self, current: int) -> str:
+        """One line on the memory in use now and the largest allocation site so far."""
+        line = f"[memory] {kib(current)} KiB traced, peak {kib(self.peak)} KiB"
+        for site in self.top_sites(1):
+            line += (
+                f"; top site line {site.line}:{site.column} "
+                f"{site.kind} {kib(site.total)} KiB in {site.count} allocations"
+            )
+        return line
+
+    def report(self, source_code: Optional[str] = None, top: int = 10) -> str:
+        source_lines = source_code.splitlines() if source_code is not None else []
+        output = [
+            f"Peak traced memory: {kib(self.peak)} KiB, at exit: {kib(self.final)} KiB",
+            "",
+            f"{'Line:Col':<10} {'Kind':<7} {'Count':>8} {'Total (KiB)':>12} "
+            f"{'Largest (KiB)':>14}  Source",
+        ]
+        for site in self.top_sites(top):
+            text = (
+                source_lines[site.line - 1].strip()
+                if 0 < site.line <= len(source_lines)
+                else ""
+            )
+            output.append(
+                f"{f'{site.line}:{site.column}':<10} {site.kind:<7} {site.count:>8} "
+                f"{kib(site.total):>12} {kib(site.largest):>14}  {text}"
+            )
+
+        output.append("")
+        output.append(
+            f"{'Function':<24} {'Allocations':>12} {'Total (KiB)':>12} {'Peak (KiB)':>12}"
+        )
+        for stats in sorted(self.functions.values(), key=lambda s: s.total, reverse=True)[:top]:
+            output.append(
+                f"{stats.name:<24} {stats.allocations:>12} {kib(stats.total):>12} "
+                f"{kib(stats.peak):>12}"
+            )
+        return "\n".join(output)
+
+
+class MemoryProfilingInterpreter(Interpreter):
+    """
+    Interpreter that attributes array, map and string allocations to source.
+
+    Every value created by a literal, an operator or a builtin call is recorded
+    by the location of the expression and the FlickLang function running it.
+    Memory in use is measured with `tracemalloc`, which traces all Python
+    allocations while a program runs, so expect the run to be several times
+    slower. The peak of each function covers the time it was on the call
+    stack, callees included.
+
+    With `summary_interval`, a background thread writes a one-line heap
+    summary to `output` every `summary_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[ExecutionLimits] = None,
+        summary_interval: Optional[float] = None,
+        output: Optional[TextIO] = None,
+    ) -> None:
+        super().__init__(limits)
+        if summary_interval is not None and summary_interval <= 0:
+            raise ValueError("Summary interval must be positive.")
+        self.summary_interval = summary_interval
+        self.output = output
+        self.memory = MemoryProfile()
+        self._functions: List[str] = [MAIN]
+        # Peak traced memory of each active frame, up to the last `reset_peak`.
+        self._peaks: List[int] = [0]
+
+    def interpret(self, node: Node) -> Any:
+        if not isinstance(node, Program):
+            return super().interpret(node)
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        stop = threading.Event()
+        summaries = None
+        if self.summary_interval is not None:
+            summaries = threading.Thread(
+                target=self.write_summaries,
+                args=(stop, self.summary_interval),
+                name="flicklang-memory",
+                daemon=True,
+            )
+            summaries.start()
+        try:
+            return super().interpret(node)
+        finally:
+            stop.set()
+            if summaries is not None:
+                summaries.join()
+            current, peak = tracemalloc.get_traced_memory()
+            self._peaks[0] = max(self._peaks[0], peak)
+            self.memory.peak = max(self.memory.peak, self._peaks[0])
+            self.memory.final = current
+            main = self.memory.function(MAIN)
+            main.peak = max(main.peak, self._peaks[0])
+            if started:
+                tracemalloc.stop()
+
+    def write_summaries(self, stop: threading.Event, interval: float) -> None:
+        while not stop.wait(interval):
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory.peak = max(self.memory.peak, peak, max(self._peaks, default=0))
+            print(self.memory.summary(current), file=self.output or sys.stderr, flush=True)
+
+    def visit_ArrayLiteral(self, node: ArrayLiteral) -> list:
+        value = super().visit_ArrayLiteral(node)
+        self.memory.record(node, self._functions[-1], value)
+        return value
+
+    def visit_MapLiteral(self, node: MapLiteral) -> dict:
+        value = super().visit_MapLiteral(node)
+        self.memory.record(node, self._functions[-1], value)
+        return value
+
+    def binary_operation(self, node: BinaryOp, left: Any, right: Any) -> Any:
+        value = super().binary_operation(node, left, right)
+        if value is not left and value is not right:
+            self.memory.record(node, self._functions[-1], value)
+        return value
+
+    def compound_operation(
+        self, node: CompoundAssignment, current_value: Any, new_value: Any
+    ) -> Any:
+        value = super().compound_operation(node, current_value, new_value)
+        if value is not current_value and value is not new_value:
+            self.memory.record(node, self._functions[-1], value)
+        return value
+
+    def visit_FunctionCall(self, node: FunctionCall) -> Any:
+        function = self.resolve_call(node)
+        if not isinstance(function, BuiltinFunction):
+            return super().visit_FunctionCall(node)
+        arguments = [self.visit(argument) for argument in node.parameters]
+        value = function(self, arguments)
+        if not any(value is argument for argument in arguments):
+            self.memory.record(node, self._functions[-1], value)
+        return value
+
+    def call_function(self, function: FunctionDecleration, arguments: List[Any]) -> Any:
+        name = function.name.value
+        peaks = self._peaks
+        # Fold the caller's peak so far in before measuring the callee on its own.
+        peaks[-1] = max(peaks[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        peaks.append(0)
+        self._functions.append(name)
+        try:
+            return super().call_function(function, arguments)
+        finally:
+            self._functions.pop()
+            peak = max(peaks.pop(), tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            peaks[-1] = max(peaks[-1], peak)
+            stats = self.memory.function(name)
+            stats.peak = max(stats.peak, peak)
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Union
+from dataclasses import dataclass, field
+from typing import Dict, Union
 from enum import Enum
 
 
@@ -11,6 +11,8 @@ class Keyword(Enum):
     P = "p"     # print
     FU = "fu"
     RET = "ret"
+    F = "f"     # for loop
+    IN = "in"   # for loop over elements
 
 
 class Operator(Enum):
@@ -37,6 +39,7 @@ class Symbol(Enum):
     LBRACKET = "["
     RBRACKET = "]"
     COMMA = ","
+    COLON = ":"
 
 
 class Comparison(Enum):
@@ -58,16 +61,50 @@ class Fundamental(Enum):
 SyntaxTokenType = Union[Keyword, Fundamental, Operator, Symbol, Comparison, CompoundOperator]
 operators = {item: item.value for item in Operator}
 symbols = {item: item.value for item in Symbol}
-keywords = {item: item.value for item in Keyword}
+# Keywords only in a for-loop header, `f i 0 n {` or `f x in a {`; elsewhere
+# they are ordinary identifiers, so existing names like `f` keep working.
+contextual_keywords = {Keyword.F, Keyword.IN}
+keywords = {item: item.value for item in Keyword if item not in contextual_keywords}
 comparisons = {item: item.value for item in Comparison}
 compound_operators = {item: item.value for item in CompoundOperator}
 
+# Source text -> token type, so the lexer classifies text with one dict lookup.
+operator_types = {item.value: item for item in Operator}
+symbol_types = {item.value: item for item in Symbol}
+keyword_types = {value: item for item, value in keywords.items()}
+comparison_types = {item.value: item for item in Comparison}
+compound_operator_types = {item.value: item for item in CompoundOperator}
+
+# Binding power of the binary operators, higher binds tighter; all of them are
+# left-associative. Comparisons bind loosest and are only parsed in conditions.
+COMPARISON_PRECEDENCE = 1
+ADDITIVE_PRECEDENCE = 2
+MULTIPLICATIVE_PRECEDENCE = 3
+binary_precedence: Dict[SyntaxTokenType, int] = {
+    **{item: COMPARISON_PRECEDENCE for item in Comparison},
+    Operator.PLUS: ADDITIVE_PRECEDENCE,
+    Operator.MINUS: ADDITIVE_PRECEDENCE,
+    Operator.MULTIPLY: MULTIPLICATIVE_PRECEDENCE,
+    Operator.DIVIDE: MULTIPLICATIVE_PRECEDENCE,
+    Operator.MODULO: MULTIPLICATIVE_PRECEDENCE,
+}
+
 @dataclass
 class Token:
     type: SyntaxTokenType
     value: str
+    # Source position (1-based) of the first character of the token.
+    line: int = field(default=0, compare=False)
+    column: int = field(default=0, compare=False)
+    # Offsets of the token's source text, `end` being exclusive.
+    offset: int = field(default=0, compare=False, repr=False)
+    end: int = field(default=0, compare=False, repr=False)
 
 
 @dataclass
 class EOFToken:
     type: Fundamental
+    line: int = field(default=0, compare=False)
+    column: int = field(default=0, compare=False)
+    offset: int = field(default=0, compare=False, repr=False)
+    end: int = field(default=0, compare=False, repr=False)
@@ -0,0 +1,215 @@
+"""
+Process-parallel evaluation for the `pmap` builtin.
+
+The worker processes start with the first `pmap` of a run and serve every
+later one until the run ends, so a `pmap` inside a loop pays for starting
+processes once. Each call sends the mapped function and every global
+function, pickled once per call, along with the chunks of the array; workers
+return the mapped chunks, which are joined in order. Calls only see their
+parameters and the global functions, so a function cannot observe which
+process runs it.
+
+Arrays of plain ints or floats are copied into shared memory once, and each
+task only names its slice. Other arrays are pickled chunk by chunk.
+
+Workers continue the run's execution budget: each chunk may use what the run
+has left, and the steps and allocations of every chunk are charged to the run
+when its result arrives.
+"""
+import os
+import pickle
+from array import array as typed_array
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+from flicklang.ast import FunctionDecleration
+from flicklang.exceptions import ExecutionError, FlickLangError, ResourceLimitExceeded
+from flicklang.interpreter import Interpreter
+from flicklang.limits import BudgetShare, ExecutionBudget
+from flicklang.quickening import dumps_generic
+
+# Below this many elements the calls run in the calling process; a round trip
+# to the workers costs more than it saves.
+MIN_PARALLEL_LENGTH = 256
+# More chunks than workers, so a worker that gets cheap elements takes another chunk.
+CHUNKS_PER_WORKER = 4
+# Fewest calls per chunk, so each round trip to a worker is amortized.
+MIN_CHUNK_SIZE = 32
+
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+
+# State of a worker process. The functions of the last payload are kept, since
+# every chunk of a `pmap` call carries the same payload.
+worker_payload: Optional[bytes] = None
+worker_function: Optional[FunctionDecleration] = None
+worker_functions: Dict[str, FunctionDecleration] = {}
+in_worker = False
+
+# Mapped chunk, steps used and elements allocated.
+ChunkResult = Tuple[List[Any], int, int]
+
+
+def chunk_size(length: int, workers: int) -> int:
+    return max(MIN_CHUNK_SIZE, -(-length // (workers * CHUNKS_PER_WORKER)))
+
+
+def numeric_typecode(values: List[Any]) -> Optional[str]:
+    """The `array` typecode that holds every element of `values`, if there is one."""
+    if all(type(value) is int for value in values):
+        if values and INT64_MIN <= min(values) and max(values) <= INT64_MAX:
+            return "q"
+        return None
+    if all(type(value) is float for value in values):
+        return "d"
+    return None
+
+
+class WorkerPool:
+    """The worker processes of one interpreter run, closed by `Interpreter.end_run`."""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(workers, initializer=initialize_worker)
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+
+def initialize_worker() -> None:
+    global in_worker
+    in_worker = True
+
+
+def call_each(
+    interpreter: Interpreter, function: FunctionDecleration, offset: int, elements: List[Any]
+) -> List[Any]:
+    """Call `function` on each of `elements`, which start at `offset` in the mapped array."""
+    results = []
+    for index, element in enumerate(elements):
+        try:
+            results.append(interpreter.call_function(function, [element]))
+        except ResourceLimitExceeded:
+            raise
+        except Exception as e:
+            message = e.message if isinstance(e, FlickLangError) else str(e)
+            raise ExecutionError(
+                f"pmap({function.name.value}) failed on element {offset + index}: {message}"
+            )
+    return results
+
+
+def map_chunk(
+    payload: bytes, share: Optional[BudgetShare], offset: int, elements: List[Any]
+) -> ChunkResult:
+    global worker_payload, worker_function, worker_functions
+    if payload != worker_payload:
+        worker_function, worker_functions = pickle.loads(payload)
+        worker_payload = payload
+    assert worker_function is not None
+
+    interpreter = Interpreter(share.limits if share is not None else None)
+    interpreter.environment.update(worker_functions)
+    budget = interpreter.budget = ExecutionBudget.resume(share) if share is not None else None
+    try:
+        results = call_each(interpreter, worker_function, offset, elements)
+    finally:
+        interpreter.output_buffer.flush()
+    if budget is None or share is None:
+        return results, 0, 0
+    return results, budget.steps - share.steps, budget.allocated_elements - share.allocated_elements
+
+
+def map_shared_chunk(
+    payload: bytes, share: Optional[BudgetShare], name: str, typecode: str, start: int, end: int
+) -> ChunkResult:
+    memory = SharedMemory(name)
+    try:
+        with memory.buf.cast(typecode) as view:
+            elements = view[start:end].tolist()
+    finally:
+        memory.close()
+    return map_chunk(payload, share, start, elements)
+
+
+def worker_pool(interpreter: Interpreter, workers: int) -> WorkerPool:
+    """The pool of the running program, started on its first `pmap`."""
+    pool = interpreter.worker_pool
+    if pool is None or pool.workers != workers:
+        if pool is not None:
+            pool.close()
+        pool = interpreter.worker_pool = WorkerPool(workers)
+    return pool
+
+
+def parallel_map(
+    interpreter: Interpreter,
+    function: FunctionDecleration,
+    values: List[Any],
+    workers: Optional[int] = None,
+) -> List[Any]:
+    """`[function(value) for value in values]`, in order, spread over `workers` processes."""
+    workers = workers or os.cpu_count() or 1
+    if in_worker or workers == 1 or len(values) < MIN_PARALLEL_LENGTH:
+        return call_each(interpreter, function, 0, values)
+
+    functions = {
+        name: value
+        for name, value in interpreter.global_environment.items()
+        if isinstance(value, FunctionDecleration)
+    }
+    # Workers run a plain interpreter, so quickened nodes are sent as generic nodes.
+    payload = dumps_generic((function, functions))
+    budget = interpreter.budget
+    share = budget.share() if budget is not None else None
+    size = chunk_size(len(values), workers)
+    starts = range(0, len(values), size)
+    typecode = numeric_typecode(values)
+    pool = worker_pool(interpreter, workers).executor
+
+    if typecode is None:
+        futures = [
+            pool.submit(map_chunk, payload, share, start, values[start : start + size])
+            for start in starts
+        ]
+        return collect(budget, futures)
+
+    packed = typed_array(typecode, values)
+    memory = SharedMemory(create=True, size=max(1, len(packed) * packed.itemsize))
+    try:
+        memory.buf[: len(packed) * packed.itemsize] = memoryview(packed).cast("B")
+        futures = [
+            pool.submit(
+                map_shared_chunk,
+                payload,
+                share,
+                memory.name,
+                typecode,
+                start,
+                min(start + size, len(values)),
+            )
+            for start in starts
+        ]
+        return collect(budget, futures)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def collect(budget: Optional[ExecutionBudget], futures: List["Future[ChunkResult]"]) -> List[Any]:
+    """
+    Join the chunk results in order, charging their work to `budget`. The first
+    error cancels the chunks not yet started.
+    """
+    results: List[Any] = []
+    try:
+        for future in futures:
+            chunk, steps, allocated_elements = future.result()
+            results.extend(chunk)
+            if budget is not None:
+                budget.charge(steps, allocated_elements)
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+    return results
@@ -1,16 +1,21 @@
-from typing import List, cast
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, TypeVar, cast
 
 from flicklang.ast import (
     ArrayIndex,
     ArrayIndexAssignment,
+    ArraySlice,
     ArrayLiteral,
     Assignment,
     Block,
     FunctionCall,
     ComparisonOp,
     CompoundAssignment,
+    ForEach,
+    ForRange,
     FunctionDecleration,
     If,
+    MapLiteral,
     Node,
     Number,
     BinaryOp,
@@ -31,10 +36,26 @@ from flicklang.models import (
     Symbol,
     Fundamental,
     Operator,
+    ADDITIVE_PRECEDENCE,
+    COMPARISON_PRECEDENCE,
+    binary_precedence,
     comparisons,
     compound_operators,
 )
 
+NodeT = TypeVar("NodeT", bound=Node)
+
+
+@dataclass
+class ExpressionFrame:
+    """Operand and operator stacks of one parenthesization level of an expression."""
+    min_precedence: int
+    # Token before the opening parenthesis (or its unary minus signs).
+    start_token: Token | EOFToken = field(default_factory=lambda: EOFToken(Fundamental.EOF))
+    unary_minus_count: int = 0
+    operands: List[Tuple[Node, Token | EOFToken]] = field(default_factory=list)
+    operators: List[Token] = field(default_factory=list)
+
 
 class Parser:
     def __init__(self, tokens: List[Token]) -> None:
@@ -64,6 +85,11 @@ class Parser:
 
         self.advance()
 
+    def located(self, node: NodeT, token: Token | EOFToken) -> NodeT:
+        """Stamp `node` with the source position of `token`, its first token."""
+        node.line, node.column = token.line, token.column
+        return node
+
     def peek_token(self) -> Token | EOFToken:
         peek_pos = self.pos + 1
         if peek_pos < len(self.tokens):
@@ -96,7 +122,9 @@ class Parser:
                 "Unexpected EOF while parsing statements.", self.current_token
             )
 
-        if self.current_token.type == Fundamental.IDENTIFIER:
+        if self.at_for_loop():
+            return self.parse_for_loop_statement()
+        elif self.current_token.type == Fundamental.IDENTIFIER:
             return self.parse_identifier_starting_statement()
         elif self.current_token.type == Keyword.P:
             return self.parse_print_statement()
@@ -126,32 +154,34 @@ class Parser:
         raise ParsingError("Invalid syntax after identifier.", self.current_token)
 
     def parse_if_statement(self) -> If:
-        if isinstance(self.current_token, EOFToken):
-            raise ParsingError(
-                "Unexpected EOF while parsing if statement.", self.current_token
-            )
-
-        (
-            self.eat(Keyword.IF)
-            if self.current_token.type == Keyword.IF
-            else self.eat(Keyword.ELI)
-        )
-
-        condition = self.parse_comparison()
-        true_block = self.parse_block()
+        """Parse an if statement; `eli` branches are collected in a loop, not by recursion."""
+        branches: List[Tuple[Token | EOFToken, Node, Block]] = []
+        false_block: If | Block | None = None
+        while True:
+            if isinstance(self.current_token, EOFToken):
+                raise ParsingError(
+                    "Unexpected EOF while parsing if statement.", self.current_token
+                )
 
-        # If statement ending program
-        if isinstance(self.current_token, EOFToken):
-            return If(condition, true_block, None)
+            start_token = self.current_token
+            self.eat(Keyword.ELI if branches else Keyword.IF)
 
-        false_block = None
-        if self.current_token.type == Keyword.ELI:
-            false_block = self.parse_if_statement()
-        elif self.current_token.type == Keyword.EL:
-            self.eat(Keyword.EL)
-            false_block = self.parse_block()
+            condition = self.parse_comparison()
+            branches.append((start_token, condition, self.parse_block()))
 
-        return If(condition, true_block, false_block)
+            # If statement ending program
+            if isinstance(self.current_token, EOFToken):
+                break
+            if self.current_token.type == Keyword.ELI:
+                continue
+            if self.current_token.type == Keyword.EL:
+                self.eat(Keyword.EL)
+                false_block = self.parse_block()
+            break
+
+        for start_token, condition, true_block in reversed(branches):
+            false_block = self.located(If(condition, true_block, false_block), start_token)
+        return cast(If, false_block)
 
     def parse_while_loop_statement(self) -> WhileLoop:
         if isinstance(self.current_token, EOFToken):
@@ -159,13 +189,44 @@ class Parser:
                 "Unexpected EOF while parsing while loop statement.", self.current_token
             )
 
+        start_token = self.current_token
         self.eat(Keyword.W)
         condition = self.parse_comparison()
         body = self.parse_block()
 
-        return WhileLoop(condition, body)
+        return self.located(WhileLoop(condition, body), start_token)
+
+    def at_for_loop(self) -> bool:
+        """Whether the current token is the contextual keyword `f` starting a for loop."""
+        token = self.current_token
+        return (
+            token.type == Fundamental.IDENTIFIER
+            and cast(Token, token).value == Keyword.F.value
+            and self.peek_token().type == Fundamental.IDENTIFIER
+        )
+
+    def parse_for_loop_statement(self) -> ForRange | ForEach:
+        start_token = self.current_token
+        self.eat(Fundamental.IDENTIFIER)
+        variable_token = self.current_token
+        self.eat(Fundamental.IDENTIFIER)
+        variable = self.located(Variable(cast(Token, variable_token).value), variable_token)
+
+        token = self.current_token
+        if token.type == Fundamental.IDENTIFIER and cast(Token, token).value == Keyword.IN.value:
+            self.eat(Fundamental.IDENTIFIER)
+            iterable = self.expression()
+            return self.located(ForEach(variable, iterable, self.parse_block()), start_token)
+
+        # Bounds are separated by whitespace only, so `f i 10 0 -1` reads as `10` and
+        # `0 - 1`; a negative bound or step is written in parentheses: `f i 10 0 (-1)`.
+        start = self.expression()
+        end = self.expression()
+        step = None if self.current_token.type == Symbol.BLOCK_START else self.expression()
+        return self.located(ForRange(variable, start, end, step, self.parse_block()), start_token)
 
     def parse_print_statement(self) -> Print:
+        start_token = self.current_token
         self.eat(Keyword.P)
         expressions = [self.expression()]
 
@@ -176,10 +237,11 @@ class Parser:
             self.eat(Symbol.COMMA)
             expressions.append(self.expression())
 
-        return Print(expressions)
+        return self.located(Print(expressions), start_token)
 
     def parse_block(self) -> Block:
         statements = []
+        start_token = self.current_token
         self.eat(Symbol.BLOCK_START)
         while self.current_token.type != Symbol.BLOCK_END:
             if isinstance(self.current_token, EOFToken):
@@ -191,16 +253,17 @@ class Parser:
             else:
                 statements.append(self.parse_statement())
         self.eat(Symbol.BLOCK_END)
-        return Block(statements=statements)
+        return self.located(Block(statements=statements), start_token)
 
     def parse_return_statement(self) -> Return:
+        start_token = self.current_token
         self.eat(Keyword.RET)
         if isinstance(self.current_token, EOFToken):
             raise ParsingError(
                 "Unexpected EOF while parsing return statement.", self.current_token
             )
         expression = self.expression()
-        return Return(expression=expression)
+        return self.located(Return(expression=expression), start_token)
 
     def parse_assignment(self) -> Node:
         """
@@ -214,9 +277,12 @@ class Parser:
         identifier = self.current_token
         self.eat(Fundamental.IDENTIFIER)
         self.eat(Operator.ASSIGN)
-        return Assignment(
-            variable_name=Variable(identifier.value),
-            variable_value=self.expression(),
+        return self.located(
+            Assignment(
+                variable_name=self.located(Variable(identifier.value), identifier),
+                variable_value=self.expression(),
+            ),
+            identifier,
         )
 
     def parse_compound_assignment(self) -> Node:
@@ -237,10 +303,15 @@ class Parser:
         self.eat(operator_token.type)
         right_expression = self.expression()
 
-        return CompoundAssignment(
-            variable_name=Variable(variable_name_token.value),
-            op_token=operator_token,
-            variable_value=right_expression,
+        return self.located(
+            CompoundAssignment(
+                variable_name=self.located(
+                    Variable(variable_name_token.value), variable_name_token
+                ),
+                op_token=operator_token,
+                variable_value=right_expression,
+            ),
+            variable_name_token,
         )
 
     def parse_comparison(self) -> Node:
@@ -249,17 +320,11 @@ class Parser:
                 "Unexpected EOF while parsing comparison.", self.current_token
             )
 
-        node = self.expression()
-
-        while self.current_token.type in comparisons:
-            token = self.current_token
-            self.eat(token.type)
-            node = ComparisonOp(left=node, operator=token, right=self.expression())
-
-        return node
+        return self.parse_binary(COMPARISON_PRECEDENCE)
 
     def parse_array_literal(self) -> ArrayLiteral:
         elements = []
+        start_token = self.current_token
         self.eat(Symbol.LBRACKET)
 
         if isinstance(self.current_token, EOFToken):
@@ -274,9 +339,34 @@ class Parser:
                 elements.append(self.expression())
 
         self.eat(Symbol.RBRACKET)
-        return ArrayLiteral(elements)
+        return self.located(ArrayLiteral(elements), start_token)
+
+    def parse_map_literal(self) -> MapLiteral:
+        keys: List[Node] = []
+        values: List[Node] = []
+        start_token = self.current_token
+        self.eat(Symbol.BLOCK_START)
 
-    def parse_array_access_or_assignment(self) -> ArrayIndexAssignment | ArrayIndex:
+        if isinstance(self.current_token, EOFToken):
+            raise ParsingError(
+                "Unexpected EOF while parsing map literal.", self.current_token
+            )
+
+        if not self.current_token.type == Symbol.BLOCK_END:
+            while True:
+                keys.append(self.expression())
+                self.eat(Symbol.COLON)
+                values.append(self.expression())
+                if self.current_token.type != Symbol.COMMA:
+                    break
+                self.eat(Symbol.COMMA)
+
+        self.eat(Symbol.BLOCK_END)
+        return self.located(MapLiteral(keys, values), start_token)
+
+    def parse_array_access_or_assignment(
+        self,
+    ) -> ArrayIndexAssignment | ArrayIndex | ArraySlice:
         if isinstance(self.current_token, EOFToken):
             raise ParsingError(
                 "Unexpected EOF while parsing array access.", self.current_token
@@ -285,17 +375,32 @@ class Parser:
         variable_token = self.current_token
         self.eat(Fundamental.IDENTIFIER)
         self.eat(Symbol.LBRACKET)
+        array = self.located(Variable(variable_token.value), variable_token)
+        if self.current_token.type == Symbol.COLON:
+            return self.parse_slice(array, None, variable_token)
         index = self.expression()
+        if self.current_token.type == Symbol.COLON:
+            return self.parse_slice(array, index, variable_token)
         self.eat(Symbol.RBRACKET)
 
         if self.current_token.type == Operator.ASSIGN:
             self.eat(Operator.ASSIGN)
             value = self.expression()
-            return ArrayIndexAssignment(
-                array=Variable(variable_token.value), index=index, value=value
+            return self.located(
+                ArrayIndexAssignment(array=array, index=index, value=value),
+                variable_token,
             )
         else:
-            return ArrayIndex(array=Variable(variable_token.value), index=index)
+            return self.located(ArrayIndex(array=array, index=index), variable_token)
+
+    def parse_slice(
+        self, array: Variable, start: Optional[Node], start_token: Token | EOFToken
+    ) -> ArraySlice:
+        """Parse the rest of `array[start:end]` from the colon on."""
+        self.eat(Symbol.COLON)
+        end = None if self.current_token.type == Symbol.RBRACKET else self.expression()
+        self.eat(Symbol.RBRACKET)
+        return self.located(ArraySlice(array=array, start=start, end=end), start_token)
 
     def parse_function_declaration(self) -> FunctionDecleration:
         if isinstance(self.current_token, EOFToken):
@@ -303,6 +408,7 @@ class Parser:
                 "Unexpected EOF while parsing function declaration.", self.current_token
             )
 
+        start_token = self.current_token
         self.eat(Keyword.FU)
         func_name = self.current_token
         self.eat(Fundamental.IDENTIFIER)
@@ -311,10 +417,13 @@ class Parser:
         parameters = self.parse_parameter_list(context="function_declaration")
         self.eat(Symbol.RPAREN)
 
-        return FunctionDecleration(
-            name=func_name,
-            parameters=cast(List[Variable], parameters),
-            body=self.parse_block(),
+        return self.located(
+            FunctionDecleration(
+                name=func_name,
+                parameters=cast(List[Variable], parameters),
+                body=self.parse_block(),
+            ),
+            start_token,
         )
 
     def parse_function_call(self) -> FunctionCall:
@@ -330,8 +439,9 @@ class Parser:
         parameters = self.parse_parameter_list(context="function_call")
         self.eat(Symbol.RPAREN)
 
-        return FunctionCall(
-            function_name=function_name_token.value, parameters=parameters
+        return self.located(
+            FunctionCall(function_name=function_name_token.value, parameters=parameters),
+            function_name_token,
         )
 
     def parse_parameter_list(self, context: str) -> List[Node]:
@@ -348,7 +458,9 @@ class Parser:
                         f"Expected identifier in parameter list, got {self.current_token.type}",
                         self.current_token,
                     )
-                parameters.append(Variable(self.current_token.value))
+                parameters.append(
+                    self.located(Variable(self.current_token.value), self.current_token)
+                )
                 self.eat(Fundamental.IDENTIFIER)
 
             elif context == "function_call":
@@ -359,81 +471,86 @@ class Parser:
 
         return parameters
 
-    def expression(self) -> Node | BinaryOp:
-        """Parse an expression (term followed by zero or more addition/subtraction)."""
-        node = self.term()
+    def expression(self) -> Node:
+        """Parse an arithmetic expression; comparisons are left to the caller."""
+        return self.parse_binary(ADDITIVE_PRECEDENCE)
 
-        while self.current_token.type in (
-            Operator.PLUS,
-            Operator.MINUS,
-        ):
-            if isinstance(self.current_token, EOFToken):
-                raise ParsingError(
-                    "Unexpected EOF while parsing expression.", self.current_token
-                )
+    def parse_binary(self, min_precedence: int) -> Node:
+        """
+        Parse operands joined by binary operators binding at least as tightly as
+        `min_precedence`, using the precedence table from `flicklang.models`.
 
-            token = self.current_token
-            if token.type == Operator.PLUS:
-                self.eat(Operator.PLUS)
-            elif token.type == Operator.MINUS:
+        Operands and pending operators are kept on explicit stacks, with one frame
+        per open parenthesis, so neither long operator chains nor deep nesting of
+        parentheses consume Python stack frames.
+        """
+        frames = [ExpressionFrame(min_precedence)]
+        while True:
+            # Prefix of an operand: unary minus signs and opening parentheses.
+            start_token = self.current_token
+            unary_minus_count = 0
+            while self.current_token.type == Operator.MINUS:
                 self.eat(Operator.MINUS)
-
-            node = BinaryOp(left=node, op_token=token, right=self.term())
-        return node
-
-    def term(self) -> Node | BinaryOp:
-        """Parse a term (factor followed by zero or more multiplication/division)."""
-        node: Node = self.factor()
-
-        while self.current_token.type in (
-            Operator.MULTIPLY,
-            Operator.DIVIDE,
-            Operator.MODULO,
-        ):
-            if isinstance(self.current_token, EOFToken):
-                raise ParsingError(
-                    "Unexpected EOF while parsing term.", self.current_token
+                unary_minus_count += 1
+            if self.current_token.type == Symbol.LPAREN:
+                self.eat(Symbol.LPAREN)
+                frames.append(
+                    ExpressionFrame(ADDITIVE_PRECEDENCE, start_token, unary_minus_count)
                 )
+                continue
+
+            operand = self.negate(self.parse_simple_factor(), unary_minus_count, start_token)
+
+            # Infix part: shift the next operator or close finished frames.
+            while True:
+                frame = frames[-1]
+                frame.operands.append((operand, start_token))
+                token = self.current_token
+                precedence = binary_precedence.get(token.type)
+                if precedence is not None and precedence >= frame.min_precedence:
+                    self.reduce(frame, precedence)
+                    self.eat(token.type)
+                    frame.operators.append(token)
+                    break
+
+                self.reduce(frame, frame.min_precedence)
+                operand = frame.operands[0][0]
+                if len(frames) == 1:
+                    return operand
+                frames.pop()
+                self.eat(Symbol.RPAREN)
+                start_token = frame.start_token
+                operand = self.negate(operand, frame.unary_minus_count, start_token)
+
+    def reduce(self, frame: "ExpressionFrame", precedence: int) -> None:
+        """Combine pending operators of `frame` binding at least as tightly as `precedence`."""
+        operands, operators = frame.operands, frame.operators
+        while operators and binary_precedence[operators[-1].type] >= precedence:
+            token = operators.pop()
+            right, _ = operands.pop()
+            left, start_token = operands.pop()
+            if token.type in comparisons:
+                node: Node = ComparisonOp(left=left, operator=token, right=right)
+            else:
+                node = BinaryOp(left=left, op_token=token, right=right)
+            operands.append((self.located(node, start_token), start_token))
 
-            token = self.current_token
-            if token.type == Operator.MULTIPLY:
-                self.eat(Operator.MULTIPLY)
-            elif token.type == Operator.DIVIDE:
-                self.eat(Operator.DIVIDE)
-            elif token.type == Operator.MODULO:
-                self.eat(Operator.MODULO)
-
-            node = BinaryOp(left=node, op_token=token, right=self.factor())
-        return node
-
-    def factor(self) -> Node:
-        """Parse a factor (number or parenthesized expression), reducing consecutive unary minus."""
-        # Count consecutive unary minus operators
-        unary_minus_count = 0
-        while self.current_token.type == Operator.MINUS:
-            self.eat(Operator.MINUS)
-            unary_minus_count += 1
-
-        node = self.parse_simple_factor()
-
-        # Apply unary minus if there were an odd number of them
+    def negate(self, node: Node, unary_minus_count: int, start_token: Token | EOFToken) -> Node:
+        """Apply a run of unary minus signs; an even number of them cancels out."""
         if unary_minus_count % 2 == 1:
-            return UnaryOp(op_token=Token(Operator.MINUS, "-"), operand=node)
-
+            return self.located(
+                UnaryOp(op_token=Token(Operator.MINUS, "-"), operand=node), start_token
+            )
         return node
 
     def parse_simple_factor(self) -> Node:
-        """Parse a simple factor without unary minus handling."""
+        """Parse an operand other than a parenthesized expression, without unary minus."""
         self.current_token = cast(Token, self.current_token)
+        token = self.current_token
         if self.current_token.type == Fundamental.NUMBER:
             value = self.current_token.value
             self.eat(Fundamental.NUMBER)
-            return Number(value)
-        elif self.current_token.type == Symbol.LPAREN:
-            self.eat(Symbol.LPAREN)
-            node = self.expression()
-            self.eat(Symbol.RPAREN)
-            return node
+            return self.located(Number(value), token)
         elif self.current_token.type == Fundamental.IDENTIFIER:
             if self.peek_token().type == Symbol.LBRACKET:
                 return self.parse_array_access_or_assignment()
@@ -442,13 +559,15 @@ class Parser:
             else:
                 value = self.current_token.value
                 self.eat(Fundamental.IDENTIFIER)
-                return Variable(value)
+                return self.located(Variable(value), token)
         elif self.current_token.type == Fundamental.STRING:
             value = self.current_token.value
             self.eat(Fundamental.STRING)
-            return String(value)
+            return self.located(String(value), token)
         elif self.current_token.type == Symbol.LBRACKET:
             return self.parse_array_literal()
+        elif self.current_token.type == Symbol.BLOCK_START:
+            return self.parse_map_literal()
         else:
             raise ParsingError(
                 f"Unexpected token type in factor: {self.current_token.type}",
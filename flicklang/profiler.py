@@ -0,0 +1,166 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from flicklang.ast import Block, FunctionDecleration, Node, Program
+from flicklang.exceptions import ExecutionError, ReturnSignal
+from flicklang.interpreter import Interpreter
+from flicklang.limits import ExecutionLimits
+
+
+@dataclass
+class FunctionStats:
+    name: str
+    line: int
+    calls: int = 0
+    inclusive_time: float = 0.0
+    exclusive_time: float = 0.0
+
+
+@dataclass
+class LineStats:
+    line: int
+    hits: int = 0
+    time: float = 0.0
+
+
+@dataclass
+class Profile:
+    """Timings collected by a `ProfilingInterpreter`, all times in seconds."""
+    functions: Dict[int, FunctionStats] = field(default_factory=dict)
+    lines: Dict[int, LineStats] = field(default_factory=dict)
+    total_time: float = 0.0
+
+    def report(self, source_code: Optional[str] = None) -> str:
+        source_lines = source_code.splitlines() if source_code is not None else []
+        output = [f"Total time: {self.total_time:.6f} s", ""]
+
+        output.append(
+            f"{'Function':<24} {'Line':>6} {'Calls':>8} {'Inclusive (s)':>14} {'Exclusive (s)':>14}"
+        )
+        for stats in sorted(
+            self.functions.values(), key=lambda s: s.inclusive_time, reverse=True
+        ):
+            output.append(
+                f"{stats.name:<24} {stats.line:>6} {stats.calls:>8} "
+                f"{stats.inclusive_time:>14.6f} {stats.exclusive_time:>14.6f}"
+            )
+
+        output.append("")
+        output.append(f"{'Line':>6} {'Hits':>10} {'Time (s)':>12} {'% Time':>7}  Source")
+        for stats in sorted(self.lines.values(), key=lambda s: s.line):
+            share = 100 * stats.time / self.total_time if self.total_time else 0.0
+            text = (
+                source_lines[stats.line - 1].strip()
+                if 0 < stats.line <= len(source_lines)
+                else ""
+            )
+            output.append(
+                f"{stats.line:>6} {stats.hits:>10} {stats.time:>12.6f} {share:>7.1f}  {text}"
+            )
+        return "\n".join(output)
+
+
+class ProfilingInterpreter(Interpreter):
+    """
+    Interpreter that records per-function and per-line timings.
+
+    Line time is the time spent executing the statements starting on that line,
+    excluding nested statements (loop and if bodies) but including the functions
+    they call, the same way a line profiler attributes time. A line that runs
+    again while it is already running, in a recursive call or a nested statement
+    on the same line, is only timed by its outermost run, so no line exceeds the
+    total time. Profiling lives in a subclass so the plain `Interpreter` carries
+    no instrumentation at all.
+    """
+
+    def __init__(
+        self,
+        timer: Callable[[], float] = time.perf_counter,
+        limits: Optional[ExecutionLimits] = None,
+    ) -> None:
+        super().__init__(limits)
+        self.timer = timer
+        self.profile = Profile()
+        # Time spent in nested statements of the running statement, one slot per
+        # active function frame so callee statements do not discount the caller.
+        self._nested_time: List[float] = [0.0]
+        # Time spent in callees of the running function, one slot per frame.
+        self._callee_time: List[float] = [0.0]
+        self._active_calls: Dict[int, int] = {}
+        # Line -> statements starting on it that are running.
+        self._active_lines: Dict[int, int] = {}
+
+    def interpret(self, node: Node) -> Any:
+        start = self.timer()
+        try:
+            if isinstance(node, Program):
+                self.start_budget()
+                try:
+                    for statement in node.statements:
+                        self.execute_statement(statement)
+                except ReturnSignal:
+                    raise ExecutionError("Return statement outside of a function.")
+                finally:
+                    self.end_run()
+            else:
+                self.visit(node)
+        finally:
+            self.profile.total_time += self.timer() - start
+
+    def visit_Block(self, node: Block) -> None:
+        for statement in node.statements:
+            self.execute_statement(statement)
+
+    def execute_statement(self, node: Node) -> Any:
+        line = node.line
+        active_lines = self._active_lines
+        depth = active_lines.get(line, 0)
+        active_lines[line] = depth + 1
+        nested_time = self._nested_time
+        outer_nested = nested_time[-1]
+        nested_time[-1] = 0.0
+        start = self.timer()
+        try:
+            return self.visit(node)
+        finally:
+            elapsed = self.timer() - start
+            active_lines[line] = depth
+            stats = self.profile.lines.get(line)
+            if stats is None:
+                stats = self.profile.lines[line] = LineStats(line)
+            stats.hits += 1
+            if depth == 0:
+                stats.time += elapsed - nested_time[-1]
+                nested_time[-1] = outer_nested + elapsed
+            else:
+                # The outer run of this line already times this one.
+                nested_time[-1] = outer_nested
+
+    def call_function(self, function: FunctionDecleration, arguments: List[Any]) -> Any:
+        key = id(function)
+        stats = self.profile.functions.get(key)
+        if stats is None:
+            stats = self.profile.functions[key] = FunctionStats(
+                function.name.value, function.line
+            )
+        # Recursive calls only count towards the inclusive time once.
+        depth = self._active_calls.get(key, 0)
+        self._active_calls[key] = depth + 1
+
+        self._nested_time.append(0.0)
+        self._callee_time.append(0.0)
+        start = self.timer()
+        try:
+            return super().call_function(function, arguments)
+        finally:
+            elapsed = self.timer() - start
+            self._nested_time.pop()
+            callee_time = self._callee_time.pop()
+            self._callee_time[-1] += elapsed
+            self._active_calls[key] = depth
+
+            stats.calls += 1
+            stats.exclusive_time += elapsed - callee_time
+            if depth == 0:
+                stats.inclusive_time += elapsed
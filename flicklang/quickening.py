@@ -0,0 +1,200 @@
+import copyreg
+import io
+import pickle
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional, Set, Tuple, Type, cast
+
+from flicklang.ast import (
+    ArrayIndex,
+    BinaryOp,
+    ComparisonOp,
+    Node,
+    QuickenedArrayIndex,
+    QuickenedBinaryOp,
+    QuickenedComparisonOp,
+    QuickenedVariable,
+    Variable,
+)
+from flicklang.exceptions import ExecutionError
+from flicklang.interpreter import BINARY_OPERATIONS, COMPARISON_OPERATIONS, Interpreter
+from flicklang.limits import ExecutionLimits
+from flicklang.models import Comparison, Operator
+
+NUMERIC_TYPES = (int, float)
+
+# Quickened class -> the generic class it specializes.
+GENERIC_CLASSES: Dict[type, Type[Node]] = {
+    QuickenedBinaryOp: BinaryOp,
+    QuickenedComparisonOp: ComparisonOp,
+    QuickenedArrayIndex: ArrayIndex,
+    QuickenedVariable: Variable,
+}
+
+# Generic class -> names of its fields, the only attributes a pickled copy keeps.
+GENERIC_FIELDS: Dict[type, Tuple[str, ...]] = {
+    generic: tuple(node_field.name for node_field in fields(generic))
+    for generic in GENERIC_CLASSES.values()
+}
+
+
+class GenericPickler(pickle.Pickler):
+    """
+    Pickler that writes quickened nodes as the generic nodes they specialize.
+
+    Quickened nodes guard on runtime feedback only a `QuickeningInterpreter`
+    understands, so anything another interpreter loads, such as a snapshot or
+    the functions sent to `pmap` workers, is pickled this way. The live nodes
+    keep their quickened classes.
+    """
+
+    def reducer_override(self, obj: Any) -> Any:
+        generic = GENERIC_CLASSES.get(type(obj))
+        if generic is None:
+            return NotImplemented
+        names = GENERIC_FIELDS[generic]
+        state = {name: value for name, value in vars(obj).items() if name in names}
+        return copyreg._reconstructor, (generic, object, None), state
+
+
+def dumps_generic(value: Any) -> bytes:
+    """`pickle.dumps(value)` with every quickened node written as its generic node."""
+    buffer = io.BytesIO()
+    GenericPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(value)
+    return buffer.getvalue()
+
+
+def binary_is_quickenable(left_type: type, right_type: type) -> bool:
+    """Whether operators behave the same without the generic checks for these types."""
+    # Concatenation stays generic, so long strings can become ropes and array
+    # allocations are charged against execution limits.
+    return left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES
+
+
+def comparison_is_quickenable(left_type: type, right_type: type) -> bool:
+    return (left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES) or (
+        left_type is right_type is str
+    )
+
+
+@dataclass
+class QuickeningStats:
+    """Specialization and deoptimization events per generic node kind."""
+    specializations: Dict[str, int] = field(default_factory=dict)
+    deoptimizations: Dict[str, int] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        def describe(events: Dict[str, int]) -> str:
+            return ", ".join(f"{kind} {count}" for kind, count in sorted(events.items())) or "none"
+
+        return (
+            f"Quickened: {describe(self.specializations)}; "
+            f"deoptimized: {describe(self.deoptimizations)}"
+        )
+
+
+class QuickeningInterpreter(Interpreter):
+    """
+    Interpreter that specializes nodes in place from runtime type feedback.
+
+    The first time a `BinaryOp`, `ComparisonOp`, `ArrayIndex` or `Variable`
+    evaluates successfully, its class is switched to a quickened variant guarded
+    on the operand types it saw, so later visits skip the generic operator
+    dispatch and checks. When a guard fails the node is switched back to the
+    generic class and the value is computed the generic way; a node that was
+    deoptimized once stays generic so it does not flip back and forth.
+    """
+
+    def __init__(self, limits: Optional[ExecutionLimits] = None) -> None:
+        super().__init__(limits)
+        self.stats = QuickeningStats()
+        # Ids of deoptimized nodes. A recycled id can at worst keep a new node generic.
+        self.generic_nodes: Set[int] = set()
+
+    def quicken(self, node: Node, quickened: Type[Node]) -> bool:
+        # Operands can quicken the node themselves, e.g. in a recursive call.
+        if type(node) is quickened or id(node) in self.generic_nodes:
+            return False
+        kind = type(node).__name__
+        node.__class__ = quickened
+        self.stats.specializations[kind] = self.stats.specializations.get(kind, 0) + 1
+        return True
+
+    def deoptimize(self, node: Node, generic: Type[Node]) -> None:
+        node.__class__ = generic
+        self.generic_nodes.add(id(node))
+        kind = generic.__name__
+        self.stats.deoptimizations[kind] = self.stats.deoptimizations.get(kind, 0) + 1
+
+    def visit_Variable(self, node: Variable) -> Any:
+        value = super().visit_Variable(node)
+        self.quicken(node, QuickenedVariable)
+        return value
+
+    def visit_QuickenedVariable(self, node: QuickenedVariable) -> Any:
+        try:
+            return self.environment[node.name]
+        except KeyError:
+            self.deoptimize(node, Variable)
+            return super().visit_Variable(node)
+
+    def visit_BinaryOp(self, node: BinaryOp) -> Any:
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        result = self.binary_operation(node, left, right)
+
+        op = cast(Operator, node.op_token.type)
+        if binary_is_quickenable(type(left), type(right)) and self.quicken(
+            node, QuickenedBinaryOp
+        ):
+            quickened = cast(QuickenedBinaryOp, node)
+            quickened.operation = BINARY_OPERATIONS[op]
+            quickened.left_type, quickened.right_type = type(left), type(right)
+        return result
+
+    def visit_QuickenedBinaryOp(self, node: QuickenedBinaryOp) -> Any:
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        if type(left) is node.left_type and type(right) is node.right_type:
+            return node.operation(left, right)
+        self.deoptimize(node, BinaryOp)
+        return self.binary_operation(node, left, right)
+
+    def visit_ComparisonOp(self, node: ComparisonOp) -> bool:
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        result = self.comparison(node, left, right)
+
+        if comparison_is_quickenable(type(left), type(right)) and self.quicken(
+            node, QuickenedComparisonOp
+        ):
+            quickened = cast(QuickenedComparisonOp, node)
+            quickened.operation = COMPARISON_OPERATIONS[cast(Comparison, node.operator.type)]
+            quickened.left_type, quickened.right_type = type(left), type(right)
+        return result
+
+    def visit_QuickenedComparisonOp(self, node: QuickenedComparisonOp) -> bool:
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        if type(left) is node.left_type and type(right) is node.right_type:
+            return node.operation(left, right)
+        self.deoptimize(node, ComparisonOp)
+        return self.comparison(node, left, right)
+
+    def visit_ArrayIndex(self, node: ArrayIndex) -> Any:
+        array = self.visit(node.array)
+        index = self.visit(node.index)
+        result = self.index_array(array, index)
+        if type(array) is list and type(index) is int:
+            self.quicken(node, QuickenedArrayIndex)
+        return result
+
+    def visit_QuickenedArrayIndex(self, node: QuickenedArrayIndex) -> Any:
+        array = self.visit(node.array)
+        index = self.visit(node.index)
+        if type(array) is list and type(index) is int:
+            try:
+                return array[index]
+            except IndexError:
+                raise ExecutionError(f"Array index out of bounds: {index}")
+        self.deoptimize(node, ArrayIndex)
+        return self.index_array(array, index)
@@ -0,0 +1,103 @@
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from flicklang.ast import Program
+from flicklang.exceptions import ParsingError, TokenizationError
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.models import EOFToken
+from flicklang.parser import Parser
+
+
+@dataclass
+class InputTiming:
+    """Seconds spent on each phase of one REPL input."""
+    lexing: float
+    parsing: float
+    execution: float
+
+    @property
+    def total(self) -> float:
+        return self.lexing + self.parsing + self.execution
+
+    def __str__(self) -> str:
+        return (
+            f"[lex {self.lexing * 1000:.3f} ms, parse {self.parsing * 1000:.3f} ms, "
+            f"run {self.execution * 1000:.3f} ms, total {self.total * 1000:.3f} ms]"
+        )
+
+
+class ReplSession:
+    """
+    Interactive session that keeps one interpreter alive across inputs.
+
+    Each input is lexed and parsed on its own and then executed against the
+    long-lived interpreter environment, so variables and functions defined by
+    earlier inputs (or the prelude) stay available without re-running them.
+    Lines are buffered until they form a complete program, which allows blocks
+    to span several lines.
+    """
+
+    def __init__(self, interpreter: Optional[Interpreter] = None) -> None:
+        self.interpreter = interpreter if interpreter is not None else Interpreter()
+        self.buffer: List[str] = []
+        self.last_timing: Optional[InputTiming] = None
+
+    @property
+    def pending(self) -> bool:
+        """True while lines are buffered waiting for the rest of a block."""
+        return bool(self.buffer)
+
+    def load_prelude(self, path: str) -> InputTiming:
+        with open(path, "r", encoding="utf-8") as file:
+            return self.execute(file.read())
+
+    def feed(self, line: str) -> bool:
+        """
+        Add a line of input, executing the buffered source once it is complete.
+        Returns False while more lines are needed. Errors are raised after the
+        buffer has been cleared.
+        """
+        self.buffer.append(line)
+        source_code = "\n".join(self.buffer)
+        try:
+            program, lexing, parsing = self.compile(source_code)
+        except (TokenizationError, ParsingError) as e:
+            if self.is_incomplete(e):
+                return False
+            self.buffer.clear()
+            raise
+        self.buffer.clear()
+        self.run(program, lexing, parsing)
+        return True
+
+    def reset_buffer(self) -> None:
+        self.buffer.clear()
+
+    @staticmethod
+    def is_incomplete(error: TokenizationError | ParsingError) -> bool:
+        """Whether a compile error only means that the input ended too early."""
+        if isinstance(error, TokenizationError):
+            return error.message == "Unterminated string literal"
+        return isinstance(error.token, EOFToken)
+
+    def compile(self, source_code: str) -> Tuple[Program, float, float]:
+        """Lex and parse `source_code`, returning the program and both phase timings."""
+        start = time.perf_counter()
+        tokens = Lexer(source_code).tokenize()
+        lexed = time.perf_counter()
+        program = Parser(tokens).parse()
+        return program, lexed - start, time.perf_counter() - lexed
+
+    def execute(self, source_code: str) -> InputTiming:
+        program, lexing, parsing = self.compile(source_code)
+        return self.run(program, lexing, parsing)
+
+    def run(self, program: Program, lexing: float, parsing: float) -> InputTiming:
+        start = time.perf_counter()
+        try:
+            self.interpreter.interpret(program)
+        finally:
+            self.last_timing = InputTiming(lexing, parsing, time.perf_counter() - start)
+        return self.last_timing
@@ -1,9 +1,19 @@
-import argparse
+import os
+import sys
+from typing import TYPE_CHECKING, cast
 
-from flicklang.exceptions import ExecutionError
+from flicklang.exceptions import ExecutionError, FlickLangError
 from flicklang.lexer import Lexer
 from flicklang.parser import Parser
 from flicklang.interpreter import Interpreter
+from flicklang.limits import ExecutionLimits
+
+# argparse and the profilers, optimizer and REPL are imported by the code paths
+# that use them, which keeps them out of the start-up time of plain runs.
+if TYPE_CHECKING:
+    import argparse
+
+    from flicklang.stats import RunStats
 
 flicklang_ascii = """
  ______ _ _      _    _                       
@@ -19,48 +29,354 @@ FlickLang Interactive Mode. Type 'exit' to exit.
 """
 
 
-def run_flicklang_program(source_code: str) -> None:
+def run_flicklang_program(
+    source_code: str,
+    interpreter: Interpreter | None = None,
+    optimize: bool = False,
+    limits: ExecutionLimits | None = None,
+    stats: "RunStats | None" = None,
+) -> Interpreter:
+    if stats is not None:
+        from flicklang.stats import run_with_stats
+
+        return run_with_stats(source_code, stats, interpreter, optimize, limits)
+
     lexer = Lexer(source_code)
     tokens = lexer.tokenize()
 
     parser = Parser(tokens)
     program = parser.parse()
 
-    interpreter = Interpreter()
+    if optimize:
+        from flicklang.type_inference import specialize_program
+
+        print(specialize_program(program), file=sys.stderr)
+
+    if interpreter is None:
+        interpreter = create_interpreter(optimize, limits)
     interpreter.interpret(program)
+    return interpreter
+
+
+def create_interpreter(optimize: bool, limits: ExecutionLimits | None) -> Interpreter:
+    if optimize:
+        from flicklang.quickening import QuickeningInterpreter
+
+        return QuickeningInterpreter(limits)
+    return Interpreter(limits)
+
+
+def run_command(source_code: str) -> None:
+    """Run `source_code` with no options, reporting errors like a file run."""
+    try:
+        run_flicklang_program(source_code)
+    except ExecutionError as e:
+        print(f"Runtime error encountered: {e}")
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+
+def add_limit_arguments(arg_parser: "argparse.ArgumentParser") -> None:
+    limit_arguments = arg_parser.add_argument_group(
+        "execution limits", "Stop the run with an error once a quota is exceeded"
+    )
+    limit_arguments.add_argument(
+        "--max-steps", type=int, metavar="N", help="Loop iterations plus function calls"
+    )
+    limit_arguments.add_argument(
+        "--max-time", type=float, metavar="SECONDS", help="Wall-clock time per run"
+    )
+    limit_arguments.add_argument(
+        "--max-array-length", type=int, metavar="N", help="Length of any single array"
+    )
+    limit_arguments.add_argument(
+        "--max-allocated-elements",
+        type=int,
+        metavar="N",
+        help="Elements of all arrays created during a run",
+    )
+    limit_arguments.add_argument(
+        "--max-call-depth", type=int, metavar="N", help="Depth of nested function calls"
+    )
+
+
+def limits_from_arguments(args: "argparse.Namespace") -> ExecutionLimits | None:
+    limits = ExecutionLimits(
+        max_steps=args.max_steps,
+        max_time=args.max_time,
+        max_array_length=args.max_array_length,
+        max_allocated_elements=args.max_allocated_elements,
+        max_call_depth=args.max_call_depth,
+    )
+    return None if limits == ExecutionLimits() else limits
+
+
+def report_stats(stats: "RunStats | None", output_format: str) -> None:
+    if stats is not None:
+        print(stats.to_json() if output_format == "json" else stats.report(), file=sys.stderr)
 
 
 def main() -> None:
+    if sys.argv[1:2] == ["serve"]:
+        # Imported here because the server builds on this module.
+        from flicklang.server import main as serve
+
+        serve(sys.argv[2:])
+        return
+    if len(sys.argv) == 3 and sys.argv[1] == "-c":
+        # Nothing else to configure, so skip building the argument parser.
+        run_command(sys.argv[2])
+        return
+
+    import argparse
+
     arg_parser = argparse.ArgumentParser(description="Run FlickLang programs.")
     arg_parser.add_argument(
         "file_path", nargs="?", default=None, help="The FlickLang file to run"
     )
+    arg_parser.add_argument(
+        "-c", dest="source", default=None, help="Run the program passed in as a string"
+    )
+    arg_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report per-function and per-line timings to stderr after the run",
+    )
+    arg_parser.add_argument(
+        "--sample",
+        metavar="OUTPUT",
+        default=None,
+        help="Sample the FlickLang call stack and write collapsed stacks for flamegraphs",
+    )
+    arg_parser.add_argument(
+        "--sample-interval",
+        metavar="MS",
+        type=float,
+        default=1.0,
+        help="Sampling interval in milliseconds (default: 1.0)",
+    )
+    arg_parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Specialize operations from inferred and observed operand types",
+    )
+    arg_parser.add_argument(
+        "--snapshot-out",
+        metavar="FILE",
+        default=None,
+        help="After the run, save its global variables and functions to FILE",
+    )
+    arg_parser.add_argument(
+        "--snapshot-in",
+        metavar="FILE",
+        default=None,
+        help="Before the run, restore the variables and functions saved in FILE",
+    )
+    arg_parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Report phase timings and execution counts to stderr after the run",
+    )
+    arg_parser.add_argument(
+        "--stats-format",
+        choices=["text", "json"],
+        default="text",
+        help="Format of the --stats report (default: text)",
+    )
+    arg_parser.add_argument(
+        "--tier-up",
+        type=int,
+        metavar="N",
+        default=None,
+        help="Compile functions to Python once their calls and loop iterations reach N, "
+        "logging each tier-up to stderr",
+    )
+    memory_arguments = arg_parser.add_argument_group(
+        "memory profiling", "Attribute array, map and string allocations to the source"
+    )
+    memory_arguments.add_argument(
+        "--memory",
+        action="store_true",
+        help="Report the largest allocation sites and peak memory per function to stderr",
+    )
+    memory_arguments.add_argument(
+        "--memory-top",
+        type=int,
+        metavar="N",
+        default=10,
+        help="Allocation sites and functions listed in the report (default: 10)",
+    )
+    memory_arguments.add_argument(
+        "--memory-interval",
+        type=float,
+        metavar="SECONDS",
+        default=None,
+        help="Also print a heap summary to stderr every SECONDS while the script runs",
+    )
+    add_limit_arguments(arg_parser)
+    arg_parser.add_argument(
+        "--prelude",
+        metavar="FILE",
+        default=None,
+        help="Interactive mode: run this file once before the first prompt",
+    )
+    arg_parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="Interactive mode: report lex, parse and run time for every input",
+    )
 
     args = arg_parser.parse_args()
+    if args.stats and args.profile:
+        arg_parser.error("--stats and --profile cannot be combined")
+    if args.profile and args.sample:
+        arg_parser.error("--profile and --sample cannot be combined")
+    if args.memory and (args.profile or args.sample or args.optimize):
+        arg_parser.error("--memory cannot be combined with --profile, --sample or --optimize")
+    if args.tier_up is not None:
+        # --stats counts through hooks, which keep every function interpreted.
+        if args.profile or args.memory or args.optimize or args.stats:
+            arg_parser.error(
+                "--tier-up cannot be combined with --profile, --memory, --optimize or --stats"
+            )
+        if args.tier_up < 1:
+            arg_parser.error("--tier-up must be at least 1")
+    limits = limits_from_arguments(args)
 
-    if args.file_path:
+    if args.file_path or args.source is not None:
         file_path = args.file_path
-        print(f"Running FlickLang interpreter on file: {file_path}")
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                source_code = file.read()
-                run_flicklang_program(source_code)
-        except FileNotFoundError:
-            print(f"Error: The file '{file_path}' was not found.")
+            if args.source is not None:
+                source_code = args.source
+            else:
+                # On stderr, so scripts can be used as filters in pipelines.
+                print(f"Running FlickLang interpreter on file: {file_path}", file=sys.stderr)
+                with open(file_path, "r", encoding="utf-8") as file:
+                    source_code = file.read()
+            if args.profile:
+                from flicklang.profiler import ProfilingInterpreter
+
+                profiler = ProfilingInterpreter(limits=limits)
+                interpreter: Interpreter = profiler
+            elif args.memory:
+                from flicklang.memory_profiler import MemoryProfilingInterpreter
+
+                memory_profiler = MemoryProfilingInterpreter(limits, args.memory_interval)
+                interpreter = memory_profiler
+            elif args.tier_up is not None:
+                from flicklang.tiering import TieringInterpreter
+
+                interpreter = TieringInterpreter(limits, args.tier_up, sys.stderr)
+                if limits is not None:
+                    print(
+                        "[tier-up] disabled: functions stay interpreted under execution limits",
+                        file=sys.stderr,
+                    )
+            else:
+                interpreter = create_interpreter(args.optimize, limits)
+            if args.snapshot_in:
+                from flicklang.snapshot import restore_snapshot
+
+                restore_snapshot(interpreter, args.snapshot_in)
+            stats = None
+            if args.stats:
+                from flicklang.stats import RunStats
+
+                stats = RunStats()
+
+            if args.profile:
+                try:
+                    run_flicklang_program(source_code, profiler, args.optimize)
+                finally:
+                    print(profiler.profile.report(source_code), file=sys.stderr)
+            elif args.memory:
+                try:
+                    run_flicklang_program(source_code, memory_profiler, stats=stats)
+                finally:
+                    report_stats(stats, args.stats_format)
+                    print(
+                        memory_profiler.memory.report(source_code, args.memory_top),
+                        file=sys.stderr,
+                    )
+            elif args.sample:
+                from flicklang.sampler import SamplingProfiler
+
+                sampler = SamplingProfiler(interval=args.sample_interval / 1000)
+                try:
+                    with sampler:
+                        run_flicklang_program(
+                            source_code, interpreter, args.optimize, stats=stats
+                        )
+                finally:
+                    sampler.write_collapsed(args.sample)
+                    report_stats(stats, args.stats_format)
+            else:
+                try:
+                    run_flicklang_program(source_code, interpreter, args.optimize, stats=stats)
+                finally:
+                    report_stats(stats, args.stats_format)
+                if args.optimize:
+                    from flicklang.quickening import QuickeningInterpreter
+
+                    print(cast(QuickeningInterpreter, interpreter).stats, file=sys.stderr)
+
+            if args.snapshot_out:
+                from flicklang.snapshot import save_snapshot
+
+                size = save_snapshot(interpreter, args.snapshot_out)
+                print(f"Snapshot written to {args.snapshot_out} ({size} bytes)", file=sys.stderr)
+        except FileNotFoundError as e:
+            print(f"Error: The file '{e.filename}' was not found.")
         except ExecutionError as e:
             print(f"Runtime error encountered: {e}")
+        except BrokenPipeError:
+            # The reader of a pipeline stopped early (`... | head`). Point stdout
+            # at /dev/null so flushing it at exit does not fail again.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
         except Exception as e:
             print(f"An error occurred: {e}")
     else:
         # Interactive mode
+        from flicklang.repl import ReplSession
+
+        session = ReplSession(Interpreter(limits))
+        if args.snapshot_in:
+            from flicklang.snapshot import restore_snapshot
+
+            try:
+                restore_snapshot(session.interpreter, args.snapshot_in)
+            except FileNotFoundError:
+                print(f"Error: The snapshot '{args.snapshot_in}' was not found.")
+            except FlickLangError as e:
+                print(f"An error occurred in snapshot: {e}")
+        if args.prelude:
+            try:
+                timing = session.load_prelude(args.prelude)
+                if args.timing:
+                    print(f"Prelude loaded {timing}")
+            except FileNotFoundError:
+                print(f"Error: The prelude '{args.prelude}' was not found.")
+            except ExecutionError as e:
+                print(f"Runtime error encountered in prelude: {e}")
+            except Exception as e:
+                print(f"An error occurred in prelude: {e}")
+
         print(flicklang_ascii)
         while True:
             try:
-                source_code = input(">>> ")
-                if source_code.strip().lower() == "exit":
+                source_code = input("... " if session.pending else ">>> ")
+                if not session.pending and source_code.strip().lower() == "exit":
                     print("Exiting FlickLang Interactive Mode.")
                     break
-                run_flicklang_program(source_code)
+                if session.feed(source_code) and args.timing:
+                    print(session.last_timing)
+            except EOFError:
+                print("\nExiting FlickLang Interactive Mode.")
+                break
+            except KeyboardInterrupt:
+                session.reset_buffer()
+                print()
             except ExecutionError as e:
                 print(f"Runtime error encountered: {e}")
             except Exception as e:
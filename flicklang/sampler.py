@@ -0,0 +1,118 @@
+import sys
+import threading
+from collections import Counter
+from types import FrameType, TracebackType
+from typing import Counter as CounterType, List, Optional, TextIO, Tuple, Type
+
+from flicklang.ast import FunctionDecleration, Node
+
+# Interpreter methods whose frames identify FlickLang execution state, mapped to
+# the local variable holding the FlickLang object they are working on.
+STATEMENT_FRAMES = {
+    "interpret": "statement",
+    "visit_Block": "statement",
+    "execute_statement": "node",
+}
+CALL_FRAMES = {"call_function": "function"}
+
+
+class SamplingProfiler:
+    """
+    Periodically samples the FlickLang call stack of a running interpreter.
+
+    A background thread wakes up every `interval` seconds and walks the Python
+    frames of the interpreted thread, picking out active `call_function` frames
+    and the statement currently executing. Nothing is added to the interpreter's
+    own hot path, so the cost is bounded by the sampling rate.
+
+    Usage:
+        with SamplingProfiler(interval=0.001) as sampler:
+            interpreter.interpret(program)
+        sampler.write_collapsed("profile.folded")
+    """
+
+    def __init__(self, interval: float = 0.001, thread_id: Optional[int] = None) -> None:
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive.")
+        self.interval = interval
+        self.thread_id = thread_id
+        self.samples: CounterType[Tuple[str, ...]] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("Sampling profiler is already running.")
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="flicklang-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # type: ignore[arg-type]
+            if frame is None:
+                break
+            stack = self.flicklang_stack(frame)
+            if stack:
+                self.samples[stack] += 1
+
+    @staticmethod
+    def flicklang_stack(frame: Optional[FrameType]) -> Tuple[str, ...]:
+        """Return the FlickLang stack for a Python frame, outermost entry first."""
+        stack: List[str] = []
+        statement_seen = False
+        while frame is not None:
+            code_name = frame.f_code.co_name
+            if code_name in CALL_FRAMES:
+                function = frame.f_locals.get(CALL_FRAMES[code_name])
+                if isinstance(function, FunctionDecleration):
+                    stack.append(f"{function.name.value}:{function.line}")
+            elif not statement_seen and code_name in STATEMENT_FRAMES:
+                statement = frame.f_locals.get(STATEMENT_FRAMES[code_name])
+                if isinstance(statement, Node):
+                    stack.append(f"line {statement.line} ({type(statement).__name__})")
+                    statement_seen = True
+            frame = frame.f_back
+
+        if not stack:
+            return ()
+        stack.append("main")
+        stack.reverse()
+        return tuple(stack)
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format, as consumed by flamegraph tools."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in sorted(self.samples.items())
+        )
+
+    def write_collapsed(self, file: str | TextIO) -> None:
+        if isinstance(file, str):
+            with open(file, "w", encoding="utf-8") as output:
+                output.write(self.collapsed())
+        else:
+            file.write(self.collapsed())
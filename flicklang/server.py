@@ -0,0 +1,232 @@
+"""
+Pre-forking FlickLang server for `flicklang serve`.
+
+The parent imports the lexer, parser and interpreter once, binds a Unix socket
+and forks a pool of workers that inherit both. Workers accept connections from
+the shared socket, run one script per connection with a fresh interpreter and
+stream its output back (see `flicklang.client` for the protocol). A worker
+exits after `max_requests` runs and the parent forks a replacement, which
+bounds the memory a long-lived worker can accumulate. Workers report request
+latencies to the parent over a pipe; the parent prints their percentiles on
+SIGUSR1 and at shutdown.
+"""
+import argparse
+import gc
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Dict, List, Optional
+
+from flicklang.client import DEFAULT_SOCKET, describe_latencies, send_message
+from flicklang.exceptions import ExecutionError
+from flicklang.limits import ExecutionLimits
+from flicklang.run_flicklang import (
+    add_limit_arguments,
+    limits_from_arguments,
+    run_flicklang_program,
+)
+
+
+class SocketOutput:
+    """Text stream that forwards everything written to it as `{key: text}` messages."""
+
+    def __init__(self, connection: socket.socket, key: str) -> None:
+        self.connection = connection
+        self.key = key
+
+    def write(self, text: str) -> int:
+        if text:
+            send_message(self.connection, {self.key: text})
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def run_request(
+    request: Dict[str, Any], connection: socket.socket, limits: Optional[ExecutionLimits]
+) -> Optional[str]:
+    """Run the script of `request`, streaming its output; the error message if it failed."""
+    try:
+        if "path" in request:
+            path = request["path"]
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    source_code = file.read()
+            except FileNotFoundError:
+                return f"Error: The file '{path}' was not found."
+        else:
+            source_code = request["source"]
+
+        with redirect_stdout(SocketOutput(connection, "stdout")), redirect_stderr(
+            SocketOutput(connection, "stderr")
+        ):
+            run_flicklang_program(
+                source_code, optimize=bool(request.get("optimize")), limits=limits
+            )
+    except ExecutionError as e:
+        return f"Runtime error encountered: {e}"
+    except Exception as e:
+        return f"An error occurred: {e}"
+    return None
+
+
+class PreforkServer:
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET,
+        workers: int = 4,
+        max_requests: int = 1000,
+        limits: Optional[ExecutionLimits] = None,
+    ) -> None:
+        self.socket_path = socket_path
+        self.workers = workers
+        self.max_requests = max_requests
+        self.limits = limits
+        self.worker_pids: List[int] = []
+        self.latencies: List[float] = []
+        self.running = False
+        self.report_requested = False
+
+    def serve_forever(self) -> None:
+        # Set before the handlers, so a stop signal that arrives early is not lost.
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGUSR1, self.request_report)
+
+        # Listen on a private path and move it into place, so a client that sees
+        # the socket path never finds it bound but not yet listening.
+        pending_path = f"{self.socket_path}.{os.getpid()}"
+        if os.path.exists(pending_path):
+            os.unlink(pending_path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(pending_path)
+        self.listener.listen(128)
+        os.replace(pending_path, self.socket_path)
+        self.latency_reader, self.latency_writer = os.pipe()
+
+        # Keep the imported modules out of the collector so workers do not
+        # copy the pages holding them when a collection touches their headers.
+        gc.freeze()
+        try:
+            for _ in range(self.workers):
+                self.spawn_worker()
+            print(
+                f"FlickLang server listening on {self.socket_path} "
+                f"with {self.workers} workers",
+                file=sys.stderr,
+            )
+            self.supervise()
+        finally:
+            self.shutdown()
+
+    def stop(self, signum: int, frame: Any) -> None:
+        self.running = False
+
+    def request_report(self, signum: int, frame: Any) -> None:
+        self.report_requested = True
+
+    def spawn_worker(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                self.run_worker()
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+        self.worker_pids.append(pid)
+
+    def supervise(self) -> None:
+        """Collect latencies and replace workers that exit until the server is stopped."""
+        pending = b""
+        while self.running:
+            readable, _, _ = select.select([self.latency_reader], [], [], 0.5)
+            if readable:
+                pending += os.read(self.latency_reader, 65536)
+                *lines, pending = pending.split(b"\n")
+                self.latencies.extend(float(line) for line in lines)
+
+            while self.worker_pids:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+                if pid == 0:
+                    break
+                self.worker_pids.remove(pid)
+                if self.running:
+                    self.spawn_worker()
+
+            if self.report_requested:
+                self.report_requested = False
+                print(describe_latencies(self.latencies), file=sys.stderr)
+
+    def shutdown(self) -> None:
+        for pid in self.worker_pids:
+            os.kill(pid, signal.SIGTERM)
+        for pid in self.worker_pids:
+            os.waitpid(pid, 0)
+        self.worker_pids.clear()
+        self.listener.close()
+        os.close(self.latency_reader)
+        os.close(self.latency_writer)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        print(describe_latencies(self.latencies), file=sys.stderr)
+
+    def run_worker(self) -> None:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # Ctrl-C reaches the whole process group; only the parent handles it.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+        os.close(self.latency_reader)
+
+        for _ in range(self.max_requests):
+            connection, _ = self.listener.accept()
+            with connection:
+                start = time.perf_counter()
+                try:
+                    with connection.makefile("r", encoding="utf-8") as stream:
+                        request = json.loads(stream.readline())
+                    error = run_request(request, connection, self.limits)
+                    if error is None:
+                        send_message(connection, {"status": "ok"})
+                    else:
+                        send_message(connection, {"status": "error", "error": error})
+                except (OSError, ValueError):
+                    # The client went away or sent a malformed request.
+                    continue
+                latency = time.perf_counter() - start
+                os.write(self.latency_writer, f"{latency}\n".encode())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arg_parser = argparse.ArgumentParser(
+        prog="flicklang serve", description="Serve FlickLang runs from pre-forked workers."
+    )
+    arg_parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    arg_parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 4, help="Worker processes"
+    )
+    arg_parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=1000,
+        metavar="N",
+        help="Replace a worker after it has served N runs (default: 1000)",
+    )
+    add_limit_arguments(arg_parser)
+    args = arg_parser.parse_args(argv)
+
+    PreforkServer(
+        args.socket, args.workers, args.max_requests, limits_from_arguments(args)
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Snapshots of an interpreter's global environment.
+
+A snapshot holds every global variable, array and function declaration after a
+setup script has run, so later runs can restore it instead of repeating the
+setup. Values are pickled together, which keeps shared references shared: two
+variables bound to the same array are bound to the same array after a restore.
+
+The file is a fixed header (magic bytes and format version) followed by the
+zlib-compressed pickle. Unpickling can run arbitrary code, so only restore
+snapshots you created yourself.
+"""
+import pickle
+import struct
+import zlib
+from typing import Any, Dict
+
+from flicklang.exceptions import SnapshotError
+from flicklang.interpreter import Interpreter
+from flicklang.quickening import dumps_generic
+
+SNAPSHOT_MAGIC = b"FLKSNAP\x00"
+# Bump whenever the pickled classes (AST nodes, values) change incompatibly.
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct(f">{len(SNAPSHOT_MAGIC)}sH")
+
+
+def save_snapshot(interpreter: Interpreter, path: str) -> int:
+    """Write the global environment of `interpreter` to `path`; returns the file size."""
+    # The restoring interpreter may be a plain one, so quickened nodes are
+    # written as generic nodes, wherever in the environment they are.
+    payload = zlib.compress(dumps_generic(interpreter.global_environment))
+    data = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION) + payload
+    with open(path, "wb") as file:
+        file.write(data)
+    return len(data)
+
+
+def load_snapshot(path: str) -> Dict[str, Any]:
+    """Read the environment stored in the snapshot at `path`."""
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < HEADER.size:
+        raise SnapshotError(f"'{path}' is not a FlickLang snapshot.")
+    magic, version = HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"'{path}' is not a FlickLang snapshot.")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(
+            f"Snapshot '{path}' has format version {version}, expected {SNAPSHOT_VERSION}."
+        )
+    try:
+        environment = pickle.loads(zlib.decompress(data[HEADER.size:]))
+    except Exception as e:
+        raise SnapshotError(f"Snapshot '{path}' is corrupt: {e}")
+    if not isinstance(environment, dict):
+        raise SnapshotError(f"Snapshot '{path}' does not hold an environment.")
+    return environment
+
+
+def restore_snapshot(interpreter: Interpreter, path: str) -> None:
+    """Bind everything stored in the snapshot at `path` in the global scope of `interpreter`."""
+    interpreter.global_environment.update(load_snapshot(path))
@@ -0,0 +1,267 @@
+"""
+Runtime statistics of a run: time per phase and how much work the interpreter did.
+
+The counters are collected through two hooks, one per executed statement and
+one per function call, so a run with statistics does a dictionary update per
+statement and nothing per expression. Everything else is derived afterwards
+from those counts and the program's AST: a loop ran as many iterations as the
+first statement of its body ran, and every expression of a statement is
+evaluated once each time the statement runs. Loops and branches with empty
+bodies therefore count no iterations, and the expression counts of a
+statement that failed part way include the expressions it did not reach.
+"""
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from flicklang.ast import (
+    Assignment,
+    Block,
+    CompoundAssignment,
+    ForEach,
+    ForRange,
+    FunctionDecleration,
+    If,
+    Node,
+    Program,
+    WhileLoop,
+    iter_child_nodes,
+)
+from flicklang.hooks import Event
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.limits import ExecutionLimits
+from flicklang.parser import Parser
+
+
+@dataclass
+class PhaseTiming:
+    """Seconds spent in one phase, on the wall clock and on the CPU."""
+    wall: float = 0.0
+    cpu: float = 0.0
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.wall += time.perf_counter() - wall
+            self.cpu += time.process_time() - cpu
+
+
+@dataclass
+class RunStats:
+    lexing: PhaseTiming = field(default_factory=PhaseTiming)
+    parsing: PhaseTiming = field(default_factory=PhaseTiming)
+    execution: PhaseTiming = field(default_factory=PhaseTiming)
+    tokens: int = 0
+    nodes: int = 0
+    statements: int = 0
+    # Node type -> times a node of that type was executed.
+    executed_nodes: Dict[str, int] = field(default_factory=dict)
+    # Declared function name -> calls.
+    function_calls: Dict[str, int] = field(default_factory=dict)
+    loop_iterations: int = 0
+    # Most variables bound in one scope, globals or a function's locals.
+    peak_environment_size: int = 0
+    peak_call_depth: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+    def report(self) -> str:
+        output = [f"{'Phase':<10} {'Wall (ms)':>12} {'CPU (ms)':>12}"]
+        phases = [("lex", self.lexing), ("parse", self.parsing), ("run", self.execution)]
+        for name, timing in phases:
+            output.append(f"{name:<10} {timing.wall * 1000:>12.3f} {timing.cpu * 1000:>12.3f}")
+        wall = sum(timing.wall for _, timing in phases)
+        cpu = sum(timing.cpu for _, timing in phases)
+        output.append(f"{'total':<10} {wall * 1000:>12.3f} {cpu * 1000:>12.3f}")
+
+        output.append("")
+        output.append(f"Tokens: {self.tokens}, AST nodes: {self.nodes}")
+        output.append(
+            f"Statements executed: {self.statements}, loop iterations: "
+            f"{self.loop_iterations}, function calls: {sum(self.function_calls.values())}"
+        )
+        output.append(
+            f"Peak environment size: {self.peak_environment_size}, "
+            f"peak call depth: {self.peak_call_depth}"
+        )
+
+        if self.function_calls:
+            output.append("")
+            output.append(f"{'Function':<24} {'Calls':>10}")
+            for name, calls in sorted(self.function_calls.items(), key=lambda item: -item[1]):
+                output.append(f"{name:<24} {calls:>10}")
+
+        output.append("")
+        output.append(f"{'Node type':<24} {'Executed':>10}")
+        for name, count in sorted(self.executed_nodes.items(), key=lambda item: -item[1]):
+            output.append(f"{name:<24} {count:>10}")
+        return "\n".join(output)
+
+
+class ExecutionCounter:
+    """Counts statements and calls of an interpreter while attached to its hooks."""
+
+    def __init__(self, interpreter: Interpreter) -> None:
+        self.interpreter = interpreter
+        # id() of a statement node -> times it ran.
+        self.statements: Dict[int, int] = {}
+        self.calls: Dict[str, int] = {}
+        self.peak_environment_size = 0
+        self.peak_call_depth = 0
+
+    def on_statement(self, statement: Node) -> None:
+        key = id(statement)
+        statements = self.statements
+        statements[key] = statements.get(key, 0) + 1
+        size = len(self.interpreter.environment)
+        if size > self.peak_environment_size:
+            self.peak_environment_size = size
+
+    def on_call(self, function: FunctionDecleration, arguments: List[object]) -> None:
+        name = function.name.value
+        self.calls[name] = self.calls.get(name, 0) + 1
+        # The hook runs before the call enters its scope.
+        depth = self.interpreter.call_depth + 1
+        if depth > self.peak_call_depth:
+            self.peak_call_depth = depth
+
+    def attach(self) -> None:
+        self.interpreter.add_hook(Event.STATEMENT, self.on_statement)
+        self.interpreter.add_hook(Event.CALL, self.on_call)
+
+    def detach(self) -> None:
+        self.interpreter.remove_hook(Event.STATEMENT, self.on_statement)
+        self.interpreter.remove_hook(Event.CALL, self.on_call)
+
+    def record(self, program: Program, stats: RunStats) -> None:
+        """Add the counts of a run of `program` to `stats`."""
+        executed = stats.executed_nodes
+        for statement in statements_of(program):
+            times = self.statements.get(id(statement), 0)
+            if times:
+                stats.statements += times
+                stats.loop_iterations += self.count_statement(statement, times, executed)
+        for name, calls in self.calls.items():
+            stats.function_calls[name] = stats.function_calls.get(name, 0) + calls
+        stats.peak_environment_size = max(stats.peak_environment_size, self.peak_environment_size)
+        stats.peak_call_depth = max(stats.peak_call_depth, self.peak_call_depth)
+
+    def entries(self, block: Block) -> int:
+        """Times `block` was entered, going by its first statement."""
+        return self.statements.get(id(block.statements[0]), 0) if block.statements else 0
+
+    def count_statement(self, statement: Node, times: int, executed: Dict[str, int]) -> int:
+        """Count the nodes `statement` executed in `times` runs; returns its loop iterations."""
+        count_node(statement, times, executed)
+        if isinstance(statement, If):
+            # Each condition is evaluated until a branch is taken.
+            reached: Optional[Node] = statement
+            while isinstance(reached, If):
+                count_expression(reached.condition, times, executed)
+                times -= self.entries(reached.true_branch)
+                reached = reached.false_branch
+            return 0
+        if isinstance(statement, WhileLoop):
+            iterations = self.entries(statement.body)
+            count_expression(statement.condition, times + iterations, executed)
+            return iterations
+        if isinstance(statement, (ForRange, ForEach)):
+            for expression in iter_child_nodes(statement):
+                if expression is not statement.variable and not isinstance(expression, Block):
+                    count_expression(expression, times, executed)
+            return self.entries(statement.body)
+        if isinstance(statement, (Assignment, CompoundAssignment)):
+            count_expression(statement.variable_value, times, executed)
+        elif not isinstance(statement, FunctionDecleration):
+            for expression in iter_child_nodes(statement):
+                count_expression(expression, times, executed)
+        return 0
+
+
+def statements_of(program: Program) -> Iterator[Node]:
+    """Every statement of `program`, including those in blocks and function bodies."""
+    blocks: List[Program | Block] = [program]
+    while blocks:
+        for statement in blocks.pop().statements:
+            yield statement
+            branch: Optional[Node] = statement
+            while isinstance(branch, If):
+                blocks.append(branch.true_branch)
+                branch = branch.false_branch
+            if isinstance(branch, Block):
+                blocks.append(branch)
+            elif isinstance(statement, (WhileLoop, ForRange, ForEach, FunctionDecleration)):
+                blocks.append(statement.body)
+
+
+def node_type(node: Node) -> str:
+    """The name of the node's generic class, for the specialized variants of optimized runs."""
+    cls = type(node)
+    while cls.__name__.startswith(("Typed", "Quickened")):
+        cls = cls.__base__
+    return cls.__name__
+
+
+def count_node(node: Node, times: int, executed: Dict[str, int]) -> None:
+    name = node_type(node)
+    executed[name] = executed.get(name, 0) + times
+
+
+def count_expression(expression: Node, times: int, executed: Dict[str, int]) -> None:
+    stack = [expression]
+    while stack:
+        node = stack.pop()
+        count_node(node, times, executed)
+        stack.extend(iter_child_nodes(node))
+
+
+def count_nodes(node: Node) -> int:
+    count = 0
+    stack = [node]
+    while stack:
+        count += 1
+        stack.extend(iter_child_nodes(stack.pop()))
+    return count
+
+
+def run_with_stats(
+    source_code: str,
+    stats: RunStats,
+    interpreter: Optional[Interpreter] = None,
+    optimize: bool = False,
+    limits: Optional[ExecutionLimits] = None,
+) -> Interpreter:
+    """`run_flicklang_program`, adding the timings and counts of the run to `stats`."""
+    from flicklang.run_flicklang import create_interpreter
+
+    with stats.lexing.measure():
+        tokens = Lexer(source_code).tokenize()
+    stats.tokens += len(tokens)
+    with stats.parsing.measure():
+        program = Parser(tokens).parse()
+    stats.nodes += count_nodes(program)
+
+    if optimize:
+        from flicklang.type_inference import specialize_program
+
+        print(specialize_program(program), file=sys.stderr)
+
+    if interpreter is None:
+        interpreter = create_interpreter(optimize, limits)
+    counter = ExecutionCounter(interpreter)
+    counter.attach()
+    try:
+        with stats.execution.measure():
+            interpreter.interpret(program)
+    finally:
+        counter.detach()
+        counter.record(program, stats)
+    return interpreter
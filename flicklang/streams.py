@@ -0,0 +1,136 @@
+"""
+Standard input and output for scripts used as filters in shell pipelines.
+
+`lines()` reads standard input in pieces of up to `READ_SIZE` bytes, decoding
+and splitting one piece at a time as a loop asks for lines, so memory stays
+bounded however much input there is. `p` collects lines in an `OutputBuffer`
+and writes them to standard output about `OUTPUT_BUFFER_SIZE` characters at a
+time instead of once per line.
+
+Both look up `sys.stdin` and `sys.stdout` when they use them rather than when
+they are created, so they follow `contextlib.redirect_stdout`, the server's
+per-request redirection and tests that replace the streams.
+"""
+import sys
+from typing import Any, List, Optional
+
+READ_SIZE = 1 << 20
+OUTPUT_BUFFER_SIZE = 1 << 16
+
+
+def split_lines(text: str) -> List[str]:
+    """
+    The lines of `text`, split only at newlines, with a carriage return before
+    a newline removed. Unlike `str.splitlines`, form feeds, record separators,
+    NEL and the Unicode line separators stay part of the line, as they do when
+    iterating over a file.
+    """
+    lines = text.split("\n")
+    if not lines[-1]:
+        # Text that ends with a newline does not start another line.
+        lines.pop()
+    if "\r" in text:
+        return [line[:-1] if line.endswith("\r") else line for line in lines]
+    return lines
+
+
+def is_terminal(stream: Any) -> bool:
+    isatty = getattr(stream, "isatty", None)
+    return isatty is not None and isatty()
+
+
+class OutputBuffer:
+    """
+    Printed lines waiting to be written to `sys.stdout`.
+
+    When standard output is a terminal each line is written as soon as it is
+    printed, so interactive use sees output immediately.
+    """
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.size = 0
+
+    def write(self, line: str) -> None:
+        lines = self.lines
+        lines.append(line)
+        self.size += len(line) + 1
+        if self.size >= OUTPUT_BUFFER_SIZE or (len(lines) == 1 and is_terminal(sys.stdout)):
+            self.flush()
+
+    def flush(self) -> None:
+        if self.lines:
+            text = "\n".join(self.lines) + "\n"
+            self.lines.clear()
+            self.size = 0
+            sys.stdout.write(text)
+
+
+class LineReader:
+    """Iterator over the lines of `source`, without line endings, read a piece at a time."""
+
+    def __init__(self, source: Any) -> None:
+        self.source = source
+        # Read bytes when the stream has a binary buffer; decoding a whole
+        # piece at once is much cheaper than decoding line by line.
+        binary = getattr(source, "buffer", None)
+        self.stream = binary if binary is not None else source
+        self.binary = binary is not None
+        self.newline: Any = b"\n" if self.binary else "\n"
+        self.pending: Any = b"" if self.binary else ""
+        self.lines: List[str] = []
+        self.index = 0
+        self.finished = False
+
+    def __iter__(self) -> "LineReader":
+        return self
+
+    def __next__(self) -> str:
+        while self.index == len(self.lines):
+            if not self.refill():
+                raise StopIteration
+        line = self.lines[self.index]
+        self.index += 1
+        return line
+
+    def read(self) -> Any:
+        # `read1` returns what is available instead of waiting for a full piece,
+        # so lines arriving slowly through a pipe are handled as they come.
+        read1 = getattr(self.stream, "read1", None)
+        return read1(READ_SIZE) if read1 is not None else self.stream.read(READ_SIZE)
+
+    def decode(self, data: Any) -> List[str]:
+        text = data.decode("utf-8", errors="replace") if self.binary else data
+        return split_lines(text)
+
+    def refill(self) -> bool:
+        """Split the next piece of input into lines; False at the end of the input."""
+        if self.finished:
+            return False
+        piece = self.read()
+        if not piece:
+            self.finished = True
+            self.lines, self.index = self.decode(self.pending), 0
+            self.pending = self.pending[:0]
+            return bool(self.lines)
+
+        data = self.pending + piece
+        # Keep the unfinished last line for the next piece.
+        end = data.rfind(self.newline) + 1
+        self.lines, self.index = self.decode(data[:end]), 0
+        self.pending = data[end:]
+        return True
+
+    def __repr__(self) -> str:
+        return "<lines of standard input>"
+
+
+stdin_reader: Optional[LineReader] = None
+
+
+def stdin_lines() -> LineReader:
+    """The reader of the current `sys.stdin`; each `lines()` continues where the last stopped."""
+    global stdin_reader
+    if stdin_reader is None or stdin_reader.source is not sys.stdin:
+        stdin_reader = LineReader(sys.stdin)
+    return stdin_reader
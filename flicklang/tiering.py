@@ -0,0 +1,159 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+from flicklang.ast import ForEach, ForRange, FunctionDecleration, WhileLoop
+from flicklang.compiler import CompiledFunction, Unsupported, compile_function
+from flicklang.exceptions import ExecutionError
+from flicklang.interpreter import Interpreter
+from flicklang.limits import ExecutionLimits
+
+# Calls plus loop iterations after which a function is compiled.
+DEFAULT_THRESHOLD = 1000
+
+
+@dataclass
+class FunctionCounter:
+    """How hot a function is, and its compiled code once it tiered up."""
+    function: FunctionDecleration
+    calls: int = 0
+    # Loop iterations run in the function's own body while interpreted.
+    back_edges: int = 0
+    compiled: Optional[CompiledFunction] = None
+    # Why the function cannot be compiled, once that is known.
+    unsupported: Optional[str] = None
+
+
+@dataclass
+class TierUp:
+    function: str
+    line: int
+    calls: int
+    back_edges: int
+    compile_time: float
+
+    def __str__(self) -> str:
+        return (
+            f"[tier-up] {self.function} (line {self.line}) compiled after {self.calls} "
+            f"calls and {self.back_edges} loop iterations in {self.compile_time * 1000:.2f} ms"
+        )
+
+
+@dataclass
+class TieringStats:
+    tier_ups: List[TierUp] = field(default_factory=list)
+    # Function name -> why it stays interpreted.
+    unsupported: Dict[str, str] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        compiled = ", ".join(tier_up.function for tier_up in self.tier_ups) or "none"
+        interpreted = ", ".join(
+            f"{name} ({reason})" for name, reason in sorted(self.unsupported.items())
+        )
+        if interpreted:
+            return f"Compiled: {compiled}; kept interpreted: {interpreted}"
+        return f"Compiled: {compiled}"
+
+
+class TieringInterpreter(Interpreter):
+    """
+    Interpreter that compiles hot functions to Python code.
+
+    Every function starts out interpreted. Its calls and the iterations of the
+    loops in its body are counted, and once they add up to `threshold` the
+    function is compiled with `flicklang.compiler`; later calls run the
+    compiled code. Functions that run only a few times are never compiled, so
+    short scripts pay nothing for compilation.
+
+    Compiled code neither charges execution limits nor produces hook events,
+    so while a run has limits or hooks every function is interpreted. Each
+    tier-up, and each function that cannot be compiled, is written to `log`.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[ExecutionLimits] = None,
+        threshold: int = DEFAULT_THRESHOLD,
+        log: Optional[TextIO] = None,
+    ) -> None:
+        super().__init__(limits)
+        if threshold < 1:
+            raise ValueError("Tier-up threshold must be at least 1.")
+        self.threshold = threshold
+        self.log = log
+        self.stats = TieringStats()
+        # id() of a function -> its counter; the counter keeps the function alive.
+        self.counters: Dict[int, FunctionCounter] = {}
+        # Counter of each interpreted function on the call stack, None at the top level.
+        self._active: List[Optional[FunctionCounter]] = [None]
+
+    def call_function(self, function: FunctionDecleration, arguments: List[Any]) -> Any:
+        if self.budget is not None or self.hooks:
+            return super().call_function(function, arguments)
+
+        counter = self.counters.get(id(function))
+        if counter is None or counter.function is not function:
+            counter = self.counters[id(function)] = FunctionCounter(function)
+        if counter.compiled is None and counter.unsupported is None:
+            counter.calls += 1
+            if counter.calls + counter.back_edges >= self.threshold:
+                self.tier_up(counter)
+
+        if counter.compiled is not None:
+            old_env = self.enter_function(function, arguments)
+            try:
+                return counter.compiled.code(self, *arguments)
+            finally:
+                self.leave_function(old_env)
+
+        active = self._active
+        active.append(counter)
+        try:
+            return super().call_function(function, arguments)
+        finally:
+            active.pop()
+
+    def tier_up(self, counter: FunctionCounter) -> None:
+        function = counter.function
+        name = function.name.value
+        start = time.perf_counter()
+        try:
+            counter.compiled = compile_function(function)
+        except Unsupported as error:
+            counter.unsupported = str(error)
+            self.stats.unsupported[name] = counter.unsupported
+            self.write_log(f"[tier-up] {name} (line {function.line}) stays interpreted: {error}")
+            return
+        tier_up = TierUp(
+            name, function.line, counter.calls, counter.back_edges, time.perf_counter() - start
+        )
+        self.stats.tier_ups.append(tier_up)
+        self.write_log(str(tier_up))
+
+    def write_log(self, line: str) -> None:
+        if self.log is not None:
+            print(line, file=self.log)
+
+    def visit_WhileLoop(self, node: WhileLoop) -> None:
+        counter = self._active[-1]
+        if counter is None or self.budget is not None:
+            super().visit_WhileLoop(node)
+            return
+        while (condition := self.visit(node.condition)) is True:
+            self.visit(node.body)
+            counter.back_edges += 1
+        if condition is not False:
+            raise ExecutionError("Condition expression must evaluate to a boolean.")
+
+    def run_loop(self, node: ForRange | ForEach, values: Iterable[Any]) -> None:
+        counter = self._active[-1]
+        if counter is None or self.budget is not None:
+            super().run_loop(node, values)
+            return
+        environment = self.environment
+        name = node.variable.name
+        body = node.body
+        for value in values:
+            environment[name] = value
+            self.visit(body)
+            counter.back_edges += 1
@@ -0,0 +1,353 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, FrozenSet, List, Set, Tuple, Type, cast
+
+from flicklang.ast import (
+    ArrayIndex,
+    ArrayIndexAssignment,
+    ArraySlice,
+    ArrayLiteral,
+    Assignment,
+    BinaryOp,
+    Block,
+    ComparisonOp,
+    CompoundAssignment,
+    ForEach,
+    ForRange,
+    FunctionCall,
+    FunctionDecleration,
+    If,
+    MapLiteral,
+    Node,
+    Number,
+    Print,
+    Program,
+    Return,
+    String,
+    TypedArrayIndex,
+    TypedArrayIndexAssignment,
+    TypedBinaryOp,
+    TypedComparisonOp,
+    UnaryOp,
+    Variable,
+    WhileLoop,
+)
+from flicklang.interpreter import BINARY_OPERATIONS, COMPARISON_OPERATIONS
+from flicklang.models import CompoundOperator, Comparison, Operator
+from flicklang.values import concatenate
+
+
+class ValueType(Enum):
+    INT = "int"
+    FLOAT = "float"
+    STR = "str"
+    ARRAY = "array"
+    MAP = "map"
+    BOOL = "bool"
+    UNKNOWN = "unknown"
+
+
+NUMERIC_TYPES = {ValueType.INT, ValueType.FLOAT}
+
+TypeEnvironment = Dict[str, ValueType]
+
+COMPOUND_OPERATORS = {
+    CompoundOperator.PLUS_ASSIGN: Operator.PLUS,
+    CompoundOperator.MINUS_ASSIGN: Operator.MINUS,
+    CompoundOperator.MULTIPLY_ASSIGN: Operator.MULTIPLY,
+    CompoundOperator.DIVIDE_ASSIGN: Operator.DIVIDE,
+    CompoundOperator.MODULO_ASSIGN: Operator.MODULO,
+}
+
+
+def binary_result_type(op: Operator, left: ValueType, right: ValueType) -> ValueType:
+    """Type of `left op right`, UNKNOWN unless the operation is known to succeed."""
+    if left in NUMERIC_TYPES and right in NUMERIC_TYPES:
+        if op == Operator.DIVIDE:
+            return ValueType.FLOAT
+        return ValueType.INT if left == right == ValueType.INT else ValueType.FLOAT
+    if op == Operator.PLUS and left == right and left in (ValueType.STR, ValueType.ARRAY):
+        return left
+    if op == Operator.MULTIPLY and {left, right} == {ValueType.STR, ValueType.INT}:
+        return ValueType.STR
+    return ValueType.UNKNOWN
+
+
+def comparison_is_typed(operator: Comparison, left: ValueType, right: ValueType) -> bool:
+    if ValueType.UNKNOWN in (left, right):
+        return False
+    if operator in (Comparison.EQ, Comparison.NEQ):
+        return True
+    return (left in NUMERIC_TYPES and right in NUMERIC_TYPES) or left == right == ValueType.STR
+
+
+def merge(first: TypeEnvironment, second: TypeEnvironment) -> TypeEnvironment:
+    """Types holding on both paths; variables bound on only one are dropped."""
+    return {
+        name: value_type if second[name] == value_type else ValueType.UNKNOWN
+        for name, value_type in first.items()
+        if name in second
+    }
+
+
+@dataclass
+class SpecializationReport:
+    """How many operations of each node kind were found and specialized."""
+    operations: Dict[str, int] = field(default_factory=dict)
+    specialized: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def fraction(self) -> float:
+        total = sum(self.operations.values())
+        return sum(self.specialized.values()) / total if total else 0.0
+
+    def __str__(self) -> str:
+        kinds = ", ".join(
+            f"{kind} {self.specialized.get(kind, 0)}/{count}"
+            for kind, count in sorted(self.operations.items())
+        )
+        return f"Specialized {self.fraction:.1%} of operations ({kinds or 'none'})"
+
+
+class TypeInference:
+    """
+    Flow-sensitive type inference over a program.
+
+    Statements are walked in order with an environment of variable types.
+    Branches are analyzed separately and merged, loops are iterated to a fixed
+    point, and function bodies are analyzed once with parameters of unknown type,
+    since calls only see their own parameters. The operand types seen by every
+    operation are joined over all visits, so an operation is only specialized
+    when its types hold on every path through the program.
+    """
+
+    def __init__(self) -> None:
+        # Operation node id -> (node, joined operand types).
+        self.operand_types: Dict[int, Tuple[Node, List[ValueType]]] = {}
+        self.loop_exits: Dict[Tuple[int, FrozenSet], TypeEnvironment] = {}
+        self.analyzed_functions: Set[int] = set()
+
+    def analyze(self, program: Program) -> None:
+        self.analyze_statements(program.statements, {})
+
+    def record(self, node: Node, *types: ValueType) -> None:
+        entry = self.operand_types.get(id(node))
+        if entry is None:
+            self.operand_types[id(node)] = (node, list(types))
+            return
+        seen = entry[1]
+        for index, value_type in enumerate(types):
+            if seen[index] != value_type:
+                seen[index] = ValueType.UNKNOWN
+
+    def analyze_statements(self, statements: List[Node], env: TypeEnvironment) -> TypeEnvironment:
+        for statement in statements:
+            env = self.analyze_statement(statement, env)
+        return env
+
+    def analyze_statement(self, node: Node, env: TypeEnvironment) -> TypeEnvironment:
+        if isinstance(node, Assignment):
+            value_type = self.infer(node.variable_value, env)
+            env[cast(Variable, node.variable_name).name] = value_type
+        elif isinstance(node, CompoundAssignment):
+            name = cast(Variable, node.variable_name).name
+            value_type = self.infer(node.variable_value, env)
+            if name in env:
+                env[name] = binary_result_type(
+                    COMPOUND_OPERATORS[cast(CompoundOperator, node.op_token.type)],
+                    env[name],
+                    value_type,
+                )
+        elif isinstance(node, ArrayIndexAssignment):
+            array_type = self.infer(node.array, env)
+            index_type = self.infer(node.index, env)
+            self.infer(node.value, env)
+            self.record(node, array_type, index_type)
+        elif isinstance(node, If):
+            return self.analyze_if(node, env)
+        elif isinstance(node, WhileLoop):
+            return self.analyze_while(node, env)
+        elif isinstance(node, (ForRange, ForEach)):
+            return self.analyze_for(node, env)
+        elif isinstance(node, FunctionDecleration):
+            self.analyze_function(node)
+            env[node.name.value] = ValueType.UNKNOWN
+        elif isinstance(node, Print):
+            for expression in node.expressions:
+                self.infer(expression, env)
+        elif isinstance(node, Return):
+            self.infer(node.expression, env)
+        elif isinstance(node, Block):
+            return self.analyze_statements(node.statements, env)
+        else:
+            self.infer(node, env)
+        return env
+
+    def analyze_if(self, node: If, env: TypeEnvironment) -> TypeEnvironment:
+        exits: List[TypeEnvironment] = []
+        branch: If | Block | None = node
+        while isinstance(branch, If):
+            self.infer(branch.condition, env)
+            exits.append(self.analyze_statements(branch.true_branch.statements, dict(env)))
+            branch = branch.false_branch
+        exits.append(
+            self.analyze_statements(branch.statements, dict(env)) if branch is not None else env
+        )
+
+        result = exits[0]
+        for exit_env in exits[1:]:
+            result = merge(result, exit_env)
+        return result
+
+    def analyze_while(self, node: WhileLoop, env: TypeEnvironment) -> TypeEnvironment:
+        key = (id(node), frozenset(env.items()))
+        cached = self.loop_exits.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        while True:
+            self.infer(node.condition, env)
+            body_exit = self.analyze_statements(node.body.statements, dict(env))
+            merged = merge(env, body_exit)
+            if merged == env:
+                break
+            env = merged
+
+        self.loop_exits[key] = dict(env)
+        return env
+
+    def analyze_for(self, node: ForRange | ForEach, env: TypeEnvironment) -> TypeEnvironment:
+        key = (id(node), frozenset(env.items()))
+        cached = self.loop_exits.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        if isinstance(node, ForRange):
+            for bound in (node.start, node.end, node.step):
+                if bound is not None:
+                    self.infer(bound, env)
+            # Range bounds are checked to be ints, so every value is an int.
+            variable_type = ValueType.INT
+        else:
+            self.infer(node.iterable, env)
+            variable_type = ValueType.UNKNOWN
+
+        while True:
+            body_env = dict(env)
+            body_env[node.variable.name] = variable_type
+            body_exit = self.analyze_statements(node.body.statements, body_env)
+            merged = merge(env, body_exit)
+            if merged == env:
+                break
+            env = merged
+
+        self.loop_exits[key] = dict(env)
+        return env
+
+    def analyze_function(self, node: FunctionDecleration) -> None:
+        if id(node) in self.analyzed_functions:
+            return
+        self.analyzed_functions.add(id(node))
+        self.analyze_statements(
+            node.body.statements,
+            {parameter.name: ValueType.UNKNOWN for parameter in node.parameters},
+        )
+
+    def infer(self, node: Node, env: TypeEnvironment) -> ValueType:
+        if isinstance(node, Number):
+            return ValueType.FLOAT if "." in node.value else ValueType.INT
+        if isinstance(node, String):
+            return ValueType.STR
+        if isinstance(node, Variable):
+            return env.get(node.name, ValueType.UNKNOWN)
+        if isinstance(node, BinaryOp):
+            left = self.infer(node.left, env)
+            right = self.infer(node.right, env)
+            self.record(node, left, right)
+            return binary_result_type(cast(Operator, node.op_token.type), left, right)
+        if isinstance(node, ComparisonOp):
+            left = self.infer(node.left, env)
+            right = self.infer(node.right, env)
+            self.record(node, left, right)
+            return ValueType.BOOL
+        if isinstance(node, UnaryOp):
+            operand = self.infer(node.operand, env)
+            return operand if operand in NUMERIC_TYPES else ValueType.UNKNOWN
+        if isinstance(node, ArrayLiteral):
+            for element in node.elements:
+                self.infer(element, env)
+            return ValueType.ARRAY
+        if isinstance(node, MapLiteral):
+            for child in node.keys + node.values:
+                self.infer(child, env)
+            return ValueType.MAP
+        if isinstance(node, ArrayIndex):
+            array_type = self.infer(node.array, env)
+            index_type = self.infer(node.index, env)
+            self.record(node, array_type, index_type)
+            return ValueType.UNKNOWN
+        if isinstance(node, ArraySlice):
+            for child in (node.array, node.start, node.end):
+                if child is not None:
+                    self.infer(child, env)
+            # Views index like arrays, so the typed index nodes handle them too.
+            return ValueType.ARRAY
+        if isinstance(node, FunctionCall):
+            for parameter in node.parameters:
+                self.infer(parameter, env)
+        return ValueType.UNKNOWN
+
+    def specialize(self) -> SpecializationReport:
+        """Switch every operation with proven operand types to its specialized class."""
+        report = SpecializationReport()
+        for node, (left, right) in self.operand_types.values():
+            kind = type(node).__name__
+            report.operations[kind] = report.operations.get(kind, 0) + 1
+            specialized = self.specialized_class(node, left, right)
+            if specialized is None:
+                continue
+            node.__class__ = specialized
+            if isinstance(node, TypedBinaryOp):
+                op = cast(Operator, node.op_token.type)
+                # Strings may be ropes at runtime, which `concatenate` keeps cheap.
+                string_plus = op == Operator.PLUS and left == ValueType.STR
+                node.operation = concatenate if string_plus else BINARY_OPERATIONS[op]
+            elif isinstance(node, TypedComparisonOp):
+                node.operation = COMPARISON_OPERATIONS[cast(Comparison, node.operator.type)]
+            report.specialized[kind] = report.specialized.get(kind, 0) + 1
+        return report
+
+    @staticmethod
+    def specialized_class(node: Node, left: ValueType, right: ValueType) -> Type[Node] | None:
+        if type(node) is BinaryOp:
+            node = cast(BinaryOp, node)
+            op = cast(Operator, node.op_token.type)
+            # Array concatenation stays generic so allocations are charged to limits.
+            if binary_result_type(op, left, right) not in (ValueType.UNKNOWN, ValueType.ARRAY):
+                return TypedBinaryOp
+            # Dividing by a non-zero literal needs no zero check whatever the dividend.
+            divides_by_constant = (
+                op in (Operator.DIVIDE, Operator.MODULO)
+                and isinstance(node.right, Number)
+                and float(node.right.value) != 0
+            )
+            return TypedBinaryOp if divides_by_constant else None
+        if type(node) is ComparisonOp:
+            node = cast(ComparisonOp, node)
+            typed = comparison_is_typed(cast(Comparison, node.operator.type), left, right)
+            return TypedComparisonOp if typed else None
+        if type(node) is ArrayIndex:
+            typed = left == ValueType.ARRAY and right == ValueType.INT
+            return TypedArrayIndex if typed else None
+        if type(node) is ArrayIndexAssignment:
+            # Unknown containers may be maps, whose new keys are charged to limits.
+            typed = left == ValueType.ARRAY and right == ValueType.INT
+            return TypedArrayIndexAssignment if typed else None
+        return None
+
+
+def specialize_program(program: Program) -> SpecializationReport:
+    """Infer types in `program` and specialize its provably typed operations in place."""
+    inference = TypeInference()
+    inference.analyze(program)
+    return inference.specialize()
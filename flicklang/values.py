@@ -0,0 +1,199 @@
+from typing import Any, Iterator, List, Optional
+
+from flicklang.exceptions import ExecutionError
+
+# Strings shorter than this are concatenated directly; copying them is cheap.
+ROPE_THRESHOLD = 256
+
+
+class Rope:
+    """
+    Lazily joined string used for repeated concatenation.
+
+    A rope is a prefix of a parts list that ropes derived from it share:
+    appending to the newest rope adds to the shared list in place and returns a
+    rope one part longer, so `s = s + piece` in a loop is amortized O(1) instead
+    of copying `s` every time. Appending to an older rope copies its prefix
+    first, which keeps every rope immutable. The text is joined only when it is
+    needed (printing, comparison, hashing) and cached, and a rope compares and
+    hashes like the equivalent `str`, so the language cannot tell them apart.
+    """
+
+    __slots__ = ("parts", "count", "length", "text")
+
+    def __init__(self, parts: List[str], count: int, length: int) -> None:
+        self.parts = parts
+        self.count = count
+        self.length = length
+        self.text: Optional[str] = None
+
+    @classmethod
+    def of(cls, text: str) -> "Rope":
+        return cls([text], 1, len(text))
+
+    def append(self, other: Any) -> Any:
+        if type(other) is Rope:
+            other = other.materialize()
+        elif type(other) is not str:
+            # Fail exactly like `str + other` would.
+            return self.materialize() + other
+
+        parts = self.parts
+        if len(parts) != self.count:
+            # A rope derived from the same parts already extended them.
+            parts = parts[: self.count]
+        parts.append(other)
+        return Rope(parts, len(parts), self.length + len(other))
+
+    def materialize(self) -> str:
+        if self.text is None:
+            parts = self.parts
+            self.text = "".join(parts if len(parts) == self.count else parts[: self.count])
+        return self.text
+
+    def __str__(self) -> str:
+        return self.materialize()
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __hash__(self) -> int:
+        return hash(self.materialize())
+
+    def __eq__(self, other: object) -> bool:
+        return self.materialize() == materialize(other)
+
+    def __ne__(self, other: object) -> bool:
+        return self.materialize() != materialize(other)
+
+    def __lt__(self, other: Any) -> bool:
+        return self.materialize() < materialize(other)
+
+    def __le__(self, other: Any) -> bool:
+        return self.materialize() <= materialize(other)
+
+    def __gt__(self, other: Any) -> bool:
+        return self.materialize() > materialize(other)
+
+    def __ge__(self, other: Any) -> bool:
+        return self.materialize() >= materialize(other)
+
+    def __add__(self, other: Any) -> Any:
+        return self.append(other)
+
+    def __radd__(self, other: Any) -> Any:
+        if type(other) is str:
+            return Rope.of(other).append(self.materialize())
+        return other + self.materialize()
+
+    def __mul__(self, other: Any) -> Any:
+        return self.materialize() * other
+
+    def __rmul__(self, other: Any) -> Any:
+        return other * self.materialize()
+
+    def __mod__(self, other: Any) -> Any:
+        return self.materialize() % other
+
+    def __rmod__(self, other: Any) -> Any:
+        return other % self.materialize()
+
+
+class ArrayView:
+    """
+    Window `start:start + length` onto a backing array, created by `a[lo:hi]`.
+
+    Slicing a view makes a view of the same backing array, so recursive
+    divide-and-conquer code never copies its input. Reads and writes go through
+    to the backing array. Arrays never change length in place, so a view stays
+    valid for its whole lifetime. A view prints, compares and concatenates like
+    the array it shows; `copy` turns it into an independent array.
+    """
+
+    __slots__ = ("backing", "start", "length")
+
+    def __init__(self, backing: List[Any], start: int, length: int) -> None:
+        self.backing = backing
+        self.start = start
+        self.length = length
+
+    def slice(self, low: int, high: int) -> "ArrayView":
+        return ArrayView(self.backing, self.start + low, high - low)
+
+    def materialize(self) -> List[Any]:
+        return self.backing[self.start : self.start + self.length]
+
+    def position(self, index: int) -> int:
+        """Index into the backing array of element `index`, as list indexing counts."""
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        return self.start + index
+
+    def __getitem__(self, index: int) -> Any:
+        return self.backing[self.position(index)]
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        self.backing[self.position(index)] = value
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[Any]:
+        backing = self.backing
+        for index in range(self.start, self.start + self.length):
+            yield backing[index]
+
+    def __str__(self) -> str:
+        return str(self.materialize())
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+    # Views are mutable like arrays, so they are not hashable either.
+    __hash__ = None  # type: ignore[assignment]
+
+    def __eq__(self, other: object) -> bool:
+        return self.materialize() == materialize(other)
+
+    def __ne__(self, other: object) -> bool:
+        return self.materialize() != materialize(other)
+
+    def __add__(self, other: Any) -> Any:
+        return self.materialize() + materialize(other)
+
+    def __radd__(self, other: Any) -> Any:
+        return other + self.materialize()
+
+    def __mul__(self, other: Any) -> Any:
+        return self.materialize() * other
+
+    def __rmul__(self, other: Any) -> Any:
+        return other * self.materialize()
+
+
+def materialize(value: Any) -> Any:
+    """The plain `str` for a rope, the array for a view, any other value unchanged."""
+    return value.materialize() if type(value) in (Rope, ArrayView) else value
+
+
+def concatenate(left: Any, right: Any) -> Any:
+    """`left + right`, switching to a `Rope` once the left string is long."""
+    if type(left) is Rope:
+        return left.append(right)
+    if type(left) is str and len(left) >= ROPE_THRESHOLD and type(right) in (str, Rope):
+        return Rope.of(left).append(right)
+    return left + right
+
+
+def map_key(value: Any) -> Any:
+    """`value` as a map key; only numbers and strings can be keys."""
+    if type(value) in (int, float, str):
+        return value
+    if type(value) is Rope:
+        return value.materialize()
+    raise ExecutionError(f"Map keys must be numbers or strings, got {type(value).__name__}.")
@@ -61,3 +61,36 @@ def test_integration_function_with_return() -> None:
     """
     expected_output = "28\n"
     run_flicklang_test(source_code, expected_output)
+
+
+def test_recursive_fibonacci() -> None:
+    source_code = """
+    fu fib(n) {
+        if n ls 2 {
+            ret n
+        }
+        ret fib(n - 1) + fib(n - 2)
+    }
+    p fib(15)
+    """
+    expected_output = "610\n"
+    run_flicklang_test(source_code, expected_output)
+
+
+def test_return_from_loop() -> None:
+    source_code = """
+    fu first_over(values, limit) {
+        i = 0
+        w i ls 5 {
+            if values[i] gr limit {
+                ret values[i]
+            }
+            i += 1
+        }
+        ret 0 - 1
+    }
+    p first_over([1, 4, 9, 16, 25], 5)
+    p first_over([1, 2, 3, 4, 5], 5)
+    """
+    expected_output = "9\n-1\n"
+    run_flicklang_test(source_code, expected_output)
@@ -12,3 +12,26 @@ def test_error_handling() -> None:
     with pytest.raises(ExecutionError) as exc_info:
         run_flicklang_test(source_code, "")
     assert "Division by zero" in str(exc_info.value)
+
+
+def test_return_outside_function() -> None:
+    source_code = """
+        if 1 eq 1 {
+            ret 5
+        }
+    """
+    with pytest.raises(ExecutionError) as exc_info:
+        run_flicklang_test(source_code, "")
+    assert "outside of a function" in str(exc_info.value)
+
+
+def test_while_condition_must_be_boolean() -> None:
+    source_code = """
+        i = 3
+        w i {
+            i -= 1
+        }
+    """
+    with pytest.raises(ExecutionError) as exc_info:
+        run_flicklang_test(source_code, "")
+    assert "must evaluate to a boolean" in str(exc_info.value)
@@ -0,0 +1,78 @@
+import pytest
+
+from flicklang.exceptions import ExecutionError, ResourceLimitExceeded
+from flicklang.limits import ExecutionLimits
+from flicklang.run_flicklang import run_flicklang_program
+from tests.utils import run_flicklang_test
+
+
+def test_counted_loops() -> None:
+    source_code = """
+        total = 0
+        f i 0 5 {
+            total += i
+        }
+        p total
+        f i 10 0 (-3) {
+            p i
+        }
+        f i 0 10 4 {
+            p i
+        }
+        f i 3 3 {
+            p 'never'
+        }
+    """
+    run_flicklang_test(source_code, "10\n10\n7\n4\n1\n0\n4\n8\n")
+
+
+def test_loops_over_elements() -> None:
+    source_code = """
+        squares = []
+        f x in [1, 2, 3] {
+            squares = squares + [x * x]
+        }
+        p squares
+        m = {'a': 1, 'b': 2}
+        f key in m {
+            m[key + key] = m[key] * 10
+        }
+        p m
+        f c in 'hi' + '!' {
+            p c
+        }
+    """
+    expected_output = "[1, 4, 9]\n{'a': 1, 'b': 2, 'aa': 10, 'bb': 20}\nh\ni\n!\n"
+    run_flicklang_test(source_code, expected_output)
+
+
+def test_f_and_in_remain_identifiers() -> None:
+    source_code = """
+        fu f(in) {
+            ret in * 2
+        }
+        f = f(4)
+        p f
+        fu sum_to(n) {
+            s = 0
+            f j 0 n + 1 {
+                s += j
+            }
+            ret s
+        }
+        p sum_to(10)
+    """
+    run_flicklang_test(source_code, "8\n55\n")
+
+
+def test_for_loop_errors() -> None:
+    with pytest.raises(ExecutionError, match="must be integers"):
+        run_flicklang_program("f i 0 1.5 { }")
+    with pytest.raises(ExecutionError, match="must not be zero"):
+        run_flicklang_program("f i 0 10 0 { }")
+    with pytest.raises(ExecutionError, match="Cannot iterate over int"):
+        run_flicklang_program("f x in 5 { }")
+    with pytest.raises(ResourceLimitExceeded):
+        run_flicklang_program(
+            "f i 0 1000 { x = i }", limits=ExecutionLimits(max_steps=100)
+        )
@@ -0,0 +1,54 @@
+import pytest
+
+from flicklang.exceptions import ExecutionError
+from flicklang.limits import ExecutionLimits
+from flicklang.run_flicklang import run_flicklang_program
+from tests.utils import run_flicklang_test
+
+
+def test_map_operations() -> None:
+    source_code = """
+        m = {'a': 1, 2: 'two', 'x' + 'y': [1, 2]}
+        m['b'] = m['a'] + 1
+        m[2] = 'deux'
+        pair = m['xy']
+        p m['b'], m[2], pair[1]
+        p len(m), has(m, 'xy'), has(m, 'z')
+        p keys(m), values(m)
+    """
+    expected_output = (
+        "2 deux 2\n"
+        "4 True False\n"
+        "['a', 2, 'xy', 'b'] [1, 'deux', [1, 2], 2]\n"
+    )
+    run_flicklang_test(source_code, expected_output)
+
+
+def test_count_words() -> None:
+    source_code = """
+        words = ['a', 'b', 'a', 'c', 'a', 'b']
+        counts = {}
+        i = 0
+        w i ls len(words) {
+            if has(counts, words[i]) {
+                counts[words[i]] = counts[words[i]] + 1
+            } el {
+                counts[words[i]] = 1
+            }
+            i += 1
+        }
+        p counts
+    """
+    run_flicklang_test(source_code, "{'a': 3, 'b': 2, 'c': 1}\n")
+
+
+def test_map_errors() -> None:
+    with pytest.raises(ExecutionError, match="Key not found: 'missing'"):
+        run_flicklang_program("m = {'a': 1}\np m['missing']")
+    with pytest.raises(ExecutionError, match="Map keys must be numbers or strings"):
+        run_flicklang_program("m = {[1]: 2}")
+    with pytest.raises(ExecutionError, match="Allocation limit"):
+        run_flicklang_program(
+            "m = {}\ni = 0\nw i ls 100 {\n m[i] = i\n i += 1\n}",
+            limits=ExecutionLimits(max_allocated_elements=50),
+        )
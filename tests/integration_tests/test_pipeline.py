@@ -0,0 +1,20 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+def test_script_as_pipeline_filter(tmp_path: Path) -> None:
+    script = tmp_path / "filter.fl"
+    script.write_text("n = 0\nf line in lines() {\n    n += 1\n    p n, line\n}\n")
+
+    completed = subprocess.run(
+        [sys.executable, "-m", "flicklang.run_flicklang", str(script)],
+        input="alpha\nbeta\n",
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Only the script's own output goes to stdout.
+    assert completed.stdout == "1 alpha\n2 beta\n"
+    assert "Running FlickLang interpreter" in completed.stderr
@@ -0,0 +1,55 @@
+import io
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from flicklang.client import submit
+
+
+@pytest.fixture
+def server_socket(tmp_path: Path) -> Iterator[str]:
+    socket_path = str(tmp_path / "flicklang.sock")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "flicklang.server", "--socket", socket_path,
+         "--workers", "2", "--max-requests", "2"],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    deadline = time.monotonic() + 10
+    while not os.path.exists(socket_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield socket_path
+
+    server.send_signal(signal.SIGTERM)
+    _, errors = server.communicate(timeout=10)
+    assert "requests: p50" in errors
+    assert not os.path.exists(socket_path)
+
+
+def test_runs_scripts_on_recycled_workers(server_socket: str, tmp_path: Path) -> None:
+    script = tmp_path / "script.fl"
+    script.write_text("a = [1, 2, 3]\np a[1] * 10\n")
+
+    # More runs than the pool can serve before its workers are replaced.
+    for _ in range(6):
+        output = io.StringIO()
+        status = submit({"path": str(script)}, server_socket, output)
+        assert status == {"status": "ok"}
+        assert output.getvalue() == "20\n"
+
+
+def test_reports_errors(server_socket: str) -> None:
+    output = io.StringIO()
+    status = submit({"source": "p 'before'\np 1 / 0"}, server_socket, output)
+    assert output.getvalue() == "before\n"
+    assert status["status"] == "error"
+    assert "Division by zero" in status["error"]
+
+    status = submit({"path": "/nonexistent/script.fl"}, server_socket, output)
+    assert status["error"] == "Error: The file '/nonexistent/script.fl' was not found."
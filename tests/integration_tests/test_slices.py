@@ -0,0 +1,90 @@
+import pytest
+
+from flicklang.exceptions import ExecutionError
+from flicklang.limits import ExecutionLimits
+from flicklang.run_flicklang import run_flicklang_program
+from tests.utils import run_flicklang_test
+
+
+def test_slices_are_views() -> None:
+    source_code = """
+        a = [1, 2, 3, 4, 5]
+        middle = a[1:4]
+        tail = middle[1:]
+        tail[0] = 30
+        p a, middle, len(tail), tail[-1]
+        detached = copy(middle)
+        detached[0] = 0
+        p a, detached, middle + [6]
+        f x in a[:2] {
+            p x
+        }
+    """
+    expected_output = (
+        "[1, 2, 30, 4, 5] [2, 30, 4] 2 4\n"
+        "[1, 2, 30, 4, 5] [0, 30, 4] [2, 30, 4, 6]\n"
+        "1\n2\n"
+    )
+    run_flicklang_test(source_code, expected_output)
+
+
+def test_merge_sort_on_views() -> None:
+    source_code = """
+        fu merge_sort(a, scratch) {
+            n = len(a)
+            if n ls 2 { ret 0 }
+            mid = int(n / 2)
+            merge_sort(scratch[:mid], a[:mid])
+            merge_sort(scratch[mid:], a[mid:])
+            left = scratch[:mid]
+            right = scratch[mid:]
+            i = 0
+            j = 0
+            f k 0 n {
+                if j eq len(right) {
+                    a[k] = left[i]
+                    i += 1
+                } eli i eq mid {
+                    a[k] = right[j]
+                    j += 1
+                } eli left[i] lse right[j] {
+                    a[k] = left[i]
+                    i += 1
+                } el {
+                    a[k] = right[j]
+                    j += 1
+                }
+            }
+            ret 0
+        }
+        a = [5, 3, 9, 1, 7, 2, 8, 3]
+        merge_sort(a, copy(a))
+        p a
+    """
+    run_flicklang_test(source_code, "[1, 2, 3, 3, 5, 7, 8, 9]\n")
+
+
+def test_slice_errors() -> None:
+    with pytest.raises(ExecutionError, match="Slice bounds out of range: 2:5"):
+        run_flicklang_program("a = [1, 2, 3]\nb = a[2:5]")
+    with pytest.raises(ExecutionError, match="Only arrays can be sliced"):
+        run_flicklang_program("m = {}\nb = m[0:1]")
+    with pytest.raises(ExecutionError, match="Array index out of bounds: 2"):
+        run_flicklang_program("a = [1, 2, 3]\nb = a[:2]\nb[2] = 0")
+    # A view allocates no elements; only the explicit copy does.
+    run_flicklang_program(
+        "a = [0] * 40\nf i 0 100 { b = a[1:39] }",
+        limits=ExecutionLimits(max_allocated_elements=50),
+    )
+    with pytest.raises(ExecutionError, match="Allocation limit"):
+        run_flicklang_program(
+            "a = [0] * 40\nb = copy(a[1:39])",
+            limits=ExecutionLimits(max_allocated_elements=50),
+        )
+
+
+@pytest.mark.parametrize("target", ["a", "a[1:]"], ids=["list", "view"])
+def test_optimized_out_of_bounds_assignment(target: str) -> None:
+    source_code = f"a = [1, 2, 3]\nb = {target}\nb[5] = 3"
+    with pytest.raises(ExecutionError, match="Array index out of bounds: 5"):
+        run_flicklang_program(source_code, optimize=True)
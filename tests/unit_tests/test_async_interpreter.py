@@ -0,0 +1,89 @@
+import asyncio
+import io
+from contextlib import redirect_stdout
+from typing import List
+
+import pytest
+
+from flicklang.async_interpreter import AsyncInterpreter, run_program
+from flicklang.exceptions import ExecutionError, ResourceLimitExceeded
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.limits import ExecutionLimits
+from flicklang.parser import Parser
+
+
+def parse(source_code: str):
+    return Parser(Lexer(source_code).tokenize()).parse()
+
+
+def test_output_matches_synchronous_interpreter() -> None:
+    source_code = """
+        fu fib(n) {
+            if n lse 1 { ret n }
+            ret fib(n - 1) + fib(n - 2)
+        }
+        fu show(label, value) { p label, value }
+        i = 0
+        w i ls 8 {
+            show('fib', fib(i) * 2 - fib(i))
+            i += 1
+        }
+        a = [fib(5), 2 + fib(3)]
+        a[fib(1)] = -fib(4)
+        p a
+    """
+    expected = io.StringIO()
+    with redirect_stdout(expected):
+        Interpreter().interpret(parse(source_code))
+
+    lines: List[str] = []
+
+    async def sink(line: str) -> None:
+        lines.append(line)
+
+    asyncio.run(run_program(parse(source_code), sink))
+    assert "".join(line + "\n" for line in lines) == expected.getvalue()
+
+
+def test_programs_interleave_on_one_loop() -> None:
+    lines: List[str] = []
+
+    async def sink(line: str) -> None:
+        lines.append(line)
+
+    async def main() -> None:
+        programs = [parse(f"i = 0\nw i ls 3 {{\n p '{name}'\n i += 1\n}}") for name in "ab"]
+        await asyncio.gather(*(run_program(program, sink, yield_interval=1) for program in programs))
+
+    asyncio.run(main())
+    assert lines == ["a", "b", "a", "b", "a", "b"]
+
+
+def test_cancel_one_task() -> None:
+    lines: List[str] = []
+
+    async def sink(line: str) -> None:
+        lines.append(line)
+
+    async def main() -> None:
+        endless = asyncio.create_task(run_program(parse("w 1 eq 1 { }"), sink))
+        finite = asyncio.create_task(run_program(parse("p 'done'"), sink))
+        await finite
+        endless.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await endless
+
+    asyncio.run(main())
+    assert lines == ["done"]
+
+
+def test_limits_and_errors() -> None:
+    with pytest.raises(ResourceLimitExceeded):
+        asyncio.run(run_program(parse("w 1 eq 1 { }"), limits=ExecutionLimits(max_steps=500)))
+
+    interpreter = AsyncInterpreter()
+    with pytest.raises(ExecutionError, match="Division by zero"):
+        asyncio.run(interpreter.interpret_async(parse("fu f(x) { ret 1 / x }\np f(0)")))
+    # The failed call does not leak its frame into the caller.
+    assert "x" not in interpreter.environment
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pytest
+
+from flicklang import fileio
+from flicklang.exceptions import ExecutionError
+from flicklang.run_flicklang import run_flicklang_program
+from tests.utils import run_flicklang_test
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_read_numbers_and_lines(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mapped: bool
+) -> None:
+    if mapped:
+        # Map every file and cut it into many chunks.
+        monkeypatch.setattr(fileio, "MMAP_THRESHOLD", 1)
+        monkeypatch.setattr(fileio, "CHUNK_SIZE", 8)
+    numbers = tmp_path / "numbers.txt"
+    numbers.write_text("1 22 333\n-4 5.5\n\n1e3\t7\n12345678901234567890")
+    lines = tmp_path / "lines.txt"
+    lines.write_text("first line\nsécond\r\n\nlast without newline")
+
+    assert fileio.read_numbers(str(numbers)) == [
+        1, 22, 333, -4, 5.5, 1000.0, 7, 12345678901234567890
+    ]
+    assert fileio.read_lines(str(lines)) == [
+        "first line", "sécond", "", "last without newline"
+    ]
+
+    separators = tmp_path / "separators.txt"
+    separators.write_bytes("page\x0cbreak\nnext\u2028line\x85\r\n".encode())
+    assert fileio.read_lines(str(separators)) == ["page\x0cbreak", "next\u2028line\x85"]
+
+
+def test_write_and_read_back(tmp_path: Path) -> None:
+    source_code = f"""
+        a = [3, 1.5, -2]
+        p write_numbers('{tmp_path / "numbers.txt"}', a)
+        p write_lines('{tmp_path / "lines.txt"}', ['x', 1, a[:2]])
+        p read_numbers('{tmp_path / "numbers.txt"}'), read_lines('{tmp_path / "lines.txt"}')
+    """
+    run_flicklang_test(source_code, "3\n3\n[3, 1.5, -2] ['x', '1', '[3, 1.5]']\n")
+    assert (tmp_path / "numbers.txt").read_text() == "3\n1.5\n-2\n"
+
+
+def test_file_errors(tmp_path: Path) -> None:
+    (tmp_path / "words.txt").write_text("1 two 3")
+    with pytest.raises(ExecutionError, match="'two' is not a number"):
+        run_flicklang_program(f"a = read_numbers('{tmp_path / 'words.txt'}')")
+    with pytest.raises(ExecutionError, match="cannot read .*No such file"):
+        run_flicklang_program(f"a = read_lines('{tmp_path / 'missing.txt'}')")
+    with pytest.raises(ExecutionError, match="expects an array of numbers, found str"):
+        run_flicklang_program(f"write_numbers('{tmp_path / 'out.txt'}', ['a'])")
@@ -0,0 +1,32 @@
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from benchmarks.generator import ProgramShape, generate_program
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+
+
+def test_same_seed_gives_same_program() -> None:
+    shape = ProgramShape(statements=50, seed=7)
+    assert generate_program(shape) == generate_program(ProgramShape(statements=50, seed=7))
+    assert generate_program(shape) != generate_program(ProgramShape(statements=50, seed=8))
+
+
+@pytest.mark.parametrize(
+    "shape",
+    [
+        ProgramShape(seed=1),
+        ProgramShape(statements=40, nesting_depth=6, nested_fraction=0.5, seed=2),
+        ProgramShape(statements=20, parenthesis_depth=3, string_appends=10, seed=3),
+        ProgramShape(statements=30, functions=0, nesting_depth=0, seed=4),
+    ],
+)
+def test_generated_programs_parse_and_run(shape: ProgramShape) -> None:
+    program = Parser(Lexer(generate_program(shape)).tokenize()).parse()
+    output = io.StringIO()
+    with redirect_stdout(output):
+        Interpreter().interpret(program)
+    assert output.getvalue().count("\n") == 1
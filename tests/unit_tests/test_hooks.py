@@ -0,0 +1,124 @@
+import io
+from contextlib import redirect_stdout
+from typing import Any, List, Tuple
+
+import pytest
+
+from flicklang.ast import Assignment, Print, Return
+from flicklang.exceptions import ExecutionError
+from flicklang.hooks import Event
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+
+
+def run(interpreter: Interpreter, source_code: str) -> str:
+    program = Parser(Lexer(source_code).tokenize()).parse()
+    with redirect_stdout(io.StringIO()) as output:
+        interpreter.interpret(program)
+    return output.getvalue()
+
+
+def record(interpreter: Interpreter, *events: Event) -> List[Tuple[Event, Any]]:
+    seen: List[Tuple[Event, Any]] = []
+    for event in events:
+        interpreter.add_hook(event, lambda *arguments, event=event: seen.append((event, arguments)))
+    return seen
+
+
+def test_statement_call_and_return_events() -> None:
+    interpreter = Interpreter()
+    seen = record(interpreter, Event.STATEMENT, Event.CALL, Event.RETURN)
+    output = run(
+        interpreter,
+        """
+        fu double(n) {
+            ret n * 2
+        }
+        x = double(4)
+        p x
+        """,
+    )
+
+    assert output == "8\n"
+    kinds = [(event, type(arguments[0]).__name__) for event, arguments in seen]
+    assert kinds == [
+        (Event.STATEMENT, "FunctionDecleration"),
+        (Event.STATEMENT, "Assignment"),
+        (Event.CALL, "FunctionDecleration"),
+        (Event.STATEMENT, "Return"),
+        (Event.RETURN, "FunctionDecleration"),
+        (Event.STATEMENT, "Print"),
+    ]
+    call = seen[2][1]
+    assert call[0].name.value == "double" and call[1] == [4]
+    assert seen[4][1][1] == 8
+    assert isinstance(seen[3][1][0], Return)
+    assert isinstance(seen[5][1][0], Print)
+
+
+def test_loop_iteration_events() -> None:
+    interpreter = Interpreter()
+    seen = record(interpreter, Event.LOOP_ITERATION)
+    run(
+        interpreter,
+        """
+        i = 0
+        w i ls 3 {
+            i += 1
+        }
+        f j 0 2 {
+            p j
+        }
+        f c in 'ab' {
+            p c
+        }
+        """,
+    )
+
+    names = [type(arguments[0]).__name__ for _, arguments in seen]
+    assert names == ["WhileLoop"] * 3 + ["ForRange"] * 2 + ["ForEach"] * 2
+
+
+def test_error_is_reported_once_for_innermost_statement() -> None:
+    interpreter = Interpreter()
+    seen = record(interpreter, Event.ERROR)
+    with pytest.raises(ExecutionError):
+        run(
+            interpreter,
+            """
+            fu fail() {
+                x = 1 / 0
+            }
+            i = 0
+            w i ls 1 {
+                fail()
+            }
+            """,
+        )
+
+    assert len(seen) == 1
+    statement, error = seen[0][1]
+    assert isinstance(statement, Assignment)
+    assert isinstance(error, ExecutionError)
+
+
+def test_removing_hooks_restores_class_methods() -> None:
+    interpreter = Interpreter()
+    seen = record(interpreter, *Event)
+    callbacks = [callback for callbacks in interpreter.hooks.callbacks.values() for callback in callbacks]
+    for event, callback in zip(Event, callbacks):
+        interpreter.remove_hook(event, callback)
+
+    assert not interpreter.hooks
+    for name in ("interpret", "visit_Block", "call_function", "visit_WhileLoop", "run_loop"):
+        assert getattr(interpreter, name).__func__ is getattr(Interpreter, name)
+    assert run(interpreter, "f i 0 2 {\n p i\n}") == "0\n1\n"
+    assert seen == []
+
+
+def test_interpreter_without_hooks_binds_nothing() -> None:
+    interpreter = Interpreter()
+    assert run(interpreter, "f i 0 2 {\n p i\n}") == "0\n1\n"
+    for name in ("interpret", "visit_Block", "call_function", "visit_WhileLoop", "run_loop"):
+        assert name not in vars(interpreter)
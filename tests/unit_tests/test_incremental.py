@@ -0,0 +1,152 @@
+import random
+from typing import List, Tuple
+
+import pytest
+
+from flicklang.ast import Node, iter_child_nodes
+from flicklang.exceptions import FlickLangError
+from flicklang.incremental import IncrementalParser
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+
+SOURCE = """.. Sum helpers
+fu add(a, b)
+{
+    ret a + b
+}
+
+fu sum_to(n)
+{
+    total = 0
+    i = 0
+    w i ls n
+    {
+        if i % 2 eq 0
+        {
+            total += i
+        }
+        eli i % 3 eq 0
+        {
+            total -= 1
+        }
+        el
+        {
+            total = add(total, 1)
+        }
+        i += 1
+    }
+    ret total
+}
+
+values = [1, 2, 3]
+values[1] = add(values[0], 10)
+p 'sum', sum_to(10), values[1]
+"""
+
+
+def positions(node: Node) -> List[Tuple[str, int, int]]:
+    result = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        result.append((type(current).__name__, current.line, current.column))
+        stack.extend(iter_child_nodes(current))
+    return result
+
+
+def assert_matches_full_parse(document: IncrementalParser) -> None:
+    tokens = Lexer(document.source).tokenize()
+    program = Parser(tokens).parse()
+    assert document.tokens == tokens
+    assert [(t.line, t.column, t.offset, t.end) for t in document.tokens] == [
+        (t.line, t.column, t.offset, t.end) for t in tokens
+    ]
+    assert document.program == program
+    assert positions(document.program) == positions(program)
+
+
+def edit_at(document: IncrementalParser, anchor: str, deleted: int, inserted: str) -> None:
+    document.edit(document.source.index(anchor), deleted, inserted)
+
+
+def test_edit_inside_function_reuses_other_statements() -> None:
+    document = IncrementalParser(SOURCE)
+    add_function = document.program.statements[0]
+    last_statement = document.program.statements[-1]
+
+    edit_at(document, "total -= 1", len("total -= 1"), "total -= 2\n            total += 5")
+
+    assert_matches_full_parse(document)
+    assert document.program.statements[0] is add_function
+    assert document.program.statements[-1] is last_statement
+    assert document.reparsed_statements == 2
+
+
+def test_edit_renaming_identifier() -> None:
+    document = IncrementalParser(SOURCE)
+    edit_at(document, "values = [1", len("values"), "numbers")
+    edit_at(document, "values[1] =", len("values"), "numbers")
+    assert_matches_full_parse(document)
+
+
+def test_insert_and_delete_statements() -> None:
+    document = IncrementalParser(SOURCE)
+    function = document.program.statements[1]
+
+    edit_at(document, "values = [1", 0, "x = 5\ny = x * 2\n")
+    assert_matches_full_parse(document)
+    assert document.program.statements[1] is function
+
+    edit_at(document, "x = 5\n", len("x = 5\n"), "")
+    assert_matches_full_parse(document)
+
+
+def test_edit_changing_block_structure() -> None:
+    document = IncrementalParser(SOURCE)
+    edit_at(document, "        el\n", len("        el\n        {\n            total = add(total, 1)\n        }\n"), "")
+    assert_matches_full_parse(document)
+    edit_at(document, "    ret total", 0, "    }\n    w 1 ls 0 {\n")
+    assert_matches_full_parse(document)
+
+
+def test_whitespace_and_comment_edits() -> None:
+    document = IncrementalParser(SOURCE)
+    edit_at(document, "fu sum_to", 0, "\n\n.. comment\n")
+    assert_matches_full_parse(document)
+    edit_at(document, "ret a + b", 0, "   ")
+    assert_matches_full_parse(document)
+
+
+def test_invalid_edit_then_recovery() -> None:
+    document = IncrementalParser(SOURCE)
+    with pytest.raises(FlickLangError):
+        edit_at(document, "ret a + b", 0, "+ ")
+    assert not document.valid
+    edit_at(document, "+ ret a + b", 2, "")
+    assert document.valid
+    assert_matches_full_parse(document)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_edits_match_full_parse(seed: int) -> None:
+    rng = random.Random(seed)
+    fragments = ["1", "x", " ", "\n", "+ 2", "y = 3\n", "p x\n", "(", ")", "{", "}", "'s'", ".. c\n", "eq"]
+    document = IncrementalParser(SOURCE)
+    for _ in range(30):
+        offset = rng.randrange(len(document.source) + 1)
+        deleted = rng.randrange(min(4, len(document.source) - offset) + 1)
+        inserted = rng.choice(fragments) if rng.random() < 0.8 else ""
+        expected_source = document.source[:offset] + inserted + document.source[offset + deleted :]
+        try:
+            Parser(Lexer(expected_source).tokenize()).parse()
+            valid = True
+        except FlickLangError:
+            valid = False
+
+        if valid:
+            document.edit(offset, deleted, inserted)
+            assert_matches_full_parse(document)
+        else:
+            with pytest.raises(FlickLangError):
+                document.edit(offset, deleted, inserted)
+            document = IncrementalParser(SOURCE)
@@ -2,7 +2,10 @@ import pytest
 
 from flicklang.interpreter import Interpreter
 from flicklang.ast import CompoundAssignment, Number, BinaryOp, Assignment, Variable
+from flicklang.exceptions import ExecutionError
+from flicklang.lexer import Lexer
 from flicklang.models import CompoundOperator, Operator, Token
+from flicklang.parser import Parser
 
 
 def test_number() -> None:
@@ -41,3 +44,47 @@ def test_interpret_compound_assignments() -> None:
     assert (
         interpreter.environment["x"] == 15
     ), "Compound assignment failed to update environment correctly."
+
+
+def run(source_code: str) -> Interpreter:
+    interpreter = Interpreter()
+    interpreter.interpret(Parser(Lexer(source_code).tokenize()).parse())
+    return interpreter
+
+
+def test_functions_see_global_functions() -> None:
+    interpreter = run(
+        """fu double(x) { ret x * 2 }
+fu quadruple(x) { ret double(double(x)) }
+result = quadruple(3)"""
+    )
+    assert interpreter.environment["result"] == 12
+
+
+def test_functions_do_not_see_global_variables() -> None:
+    with pytest.raises(ExecutionError, match="Undefined variable"):
+        run("limit = 3\nfu add_limit(x) { ret x + limit }\nresult = add_limit(5)")
+
+
+def test_return_leaves_nested_blocks() -> None:
+    interpreter = run(
+        """fu first_even(values) {
+    f value in values {
+        if value % 2 eq 0 { ret value }
+    }
+    ret 0 - 1
+}
+result = first_even([3, 5, 8, 9])"""
+    )
+    assert interpreter.environment["result"] == 8
+    assert interpreter.call_depth == 0
+
+
+def test_calling_a_variable_that_is_not_a_function() -> None:
+    with pytest.raises(ExecutionError, match="x is not a function"):
+        run("x = 5\ny = x(1)")
+
+
+def test_return_outside_function() -> None:
+    with pytest.raises(ExecutionError, match="outside of a function"):
+        run("w 1 eq 1 { ret 5 }")
@@ -138,3 +138,10 @@ def test_function_lexing() -> None:
         EOFToken(Fundamental.EOF)
     ]
     assert tokens == expected, "Lexer failed to tokenize function declaration correctly."
+
+
+def test_token_positions() -> None:
+    lexer = Lexer("a = 1\n.. comment\n  p 'multi\nline' b")
+    tokens = lexer.tokenize()
+    positions = [(token.line, token.column) for token in tokens]
+    assert positions == [(1, 1), (1, 3), (1, 5), (3, 3), (3, 5), (4, 7), (4, 8)]
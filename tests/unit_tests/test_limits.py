@@ -0,0 +1,73 @@
+import pytest
+
+from flicklang.exceptions import ExecutionError, ResourceLimitExceeded
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.limits import ExecutionLimits
+from flicklang.parser import Parser
+
+
+def run(source_code: str, **limits) -> Interpreter:
+    interpreter = Interpreter(ExecutionLimits(**limits))
+    interpreter.interpret(Parser(Lexer(source_code).tokenize()).parse())
+    return interpreter
+
+
+def exceeded(source_code: str, **limits) -> str:
+    with pytest.raises(ResourceLimitExceeded) as error:
+        run(source_code, **limits)
+    assert isinstance(error.value, ExecutionError)
+    return error.value.limit
+
+
+def test_step_limit_counts_loop_iterations_and_calls() -> None:
+    source_code = """
+        fu f(x) { ret x }
+        i = 0
+        w i ls 10 {
+            i = f(i) + 1
+        }
+    """
+    assert run(source_code, max_steps=20).budget.steps == 20
+    assert exceeded(source_code, max_steps=19) == "max_steps"
+    assert exceeded("w 1 eq 1 { }", max_steps=5000) == "max_steps"
+
+
+def test_time_limit_stops_infinite_loop() -> None:
+    assert exceeded("w 1 eq 1 { }", max_time=0.05) == "max_time"
+
+
+def test_array_limits() -> None:
+    assert exceeded("a = [0] * 1001", max_array_length=1000) == "max_array_length"
+    assert exceeded("a = [1, 2, 3]", max_array_length=2) == "max_array_length"
+    source_code = """
+        a = [1, 2]
+        i = 0
+        w i ls 10 {
+            a += [i]
+            i += 1
+        }
+    """
+    assert exceeded(source_code, max_allocated_elements=50) == "max_allocated_elements"
+    # The literals (2 + 10 elements) and the growing copies (3 + 4 + ... + 12).
+    assert run(source_code, max_allocated_elements=100).budget.allocated_elements == 87
+
+
+def test_call_depth_limit() -> None:
+    source_code = """
+        fu down(n) {
+            if n eq 0 { ret 0 }
+            ret down(n - 1)
+        }
+        p down(10)
+    """
+    run(source_code, max_call_depth=11)
+    assert exceeded(source_code, max_call_depth=10) == "max_call_depth"
+
+
+def test_budget_is_per_run() -> None:
+    interpreter = Interpreter(ExecutionLimits(max_steps=10))
+    program = Parser(Lexer("i = 0\nw i ls 10 { i += 1 }").tokenize()).parse()
+    interpreter.interpret(program)
+    interpreter.interpret(program)
+    assert interpreter.budget is not None and interpreter.budget.steps == 10
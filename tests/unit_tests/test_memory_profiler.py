@@ -0,0 +1,82 @@
+import io
+import tracemalloc
+from contextlib import redirect_stdout
+
+from flicklang.lexer import Lexer
+from flicklang.memory_profiler import MemoryProfilingInterpreter
+from flicklang.parser import Parser
+
+SOURCE_CODE = """fu build(n) {
+    result = []
+    f i 0 n {
+        result = result + [i]
+    }
+    ret result
+}
+fu grid(n) {
+    rows = []
+    f i 0 n {
+        rows += [build(n)]
+    }
+    ret rows
+}
+g = grid(20)
+names = {'a': copy(g[0])}
+s = 'x' + 'y'
+p len(g)"""
+
+
+def run_profiled(source_code: str, **options: object) -> MemoryProfilingInterpreter:
+    program = Parser(Lexer(source_code).tokenize()).parse()
+    interpreter = MemoryProfilingInterpreter(**options)  # type: ignore[arg-type]
+    with redirect_stdout(io.StringIO()):
+        interpreter.interpret(program)
+    return interpreter
+
+
+def test_allocation_sites_and_functions() -> None:
+    interpreter = run_profiled(SOURCE_CODE)
+    memory = interpreter.memory
+    counts = {}
+    for site in memory.sites.values():
+        counts[site.line, site.kind] = counts.get((site.line, site.kind), 0) + site.count
+
+    # `result + [i]` allocates the literal and the concatenated array.
+    assert counts[4, "array"] == 2 * 20 * 20
+    assert counts[2, "array"] == 20
+    assert counts[16, "map"] == 1
+    # The array `copy` returns is attributed to the call, `g[0]` allocates nothing.
+    assert counts[16, "array"] == 1
+    assert counts[17, "string"] == 1
+    assert memory.top_sites(1)[0].line == 4
+
+    functions = memory.functions
+    assert functions["build"].allocations == 20 + 2 * 20 * 20
+    # A caller's peak includes its callees.
+    assert functions["grid"].peak >= functions["build"].peak > 0
+    assert memory.peak >= functions["grid"].peak
+    assert not tracemalloc.is_tracing()
+
+
+def test_report_lists_source() -> None:
+    interpreter = run_profiled(SOURCE_CODE)
+    report = interpreter.memory.report(SOURCE_CODE, top=3)
+
+    assert "result = result + [i]" in report
+    assert "build" in report and "<main>" in report
+
+
+def test_periodic_summary() -> None:
+    output = io.StringIO()
+    run_profiled(
+        """i = 0
+w i ls 5000 {
+    a = [i] * 10
+    i += 1
+}""",
+        summary_interval=0.001,
+        output=output,
+    )
+
+    lines = output.getvalue().splitlines()
+    assert lines and all(line.startswith("[memory]") for line in lines)
@@ -0,0 +1,117 @@
+import pytest
+
+from flicklang.ast import QuickenedBinaryOp
+from flicklang.exceptions import ExecutionError, ResourceLimitExceeded
+from flicklang.interpreter import Interpreter
+from flicklang.limits import ExecutionLimits
+from flicklang.parallel import MIN_PARALLEL_LENGTH, chunk_size, parallel_map
+from flicklang.quickening import QuickeningInterpreter
+from flicklang.run_flicklang import run_flicklang_program
+from tests.utils import run_flicklang_test
+
+SOURCE = """
+    fu twice(x) { ret x * 2 }
+    fu work(x) { ret twice(x) + 1 }
+    fu invert(x) { ret 1 / x }
+"""
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        list(range(MIN_PARALLEL_LENGTH * 2)),
+        [value / 2 for value in range(MIN_PARALLEL_LENGTH * 2)],
+        ["a", "b"] * MIN_PARALLEL_LENGTH,
+    ],
+    ids=["ints", "floats", "strings"],
+)
+def test_parallel_map_keeps_order(values: list) -> None:
+    interpreter = run_flicklang_program(SOURCE)
+    function = interpreter.environment["twice"]
+    assert parallel_map(interpreter, function, values, workers=2) == [
+        value * 2 for value in values
+    ]
+    interpreter.end_run()
+
+
+def test_errors_name_the_element() -> None:
+    interpreter = run_flicklang_program(SOURCE)
+    values = list(range(1, MIN_PARALLEL_LENGTH * 2))
+    values[300] = 0
+    with pytest.raises(ExecutionError, match="pmap\\(invert\\) failed on element 300"):
+        parallel_map(interpreter, interpreter.environment["invert"], values, workers=2)
+    interpreter.end_run()
+
+
+def test_pmap_builtin() -> None:
+    run_flicklang_test(SOURCE + "p pmap(work, [1, 2, 3])", "[3, 5, 7]\n")
+    with pytest.raises(ExecutionError, match="function of one argument"):
+        run_flicklang_program("fu add(a, b) { ret a + b }\np pmap(add, [1])")
+    # A declared function shadows the builtin.
+    run_flicklang_test("fu pmap(f, a) { ret 0 }\np pmap(1, 2)", "0\n")
+
+
+def test_chunk_size() -> None:
+    assert chunk_size(100, 4) == 32
+    assert chunk_size(100000, 4) == 6250
+
+
+def test_quickened_functions_run_in_workers() -> None:
+    interpreter = run_flicklang_program(
+        SOURCE + "i = 0\nw i ls 3 {\n p work(i)\n i += 1\n}", QuickeningInterpreter()
+    )
+    function = interpreter.environment["work"]
+    assert isinstance(function.body.statements[0].expression, QuickenedBinaryOp)
+
+    values = list(range(MIN_PARALLEL_LENGTH * 2))
+    assert parallel_map(interpreter, function, values, workers=4) == [
+        value * 2 + 1 for value in values
+    ]
+    assert isinstance(function.body.statements[0].expression, QuickenedBinaryOp)
+    interpreter.end_run()
+
+
+def test_one_pool_serves_a_whole_run(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("flicklang.parallel.os.cpu_count", lambda: 2)
+    interpreter = run_flicklang_program(SOURCE)
+    values = list(range(MIN_PARALLEL_LENGTH))
+    parallel_map(interpreter, interpreter.environment["twice"], values)
+    pool = interpreter.worker_pool
+    assert pool is not None
+    parallel_map(interpreter, interpreter.environment["work"], values)
+    assert interpreter.worker_pool is pool
+    interpreter.end_run()
+    assert interpreter.worker_pool is None
+
+    run_flicklang_test(
+        SOURCE
+        + f"""
+        a = [1] * {MIN_PARALLEL_LENGTH}
+        total = 0
+        f round 0 3 {{
+            f x in pmap(work, a) {{
+                total += x
+            }}
+        }}
+        p total
+        """,
+        f"{3 * 3 * MIN_PARALLEL_LENGTH}\n",
+    )
+
+
+def test_worker_steps_count_towards_the_run() -> None:
+    source_code = "fu spin(x) {\n f i 0 10 {\n x += 1\n }\n ret x\n}"
+    values = list(range(MIN_PARALLEL_LENGTH * 2))
+
+    interpreter = run_flicklang_program(source_code, Interpreter(ExecutionLimits(max_steps=10000)))
+    assert interpreter.budget is not None
+    steps = interpreter.budget.steps
+    parallel_map(interpreter, interpreter.environment["spin"], values, workers=2)
+    assert interpreter.budget.steps - steps == 11 * len(values)
+    interpreter.end_run()
+
+    # Every chunk fits in the quota, all of them together do not.
+    interpreter = run_flicklang_program(source_code, Interpreter(ExecutionLimits(max_steps=2000)))
+    with pytest.raises(ResourceLimitExceeded, match="Step limit of 2000"):
+        parallel_map(interpreter, interpreter.environment["spin"], values, workers=2)
+    interpreter.end_run()
@@ -1,5 +1,6 @@
 import pytest
 
+from flicklang.lexer import Lexer
 from flicklang.parser import Parser
 from flicklang.models import (
     Comparison,
@@ -12,15 +13,22 @@ from flicklang.models import (
     EOFToken,
 )
 from flicklang.ast import (
+    ArraySlice,
     Block,
     CompoundAssignment,
+    ForEach,
+    ForRange,
     FunctionDecleration,
     If,
+    MapLiteral,
     Program,
     Number,
     BinaryOp,
+    Print,
     Assignment,
     Return,
+    String,
+    UnaryOp,
     Variable,
     WhileLoop,
 )
@@ -237,3 +245,109 @@ def test_function_parsing() -> None:
     assert isinstance(
         result.statements[0].body.statements[0], Return
     ), "Failed to parse return statement."
+
+
+def test_node_positions() -> None:
+    tokens = Lexer("fu f(x)\n{\n    ret x\n}\nw 1 ls 2 {\n  y = f(1)\n}").tokenize()
+    result = Parser(tokens).parse()
+
+    function, loop = result.statements
+    assert isinstance(function, FunctionDecleration)
+    assert (function.line, function.column) == (1, 1)
+    assert (function.body.statements[0].line, function.body.statements[0].column) == (3, 5)
+    assert isinstance(loop, WhileLoop)
+    assert (loop.line, loop.column) == (5, 1)
+    assignment = loop.body.statements[0]
+    assert isinstance(assignment, Assignment)
+    assert (assignment.line, assignment.column) == (6, 3)
+    assert (assignment.variable_value.line, assignment.variable_value.column) == (6, 7)
+
+
+def test_operator_precedence_and_unary_minus() -> None:
+    tokens = Lexer("x = -(a - b) * --c + d % 2").tokenize()
+    expression = Parser(tokens).parse().statements[0].variable_value
+
+    assert isinstance(expression, BinaryOp) and expression.op_token.type == Operator.PLUS
+    product = expression.left
+    assert isinstance(product, BinaryOp) and product.op_token.type == Operator.MULTIPLY
+    assert isinstance(product.left, UnaryOp)
+    assert isinstance(product.left.operand, BinaryOp)
+    assert product.right == Variable("c")
+    assert (product.line, product.column) == (1, 5)
+    assert isinstance(expression.right, BinaryOp)
+    assert expression.right.op_token.type == Operator.MODULO
+
+
+def test_deeply_nested_parentheses() -> None:
+    depth = 5000
+    tokens = Lexer("x = " + "(" * depth + "1 + 2" + ")" * depth).tokenize()
+    result = Parser(tokens).parse()
+
+    assert result.statements[0].variable_value == BinaryOp(
+        Number("1"), Token(Operator.PLUS, "+"), Number("2")
+    )
+
+
+def test_long_eli_chain() -> None:
+    branches = 5000
+    source = "if a eq 0 { p 0 }\n" + "".join(
+        f"eli a eq {index} {{ p {index} }}\n" for index in range(1, branches)
+    )
+    result = Parser(Lexer(source + "el { p -1 }").tokenize()).parse()
+
+    node = result.statements[0]
+    for index in range(branches):
+        assert isinstance(node, If)
+        assert node.condition.right == Number(str(index))
+        assert node.line == index + 1
+        node = node.false_branch
+    assert isinstance(node, Block)
+
+
+def test_parse_map_literal() -> None:
+    tokens = Lexer("m = {'a': 1, 2: x + 1}\ne = {}").tokenize()
+    result = Parser(tokens).parse()
+
+    assignment, empty = result.statements
+    assert assignment == Assignment(
+        variable_name=Variable("m"),
+        variable_value=MapLiteral(
+            keys=[String("a"), Number("2")],
+            values=[
+                Number("1"),
+                BinaryOp(Variable("x"), Token(Operator.PLUS, "+"), Number("1")),
+            ],
+        ),
+    )
+    assert empty == Assignment(variable_name=Variable("e"), variable_value=MapLiteral([], []))
+
+
+def test_parse_for_loops() -> None:
+    tokens = Lexer("f i 0 n { p i }\nf i 10 0 (-2) { }\nf x in a { }\nf = 1").tokenize()
+    result = Parser(tokens).parse()
+
+    counted, stepped, each, assignment = result.statements
+    assert counted == ForRange(
+        Variable("i"), Number("0"), Variable("n"), None, Block([Print([Variable("i")])])
+    )
+    assert isinstance(stepped, ForRange)
+    assert stepped.end == Number("0")
+    assert stepped.step == UnaryOp(Token(Operator.MINUS, "-"), Number("2"))
+    assert each == ForEach(Variable("x"), Variable("a"), Block([]))
+    assert assignment == Assignment(variable_name=Variable("f"), variable_value=Number("1"))
+
+
+def test_parse_slices() -> None:
+    tokens = Lexer("p a[1:n - 1], a[:2], a[i:], a[:]").tokenize()
+    result = Parser(tokens).parse()
+
+    assert result.statements[0].expressions == [
+        ArraySlice(
+            Variable("a"),
+            Number("1"),
+            BinaryOp(Variable("n"), Token(Operator.MINUS, "-"), Number("1")),
+        ),
+        ArraySlice(Variable("a"), None, Number("2")),
+        ArraySlice(Variable("a"), Variable("i"), None),
+        ArraySlice(Variable("a"), None, None),
+    ]
@@ -0,0 +1,72 @@
+import io
+from contextlib import redirect_stdout
+
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+from flicklang.profiler import ProfilingInterpreter
+
+
+def run_profiled(source_code: str) -> ProfilingInterpreter:
+    program = Parser(Lexer(source_code).tokenize()).parse()
+    interpreter = ProfilingInterpreter()
+    with redirect_stdout(io.StringIO()):
+        interpreter.interpret(program)
+    return interpreter
+
+
+def test_function_call_counts() -> None:
+    interpreter = run_profiled(
+        """fu inner(x) { ret x + 1 }
+fu outer(x) { ret x * 2 }
+i = 0
+w i ls 5 {
+    p outer(inner(i))
+    i += 1
+}"""
+    )
+    functions = {stats.name: stats for stats in interpreter.profile.functions.values()}
+    assert functions["inner"].calls == 5
+    assert functions["outer"].calls == 5
+    assert functions["outer"].line == 2
+    assert functions["outer"].exclusive_time <= functions["outer"].inclusive_time
+
+
+def test_line_hits() -> None:
+    interpreter = run_profiled(
+        """i = 0
+w i ls 3 {
+    i += 1
+}
+p i"""
+    )
+    hits = {line: stats.hits for line, stats in interpreter.profile.lines.items()}
+    assert hits == {1: 1, 2: 1, 3: 3, 5: 1}
+
+
+def test_report_includes_source() -> None:
+    source_code = "fu f() { ret 1 }\np f()"
+    interpreter = run_profiled(source_code)
+    report = interpreter.profile.report(source_code)
+    assert "p f()" in report
+    assert "f " in report
+
+
+def test_recursive_line_time_within_total() -> None:
+    source_code = """fu fib(n) {
+    if n ls 2 { ret n }
+    ret fib(n - 1) + fib(n - 2)
+}
+p fib(12)"""
+    interpreter = run_profiled(source_code)
+    profile = interpreter.profile
+    assert profile.lines[3].hits > 1
+    for stats in profile.lines.values():
+        assert stats.time <= profile.total_time
+
+
+def test_printed_output_is_written() -> None:
+    program = Parser(Lexer("p 1\np 'two'").tokenize()).parse()
+    output = io.StringIO()
+    with redirect_stdout(output):
+        ProfilingInterpreter().interpret(program)
+    assert output.getvalue() == "1\ntwo\n"
@@ -0,0 +1,91 @@
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from flicklang.ast import BinaryOp, QuickenedBinaryOp, QuickenedComparisonOp, WhileLoop
+from flicklang.exceptions import ExecutionError
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+from flicklang.quickening import QuickeningInterpreter
+
+
+def run(source_code: str):
+    program = Parser(Lexer(source_code).tokenize()).parse()
+    interpreter = QuickeningInterpreter()
+    output = io.StringIO()
+    with redirect_stdout(output):
+        interpreter.interpret(program)
+    return program, interpreter, output.getvalue()
+
+
+def test_nodes_are_quickened_from_observed_types() -> None:
+    program, interpreter, output = run(
+        """
+        i = 0
+        total = 0
+        w i ls 5 {
+            total = total + i
+            i = i + 1
+        }
+        p total
+        """
+    )
+
+    loop = program.statements[2]
+    assert isinstance(loop, WhileLoop)
+    assert isinstance(loop.condition, QuickenedComparisonOp)
+    assert loop.condition.left_type is int
+    assert isinstance(loop.body.statements[0].variable_value, QuickenedBinaryOp)
+    assert interpreter.stats.specializations == {
+        "BinaryOp": 2,
+        "ComparisonOp": 1,
+        "Variable": 5,
+    }
+    assert interpreter.stats.deoptimizations == {}
+    assert output == "10\n"
+
+
+def test_failed_guard_deoptimizes_to_generic_node() -> None:
+    program, interpreter, output = run(
+        """
+        fu add(a, b) { ret a + b }
+        p add(1, 2)
+        p add(3, 4)
+        p add('a', 'b')
+        p add(5, 6)
+        """
+    )
+
+    addition = program.statements[0].body.statements[0].expression
+    assert type(addition) is BinaryOp
+    assert interpreter.stats.specializations["BinaryOp"] == 1
+    assert interpreter.stats.deoptimizations == {"BinaryOp": 1}
+    assert output == "3\n7\nab\n11\n"
+
+
+def test_generic_errors_after_deoptimization() -> None:
+    source_code = """
+        fu get(n) {
+            if n eq 1 { x = 5 }
+            ret x
+        }
+        p get(1)
+        p get(0)
+    """
+    with pytest.raises(ExecutionError, match="Undefined variable: x"):
+        run(source_code)
+
+    with pytest.raises(ExecutionError, match="Array index out of bounds: 3"):
+        run("a = [1, 2, 3]\ni = 0\nw i ls 4 {\n p a[i]\n i += 1\n}")
+
+
+def test_quickened_tree_equals_a_fresh_parse() -> None:
+    source_code = "i = 0\nw i ls 3 {\n i = i + 1\n}\np i"
+    program, interpreter, _ = run(source_code)
+    fresh = Parser(Lexer(source_code).tokenize()).parse()
+
+    assert interpreter.stats.specializations
+    assert program == fresh
+    assert fresh == program
+    assert program != Parser(Lexer(source_code.replace("3", "4")).tokenize()).parse()
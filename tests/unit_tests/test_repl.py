@@ -0,0 +1,57 @@
+import io
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import pytest
+
+from flicklang.exceptions import ExecutionError, ParsingError
+from flicklang.repl import ReplSession
+
+
+def feed_lines(session: ReplSession, *lines: str) -> str:
+    output = io.StringIO()
+    with redirect_stdout(output):
+        for line in lines:
+            session.feed(line)
+    return output.getvalue()
+
+
+def test_state_persists_between_inputs() -> None:
+    session = ReplSession()
+    output = feed_lines(session, "fu square(x) { ret x * x }", "a = 4", "p square(a)")
+    assert output == "16\n"
+    assert session.interpreter.environment["a"] == 4
+
+
+def test_multi_line_block() -> None:
+    session = ReplSession()
+    assert session.feed("i = 0")
+    assert not session.feed("w i ls 3")
+    assert not session.feed("{")
+    assert session.pending
+    output = feed_lines(session, "    p i", "    i += 1", "}")
+    assert output == "0\n1\n2\n"
+    assert not session.pending
+
+
+def test_errors_keep_session_usable() -> None:
+    session = ReplSession()
+    feed_lines(session, "a = 1")
+    with pytest.raises(ExecutionError):
+        session.feed("p b")
+    with pytest.raises(ParsingError):
+        session.feed("a = = 2")
+    assert not session.pending
+    assert feed_lines(session, "p a") == "1\n"
+
+
+def test_prelude_and_timing(tmp_path: Path) -> None:
+    prelude = tmp_path / "prelude.fl"
+    prelude.write_text("fu inc(x) { ret x + 1 }\nstart = 41\n")
+    session = ReplSession()
+    timing = session.load_prelude(str(prelude))
+    assert timing.total >= timing.execution >= 0
+
+    assert feed_lines(session, "p inc(start)") == "42\n"
+    assert session.last_timing is not None
+    assert session.last_timing.total > 0
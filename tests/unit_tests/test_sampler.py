@@ -0,0 +1,65 @@
+import io
+import subprocess
+import sys
+from collections import Counter
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import pytest
+
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+from flicklang.sampler import SamplingProfiler
+
+
+def test_samples_function_stack() -> None:
+    source_code = """fu work(n)
+{
+    i = 0
+    w i ls n
+    {
+        i += 1
+    }
+    ret i
+}
+p work(50000)"""
+    program = Parser(Lexer(source_code).tokenize()).parse()
+
+    with redirect_stdout(io.StringIO()):
+        with SamplingProfiler(interval=0.0005) as sampler:
+            Interpreter().interpret(program)
+
+    assert sampler.samples
+    stacks = list(sampler.samples)
+    assert all(stack[0] == "main" for stack in stacks)
+    assert any(stack[1] == "work:1" for stack in stacks)
+
+
+def test_collapsed_format() -> None:
+    sampler = SamplingProfiler()
+    sampler.samples = Counter(
+        {("main", "f:1", "line 2 (Assignment)"): 3, ("main", "line 5 (Print)"): 1}
+    )
+    output = io.StringIO()
+    sampler.write_collapsed(output)
+    assert output.getvalue() == (
+        "main;f:1;line 2 (Assignment) 3\n" "main;line 5 (Print) 1\n"
+    )
+
+
+def test_invalid_interval() -> None:
+    with pytest.raises(ValueError):
+        SamplingProfiler(interval=0)
+
+
+def test_cli_rejects_profile_with_sample(tmp_path: Path) -> None:
+    completed = subprocess.run(
+        [sys.executable, "-m", "flicklang.run_flicklang", "--profile", "--sample"]
+        + [str(tmp_path / "out.txt"), "-c", "p 1"],
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 2
+    assert "--profile and --sample cannot be combined" in completed.stderr
+    assert not (tmp_path / "out.txt").exists()
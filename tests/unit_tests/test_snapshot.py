@@ -0,0 +1,82 @@
+import io
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import pytest
+
+from flicklang.ast import QuickenedBinaryOp, iter_child_nodes
+from flicklang.exceptions import SnapshotError
+from flicklang.interpreter import Interpreter
+from flicklang.quickening import QuickeningInterpreter
+from flicklang.run_flicklang import run_flicklang_program
+from flicklang.snapshot import HEADER, SNAPSHOT_MAGIC, restore_snapshot, save_snapshot
+
+SETUP = """
+    table = [1, 2, 3]
+    alias = table
+    fu square(x) { ret x * x }
+    i = 0
+    w i ls 3 {
+        table[i] = square(table[i])
+        i += 1
+    }
+"""
+
+
+def test_restore_preserves_values_functions_and_sharing(tmp_path: Path) -> None:
+    path = str(tmp_path / "setup.snap")
+    # Quickened function bodies must still run on a plain interpreter.
+    save_snapshot(run_flicklang_program(SETUP, QuickeningInterpreter()), path)
+
+    interpreter = Interpreter()
+    restore_snapshot(interpreter, path)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        run_flicklang_program("alias[0] = 100\np table, square(i)", interpreter)
+    assert output.getvalue() == "[100, 4, 9] 9\n"
+    assert interpreter.environment["table"] is interpreter.environment["alias"]
+
+
+def has_quickened_nodes(node: object) -> bool:
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, QuickenedBinaryOp):
+            return True
+        stack.extend(iter_child_nodes(current))
+    return False
+
+
+def test_snapshot_leaves_live_nodes_quickened(tmp_path: Path) -> None:
+    path = str(tmp_path / "setup.snap")
+    interpreter = run_flicklang_program(SETUP + "\n    handlers = [square]", QuickeningInterpreter())
+    square = interpreter.environment["square"]
+    assert has_quickened_nodes(square)
+    save_snapshot(interpreter, path)
+    assert has_quickened_nodes(square)
+
+    restored = Interpreter()
+    restore_snapshot(restored, path)
+    handler = restored.environment["handlers"][0]
+    assert handler is restored.environment["square"]
+    assert not has_quickened_nodes(handler)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        run_flicklang_program("g = handlers[0]\np g(5)", restored)
+    assert output.getvalue() == "25\n"
+
+
+def test_rejects_foreign_and_outdated_files(tmp_path: Path) -> None:
+    path = tmp_path / "setup.snap"
+    path.write_bytes(b"not a snapshot")
+    with pytest.raises(SnapshotError, match="not a FlickLang snapshot"):
+        restore_snapshot(Interpreter(), str(path))
+
+    path.write_bytes(HEADER.pack(SNAPSHOT_MAGIC, 999) + b"payload")
+    with pytest.raises(SnapshotError, match="format version 999"):
+        restore_snapshot(Interpreter(), str(path))
+
+    save_snapshot(run_flicklang_program(SETUP), str(path))
+    path.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(SnapshotError, match="corrupt"):
+        restore_snapshot(Interpreter(), str(path))
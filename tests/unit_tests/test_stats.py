@@ -0,0 +1,79 @@
+import io
+import json
+from contextlib import redirect_stdout
+from typing import Any, Dict
+
+from flicklang.ast import Node
+from flicklang.interpreter import Interpreter
+from flicklang.run_flicklang import run_flicklang_program
+from flicklang.stats import RunStats
+
+SOURCE_CODE = """
+fu fib(n) {
+    if n ls 2 {
+        ret n
+    } eli n eq 2 {
+        ret 1
+    } el {
+        ret fib(n - 1) + fib(n - 2)
+    }
+}
+total = 0
+f i 0 8 {
+    total += fib(i)
+}
+names = {'a': 1, 'b': 2}
+f key in names {
+    p key, names[key]
+}
+i = 0
+w i ls 3 {
+    i += 1
+}
+p total
+"""
+
+
+class CountingInterpreter(Interpreter):
+    """Counts every node it visits, the slow way the statistics avoid."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.counts: Dict[str, int] = {}
+
+    def visit(self, node: Node) -> Any:
+        name = type(node).__name__
+        self.counts[name] = self.counts.get(name, 0) + 1
+        return super().visit(node)
+
+
+def test_counts_match_visited_nodes() -> None:
+    counting = CountingInterpreter()
+    with redirect_stdout(io.StringIO()):
+        run_flicklang_program(SOURCE_CODE, counting)
+    stats = RunStats()
+    with redirect_stdout(io.StringIO()) as output:
+        run_flicklang_program(SOURCE_CODE, stats=stats)
+
+    assert output.getvalue().splitlines()[-1] == "33"
+    counting.counts.pop("Block")
+    assert stats.executed_nodes == counting.counts
+    assert stats.function_calls == {"fib": 60}
+    assert stats.loop_iterations == 8 + 2 + 3
+    assert stats.peak_call_depth == 6
+    # fib, total, i, names and the loop variable key.
+    assert stats.peak_environment_size == 5
+    assert stats.tokens > stats.nodes > 0
+    assert stats.execution.wall > 0
+
+
+def test_report_formats() -> None:
+    stats = RunStats()
+    with redirect_stdout(io.StringIO()):
+        run_flicklang_program("fu one() {\n ret 1\n}\nx = one()", stats=stats)
+
+    report = stats.report()
+    assert "Tokens:" in report and "one" in report
+    data = json.loads(stats.to_json())
+    assert data["function_calls"] == {"one": 1}
+    assert set(data["execution"]) == {"wall", "cpu"}
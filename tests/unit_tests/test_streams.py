@@ -0,0 +1,62 @@
+import io
+import sys
+from contextlib import redirect_stdout
+
+import pytest
+
+from flicklang import streams
+from flicklang.streams import LineReader, OutputBuffer
+from tests.utils import run_flicklang_test
+
+
+def test_line_reader_splits_pieces(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Pieces of 4 bytes cut lines and the two-byte 'é' apart.
+    monkeypatch.setattr(streams, "READ_SIZE", 4)
+    data = "first\nsécond\r\n\nno newline at end".encode()
+    binary = LineReader(io.TextIOWrapper(io.BytesIO(data)))
+    text = LineReader(io.StringIO(data.decode()))
+
+    expected = ["first", "sécond", "", "no newline at end"]
+    assert list(binary) == expected
+    assert list(text) == expected
+    assert list(binary) == []
+
+
+def test_lines_reads_stdin_incrementally(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "stdin", io.StringIO("3\nskip\n4\n"))
+    source_code = """
+        fu first(source) {
+            f line in source {
+                ret line
+            }
+            ret 'none'
+        }
+        p first(lines())
+        f line in lines() {
+            if line neq 'skip' {
+                p line + '!'
+            }
+        }
+    """
+    run_flicklang_test(source_code, "3\n4!\n")
+
+
+def test_output_buffer_writes_in_pieces(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(streams, "OUTPUT_BUFFER_SIZE", 10)
+    output = io.StringIO()
+    buffer = OutputBuffer()
+    with redirect_stdout(output):
+        buffer.write("abcd")
+        assert output.getvalue() == ""
+        buffer.write("efgh")
+        assert output.getvalue() == "abcd\nefgh\n"
+        buffer.write("i")
+        buffer.flush()
+    assert output.getvalue() == "abcd\nefgh\ni\n"
+
+
+def test_lines_split_only_at_newlines() -> None:
+    data = "a\x0cb\nc\x85d\u2028e\r\n\x1cf\n".encode()
+    expected = ["a\x0cb", "c\x85d\u2028e", "\x1cf"]
+    assert list(LineReader(io.TextIOWrapper(io.BytesIO(data), newline=""))) == expected
+    assert list(LineReader(io.StringIO(data.decode(), newline=""))) == expected
@@ -0,0 +1,182 @@
+import io
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from typing import Optional
+
+import pytest
+
+from flicklang.exceptions import ExecutionError
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.limits import ExecutionLimits
+from flicklang.parser import Parser
+from flicklang.tiering import TieringInterpreter
+
+
+def run(interpreter: Interpreter, source_code: str) -> str:
+    program = Parser(Lexer(source_code).tokenize()).parse()
+    with redirect_stdout(io.StringIO()) as output:
+        interpreter.interpret(program)
+    return output.getvalue()
+
+
+def run_both(source_code: str) -> TieringInterpreter:
+    """Run interpreted and with every function compiled on its first call; outputs must match."""
+    tiering = TieringInterpreter(threshold=1)
+    assert run(tiering, source_code) == run(Interpreter(), source_code)
+    return tiering
+
+
+def error_of(interpreter: Interpreter, source_code: str) -> Optional[str]:
+    try:
+        run(interpreter, source_code)
+    except ExecutionError as error:
+        return str(error)
+    return None
+
+
+def test_compiled_functions_match_the_interpreter() -> None:
+    tiering = run_both(
+        """
+        fu summary(values, names) {
+            counts = {}
+            f v in values[1:len(values) - 1] {
+                key = 'even'
+                if v % 2 eq 1 {
+                    key = 'odd'
+                } eli v gr 100 {
+                    key = 'big'
+                }
+                if has(counts, key) {
+                    counts[key] = counts[key] + 1
+                } el {
+                    counts[key] = 1
+                }
+            }
+            text = ''
+            f name in names {
+                text += name + ','
+            }
+            total = 0
+            f i 10 0 (-3) {
+                total = total + i * 2 - i / 4 + -i % 3
+            }
+            sorted = copy(values)
+            i = 0
+            w i ls len(sorted) - 1 {
+                if sorted[i] gr sorted[i + 1] {
+                    swap = sorted[i]
+                    sorted[i] = sorted[i + 1]
+                    sorted[i + 1] = swap
+                }
+                i += 1
+            }
+            p counts, keys(counts), text, total, sorted[-1], int(7 / 2)
+            ret [counts['even'], sorted]
+        }
+        fu fib(n) {
+            if n ls 2 {
+                ret n
+            }
+            ret fib(n - 1) + fib(n - 2)
+        }
+        p summary([3, 8, 200, 5, 6, 1], {'a': 1, 'b': 2})
+        p summary([4, 4, 4, 4], ['x'])
+        p fib(15)
+        """
+    )
+
+    assert [tier_up.function for tier_up in tiering.stats.tier_ups] == ["summary", "fib"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "if n gr 5 {\n x = 1\n}\n p x",
+        "y += 1",
+        "if n {\n p 1\n}",
+        "w n {\n n -= 1\n}",
+        "p n / (n - n)",
+        "p n % 0",
+        "a = [1, 2]\n p a[n]",
+        "m = {'a': 1}\n p m['b']",
+        "a = [1, 2]\n p a[1:n]",
+        "f i 0 n 0 {\n p i\n}",
+        "f c in n {\n p c\n}",
+        "p missing",
+    ],
+)
+def test_compiled_errors_match_the_interpreter(body: str) -> None:
+    source_code = f"fu check(n) {{\n{body}\n}}\ncheck(3)"
+    expected = error_of(Interpreter(), source_code)
+
+    assert expected is not None
+    assert error_of(TieringInterpreter(threshold=1), source_code) == expected
+
+
+def test_tier_up_after_threshold() -> None:
+    log = io.StringIO()
+    tiering = TieringInterpreter(threshold=30, log=log)
+    output = run(
+        tiering,
+        """
+        fu count(n) {
+            total = 0
+            f i 0 n {
+                total += i
+            }
+            ret total
+        }
+        p count(50)
+        p count(50)
+        p count(10)
+        """,
+    )
+
+    assert output == "1225\n1225\n45\n"
+    # The first call runs 50 iterations interpreted; the second call tiers up.
+    [tier_up] = tiering.stats.tier_ups
+    assert (tier_up.function, tier_up.calls, tier_up.back_edges) == ("count", 2, 50)
+    assert log.getvalue().startswith("[tier-up] count (line 2) compiled after 2 calls")
+
+
+def test_unsupported_functions_stay_interpreted() -> None:
+    log = io.StringIO()
+    tiering = TieringInterpreter(threshold=1, log=log)
+    output = run(
+        tiering,
+        """
+        fu outer(n) {
+            fu inner(x) {
+                ret x * 2
+            }
+            ret inner(n)
+        }
+        p outer(2)
+        p outer(3)
+        """,
+    )
+
+    assert output == "4\n6\n"
+    assert [tier_up.function for tier_up in tiering.stats.tier_ups] == ["inner"]
+    assert "outer" in tiering.stats.unsupported
+    assert "outer (line 2) stays interpreted" in log.getvalue()
+
+
+def test_limits_keep_functions_interpreted() -> None:
+    tiering = TieringInterpreter(ExecutionLimits(max_steps=10_000), threshold=1)
+    run(tiering, "fu one() {\n ret 1\n}\np one()\np one()")
+
+    assert tiering.stats.tier_ups == []
+
+
+def test_cli_rejects_tier_up_with_stats() -> None:
+    completed = subprocess.run(
+        [sys.executable, "-m", "flicklang.run_flicklang", "--stats", "--tier-up", "5"]
+        + ["-c", "p 1"],
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 2
+    assert "--tier-up cannot be combined" in completed.stderr
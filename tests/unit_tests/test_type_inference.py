@@ -0,0 +1,123 @@
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from flicklang.ast import (
+    Assignment,
+    BinaryOp,
+    ForEach,
+    ForRange,
+    TypedArrayIndex,
+    TypedBinaryOp,
+    TypedComparisonOp,
+    WhileLoop,
+)
+from flicklang.exceptions import ExecutionError
+from flicklang.interpreter import Interpreter
+from flicklang.lexer import Lexer
+from flicklang.parser import Parser
+from flicklang.type_inference import specialize_program
+
+
+def parse(source_code: str):
+    return Parser(Lexer(source_code).tokenize()).parse()
+
+
+def run(program) -> str:
+    output = io.StringIO()
+    with redirect_stdout(output):
+        Interpreter().interpret(program)
+    return output.getvalue()
+
+
+def test_integer_operations_are_specialized() -> None:
+    source_code = """
+        a = [4, 2, 9]
+        i = 0
+        total = 0
+        w i ls 3 {
+            total = total + a[i] * 2
+            i = i + 1
+        }
+        p total
+    """
+    program = parse(source_code)
+    expected_output = run(parse(source_code))
+
+    report = specialize_program(program)
+
+    loop = program.statements[3]
+    assert isinstance(loop, WhileLoop)
+    assert isinstance(loop.condition, TypedComparisonOp)
+    increment = loop.body.statements[1]
+    assert isinstance(increment, Assignment)
+    assert isinstance(increment.variable_value, TypedBinaryOp)
+    assert isinstance(loop.body.statements[0].variable_value.right.left, TypedArrayIndex)
+    # Array elements have unknown types, so `total + a[i] * 2` stays generic.
+    assert report.specialized == {"ArrayIndex": 1, "BinaryOp": 1, "ComparisonOp": 1}
+    assert report.fraction == pytest.approx(3 / 5)
+    assert run(program) == expected_output == "30\n"
+
+
+def test_types_are_merged_across_branches_and_loop_iterations() -> None:
+    program = parse(
+        """
+        x = 1
+        if x gr 0 { y = 2 } el { y = 'two' }
+        z = y + 1
+        w x ls 3 {
+            v = x + 1
+            x = 'a' * 3
+        }
+        """
+    )
+    specialize_program(program)
+
+    assert type(program.statements[2].variable_value) is BinaryOp
+    loop = program.statements[3]
+    assert type(loop.condition) is not TypedComparisonOp
+    assert type(loop.body.statements[0].variable_value) is BinaryOp
+
+
+def test_runtime_errors_are_preserved() -> None:
+    program = parse(
+        """
+        fu f(a, b) { ret a / b }
+        x = 0
+        p f(4, 2)
+        p 1 / x
+        """
+    )
+    report = specialize_program(program)
+
+    assert report.specialized == {"BinaryOp": 1}
+    output = io.StringIO()
+    with pytest.raises(ExecutionError, match="Division by zero"):
+        with redirect_stdout(output):
+            Interpreter().interpret(program)
+    assert output.getvalue() == "2.0\n"
+
+
+def test_counted_loop_variable_is_an_int() -> None:
+    program = parse(
+        """
+        a = [4, 2, 9]
+        total = 0
+        f i 0 3 {
+            total = total + i * a[i]
+        }
+        f x in a {
+            total = total + x * 2
+        }
+        p total
+        """
+    )
+    specialize_program(program)
+
+    counted, each = program.statements[2], program.statements[3]
+    assert isinstance(counted, ForRange) and isinstance(each, ForEach)
+    assert isinstance(counted.body.statements[0].variable_value.right.right, TypedArrayIndex)
+    # Elements of an array have unknown types.
+    assert type(each.body.statements[0].variable_value.right) is BinaryOp
+    assert run(program) == "50\n"
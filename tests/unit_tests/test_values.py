@@ -0,0 +1,90 @@
+import pytest
+
+from flicklang.run_flicklang import run_flicklang_program
+from flicklang.values import ROPE_THRESHOLD, ArrayView, Rope, concatenate
+from tests.utils import run_flicklang_test
+
+
+def test_rope_appends_share_parts_without_aliasing() -> None:
+    base = concatenate("a" * ROPE_THRESHOLD, "b")
+    assert isinstance(base, Rope)
+
+    first = base + "c"
+    second = base + "d"  # base was already extended by `first`
+
+    assert first.parts is base.parts
+    assert second.parts is not base.parts
+    assert str(base) == "a" * ROPE_THRESHOLD + "b"
+    assert str(first) == str(base) + "c"
+    assert str(second) == str(base) + "d"
+    assert len(second) == ROPE_THRESHOLD + 2
+
+
+def test_rope_behaves_like_str() -> None:
+    text = "x" * ROPE_THRESHOLD + "yz"
+    rope = concatenate("x" * ROPE_THRESHOLD, "yz")
+
+    assert rope == text and text == rope
+    assert not rope != text
+    assert hash(rope) == hash(text)
+    assert rope < text + "a" and text + "a" > rope
+    assert "a" + rope == "a" + text
+    assert rope * 2 == text * 2
+    with pytest.raises(TypeError) as rope_error:
+        rope + 1
+    with pytest.raises(TypeError) as str_error:
+        text + 1  # type: ignore[operator]
+    assert str(rope_error.value) == str(str_error.value)
+
+
+def test_string_building_loop() -> None:
+    source_code = """
+        s = ''
+        i = 0
+        w i ls 100 {
+            s = s + 'abcdef'
+            s += '-'
+            i += 1
+        }
+        copy = s
+        s = s + '!'
+        if copy neq s { p 'different' }
+        if copy + '!' eq s { p 'equal' }
+        p 'end' + copy
+    """
+    expected_output = "different\nequal\nend" + "abcdef-" * 100 + "\n"
+    run_flicklang_test(source_code, expected_output)
+
+
+def test_array_view_shares_the_backing_array() -> None:
+    backing = [0, 1, 2, 3, 4, 5]
+    view = ArrayView(backing, 1, 4)
+    inner = view.slice(1, 3)
+
+    assert inner.backing is backing and (inner.start, len(inner)) == (2, 2)
+    inner[0] = 20
+    assert backing == [0, 1, 20, 3, 4, 5]
+    assert view[1] == 20 and view[-1] == 4
+    assert list(view) == [1, 20, 3, 4]
+    assert view == [1, 20, 3, 4] and [1, 20, 3, 4] == view
+    assert [9] + inner == [9, 20, 3] and inner * 2 == [20, 3, 20, 3]
+    assert repr([inner]) == "[[20, 3]]"
+    with pytest.raises(IndexError):
+        view[4]
+
+
+def test_returned_ropes_stay_ropes() -> None:
+    interpreter = run_flicklang_program(
+        f"""
+        fu append(s) {{ ret s + 'abcdefgh' }}
+        s = ''
+        f i 0 {ROPE_THRESHOLD} {{
+            s = append(s)
+        }}
+        """
+    )
+    s = interpreter.environment["s"]
+    assert isinstance(s, Rope)
+    # Returning the rope did not join its parts.
+    assert s.text is None
+    assert len(s) == 8 * ROPE_THRESHOLD